@@ -0,0 +1,16 @@
+-- Full-text search over bug report titles and descriptions, with titles
+-- weighted higher when ranking
+ALTER TABLE bug_reports
+ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B')
+) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_bug_reports_search_vector
+ON bug_reports USING gin (search_vector);
+
+-- Trigram index for typo-tolerant title search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS ix_bug_reports_title_trgm
+ON bug_reports USING gin (title gin_trgm_ops);
@@ -0,0 +1,88 @@
+import argparse
+
+from domain.config import engine
+from domain.models.BugReport import BugReport
+from domain.schema import create_schema
+from sqlalchemy import Select
+from sqlalchemy.sql.operators import is_
+from sqlmodel import Session, func, select, text
+
+# Indexes declared on BugReport for the queries below
+BUG_REPORT_INDEXES = [index.name for index in BugReport.__table__.indexes]
+
+
+def get_hot_queries(dbms_id: int, category_id: int) -> dict[str, Select]:
+    """The queries behind each endpoint or worker that the indexes serve."""
+    return {
+        "bug_search_category (one keyset page)": select(BugReport)
+        .where(BugReport.dbms_id == dbms_id, BugReport.category_id == category_id)
+        .order_by(BugReport.created_at.desc(), BugReport.id.desc())
+        .limit(6),
+        "dbms overview (bug count per category)": select(
+            BugReport.category_id, func.count()
+        )
+        .where(BugReport.dbms_id == dbms_id)
+        .group_by(BugReport.category_id),
+        "fetcher (latest issue update)": select(BugReport.issue_updated_at)
+        .where(BugReport.dbms_id == dbms_id, BugReport.issue_updated_at.is_not(None))
+        .order_by(BugReport.issue_updated_at.desc())
+        .limit(1),
+        "classifier (unclassified bugs)": select(BugReport.id).where(
+            is_(BugReport.category_id, None)
+        ),
+        "vectorizer (unvectorized bugs)": select(BugReport.id).where(
+            is_(BugReport.vector, None)
+        ),
+    }
+
+
+def explain(tx: Session, query: Select) -> str:
+    sql = query.compile(
+        dialect=tx.get_bind().dialect, compile_kwargs={"literal_binds": True}
+    )
+    plan = tx.exec(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}")).all()
+    return "\n".join(f"    {line}" for (line,) in plan)
+
+
+def run_benchmark(tx: Session, dbms_id: int, category_id: int):
+    """
+    Prints the plan of every hot query without and with the indexes.
+
+    The indexes are dropped inside a transaction that is rolled back, so the
+    schema is left as it was. Dropping an index locks the table until then,
+    so run this against a development copy of the database.
+    """
+    queries = get_hot_queries(dbms_id, category_id)
+    for name in BUG_REPORT_INDEXES:
+        tx.exec(text(f"DROP INDEX IF EXISTS {name}"))
+    without_indexes = {label: explain(tx, query) for label, query in queries.items()}
+    tx.rollback()
+
+    with_indexes = {label: explain(tx, query) for label, query in queries.items()}
+    tx.rollback()
+
+    for label in queries:
+        print(f"== {label}")
+        print("  Without indexes:")
+        print(without_indexes[label])
+        print("  With indexes:")
+        print(with_indexes[label])
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare query plans of hot bug report queries with and "
+        "without their indexes (Postgres only)"
+    )
+    parser.add_argument("--dbms-id", type=int, default=1)
+    parser.add_argument("--category-id", type=int, default=0)
+    args = parser.parse_args()
+
+    create_schema(engine)
+    with Session(engine) as tx:
+        run_benchmark(tx, args.dbms_id, args.category_id)
+
+
+if __name__ == "__main__":
+    main()
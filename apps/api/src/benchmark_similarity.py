@@ -0,0 +1,123 @@
+import argparse
+import time
+
+import numpy as np
+from utilities.ivf_index import IvfIndex
+from utilities.vector_index import VectorIndex
+
+
+def load_vectors(size: int | None, dim: int) -> tuple[list[int], list[int], np.ndarray]:
+    """
+    Loads the bug report vectors from the database, or generates `size`
+    clustered vectors, which are about as hard to search as real ones.
+    """
+    if size is None:
+        from domain.config import engine
+        from domain.models.BugReport import get_bug_report_vectors
+        from sqlmodel import Session
+        from utilities.vector_codec import decode_vector
+
+        with Session(engine) as tx:
+            rows = get_bug_report_vectors(tx)
+        return (
+            [id for id, _, _, _ in rows],
+            [dbms_id for _, dbms_id, _, _ in rows],
+            np.stack([decode_vector(vector) for _, _, vector, _ in rows]),
+        )
+
+    rng = np.random.default_rng(0)
+    topics = rng.normal(size=(max(size // 100, 1), dim))
+    vectors = topics[rng.integers(len(topics), size=size)]
+    vectors += rng.normal(scale=1.5, size=(size, dim))
+    return list(range(1, size + 1)), [0] * size, vectors
+
+
+def time_searches(search, query_ids: list[int]) -> tuple[list[list[int]], np.ndarray]:
+    results, latencies = [], []
+    for id in query_ids:
+        start = time.perf_counter()
+        results.append([neighbor for neighbor, _ in search(id)])
+        latencies.append(time.perf_counter() - start)
+    return results, np.array(latencies) * 1000
+
+
+def run_benchmark(
+    ids: list[int],
+    dbms_ids: list[int],
+    vectors: np.ndarray,
+    k: int,
+    queries: int,
+    n_lists: int | None,
+    n_probes: list[int],
+):
+    """
+    Prints the recall@k and latency of approximate searches at several
+    `n_probe` settings, against exact searches for the same bug reports.
+    """
+    exact = VectorIndex()
+    exact.upsert(ids, dbms_ids, vectors)
+    start = time.perf_counter()
+    ivf = IvfIndex.build(ids, dbms_ids, vectors, n_lists)
+    print(
+        f"Built index of {len(ids)} vectors in {ivf.n_lists} clusters "
+        f"in {time.perf_counter() - start:.1f}s\n"
+    )
+
+    rng = np.random.default_rng(1)
+    query_ids = [int(id) for id in rng.choice(ids, min(queries, len(ids)), False)]
+    expected, latencies = time_searches(lambda id: exact.search(id, k), query_ids)
+
+    print(f"{'search':<16} {'recall@' + str(k):>10} {'p50':>9} {'p99':>9}")
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f"{'exact':<16} {1:>10.3f} {p50:>7.2f}ms {p99:>7.2f}ms")
+    for n_probe in n_probes:
+        results, latencies = time_searches(
+            lambda id: ivf.search_vector(
+                ivf.get_vector(id), k, n_probe, exclude_ids=np.array([id])
+            ),
+            query_ids,
+        )
+        recall = np.mean(
+            [
+                len(set(found) & set(wanted)) / max(len(wanted), 1)
+                for found, wanted in zip(results, expected)
+            ]
+        )
+        p50, p99 = np.percentile(latencies, [50, 99])
+        label = f"ivf n_probe={n_probe}"
+        print(f"{label:<16} {recall:>10.3f} {p50:>7.2f}ms {p99:>7.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the recall and latency of the approximate "
+        "similarity index against exact search, to pick SIMILARITY_ANN_N_LISTS "
+        "and SIMILARITY_ANN_N_PROBE"
+    )
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=None,
+        help="Benchmark this many generated vectors instead of the database",
+    )
+    parser.add_argument("--dim", type=int, default=300)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--n-lists", type=int, default=None)
+    parser.add_argument("--n-probes", default="1,2,4,8,16,32,64")
+    args = parser.parse_args()
+
+    ids, dbms_ids, vectors = load_vectors(args.synthetic, args.dim)
+    run_benchmark(
+        ids,
+        dbms_ids,
+        vectors,
+        args.k,
+        args.queries,
+        args.n_lists,
+        [int(n_probe) for n_probe in args.n_probes.split(",")],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import argparse
+
+from configuration.logger import configure_logger
+from domain.config import engine
+from fastapi import FastAPI
+from services.bug_similarity_service import BugSimilarityService
+from sqlmodel import Session
+from utilities.constants import constants
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the approximate similarity index searched by the "
+        'API when SIMILARITY_INDEX_BACKEND is "ivf". Rebuild it regularly, as '
+        "vectors written after a build are searched exactly until the next one."
+    )
+    parser.add_argument("--dir", default=constants.SIMILARITY_ANN_DIR)
+    parser.add_argument(
+        "--n-lists",
+        type=int,
+        default=constants.SIMILARITY_ANN_N_LISTS,
+        help="Number of clusters, or 0 for about 4 * sqrt(number of vectors)",
+    )
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    # The services log through the application logger
+    app = FastAPI(title="Build similarity index")
+    with configure_logger(app), Session(engine, expire_on_commit=False) as tx:
+        index = BugSimilarityService.build_ann_index(
+            tx, args.dir, args.n_lists, args.iterations
+        )
+    print(f"Indexed {len(index)} vectors in {index.n_lists} clusters. All done!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+from contextlib import contextmanager
+
+from configuration.logger import get_logger
+from fastapi import FastAPI
+from utilities.constants import constants
+from utilities.response_cache import create_response_cache, set_response_cache
+
+
+@contextmanager
+def configure_response_cache(app: FastAPI):
+    """
+    Configures the cache of the read endpoints for the application.
+    """
+    logger = get_logger()
+    logger.info(
+        f"Configuring response cache with backend: {constants.RESPONSE_CACHE_BACKEND}"
+    )
+    set_response_cache(create_response_cache())
+    logger.info("Response cache configured")
+    yield
+    set_response_cache(None)
+
+
+__all__ = ["configure_response_cache"]
@@ -2,8 +2,8 @@ from contextlib import contextmanager
 
 from configuration.logger import get_logger
 from domain.config import engine
+from domain.schema import create_schema
 from fastapi import FastAPI
-from sqlmodel import SQLModel
 
 
 @contextmanager
@@ -13,7 +13,7 @@ def configure_database(app: FastAPI):
     """
     logger = get_logger()
     logger.info(f"Initializing database engine for application: {app.title}")
-    SQLModel.metadata.create_all(engine)
+    create_schema(engine)
     logger.info("Database engine initialized")
     yield
     logger.info("Closing database engine")
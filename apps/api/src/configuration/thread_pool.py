@@ -0,0 +1,28 @@
+from contextlib import contextmanager
+
+from anyio.to_thread import current_default_thread_limiter
+from configuration.logger import get_logger
+from fastapi import FastAPI
+from utilities.constants import constants
+
+
+@contextmanager
+def configure_thread_pool(app: FastAPI):
+    """
+    Sizes the thread pool that runs the synchronous endpoints of the
+    application.
+
+    Endpoints are plain functions, as the database sessions, Redis and the
+    similarity index are all synchronous; FastAPI runs them in this pool,
+    so a slow request only holds up its own thread instead of the event
+    loop. The pool is bounded, so that a burst of requests queues for a
+    thread rather than for a database connection.
+    """
+    logger = get_logger()
+    limiter = current_default_thread_limiter()
+    limiter.total_tokens = constants.API_THREAD_POOL_SIZE
+    logger.info(f"Running endpoints on {limiter.total_tokens} threads")
+    yield
+
+
+__all__ = ["configure_thread_pool"]
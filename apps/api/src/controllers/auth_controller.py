@@ -9,7 +9,7 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="public/api/v1/auth/login")
 
 
 @router.post("/refresh")
-async def refresh_access_token(
+def refresh_access_token(
     request: Request,
     token: str = Depends(oauth2_scheme),
 ) -> AuthResponseDto:
@@ -8,13 +8,14 @@ from domain.views.dbms import (
 )
 from fastapi import APIRouter, Request
 from internal.errors import NotFoundError
+from services.ai_summary_service import AiSummaryService
 from services.bug_report_service import BugReportService
 
 router = APIRouter(prefix="/api/v1/bug_reports", tags=["bug_reports"])
 
 
 @router.get("/{bug_id}")
-async def get_bug_report_by_id(bug_id: int, r: Request) -> BugReportResponseDto:
+def get_bug_report_by_id(bug_id: int, r: Request) -> BugReportResponseDto:
     tx = get_db(r)
     bug_report = BugReportService.get_bug_report_by_id(tx, bug_id)
     if bug_report is None:
@@ -23,7 +24,7 @@ async def get_bug_report_by_id(bug_id: int, r: Request) -> BugReportResponseDto:
 
 
 @router.patch("/{bug_id}/category")
-async def update_bug_category(
+def update_bug_category(
     bug_id: int,
     dto: BugCategoryUpdateDto,
     r: Request,
@@ -34,7 +35,7 @@ async def update_bug_category(
 
 
 @router.patch("/{bug_id}/priority")
-async def update_bug_priority(
+def update_bug_priority(
     bug_id: int,
     dto: BugPriorityUpdateDto,
     r: Request,
@@ -45,19 +46,25 @@ async def update_bug_priority(
 
 
 @router.get("/{bug_id}/ai_summary")
-async def get_bug_report_ai_summary(bug_id: int, r: Request) -> AiSummaryResponseDto:
+def get_bug_report_ai_summary(bug_id: int, r: Request) -> AiSummaryResponseDto:
     tx = get_db(r)
     bug_report = BugReportService.get_bug_report_by_id(tx, bug_id)
     if bug_report is None:
         raise NotFoundError("Bug report {bug_id} not found")
     if bug_report.description is None:
         raise NotFoundError("Bug report {bug_id} has no description")
-    summary = BugReportService.get_ai_summary(bug_report)
+    summary = AiSummaryService.get_bug_report_summary(
+        tx, bug_id, bug_report.dbms, bug_report.description
+    )
+    if summary is None:
+        return AiSummaryResponseDto(
+            summary="Summary is not ready for this bug report yet."
+        )
     return AiSummaryResponseDto(summary=summary)
 
 
 @router.patch("/{bug_id}/versions_affected")
-async def update_bug_versions_affected(
+def update_bug_versions_affected(
     bug_id: int, dto: BugVersionsAffectedUpdateDto, r: Request
 ) -> BugReportResponseDto:
     tx = get_db(r)
@@ -68,14 +75,27 @@ async def update_bug_versions_affected(
 
 
 @router.get("/{bug_id}/similar_bugs")
-async def get_similar_bug_reports(
+def get_similar_bug_reports(
     bug_id: int,
     r: Request,
     # Query parameters
     limit: int,
+    dbms_id: int | None = None,
 ) -> list[BugReportResponseDto]:
+    """
+    Fetches the bug reports most similar to the given bug report.
+
+    \f
+
+    :param limit:
+        Maximum number of similar bug reports to return.
+    :param dbms_id:
+        If specified, only bug reports from this DBMS are considered.
+    """
     tx = get_db(r)
-    similar_bugs = BugReportService.get_similar_bug_reports(tx, bug_id, top_n=limit)
+    similar_bugs = BugReportService.get_similar_bug_reports(
+        tx, bug_id, top_n=limit, dbms_id=dbms_id
+    )
     return similar_bugs
 
 
@@ -0,0 +1,21 @@
+from domain.views.cache import CacheStatsResponseDto
+from fastapi import APIRouter
+from utilities.response_cache import get_response_cache
+
+router = APIRouter(prefix="/api/v1/cache", tags=["cache"])
+
+
+@router.get("/stats")
+def get_cache_stats() -> dict[str, CacheStatsResponseDto]:
+    """
+    Fetches the hits and misses of the response cache per cached method,
+    counted by the process serving the request since it started. Empty if
+    caching is turned off.
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return {}
+    return cache.get_stats()
+
+
+__all__ = ["router"]
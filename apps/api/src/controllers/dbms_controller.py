@@ -1,11 +1,12 @@
-from collections import defaultdict
 from typing import Sequence
 
-import openai
 from domain.config import get_db
+from domain.enums import SearchMode, TrendGranularity
+from domain.models.BugReport import BugReport
 from domain.views.dbms import (
     AiSummaryResponseDto,
     BugCategoryResponseDto,
+    BugCategoryTrendResponseDto,
     BugReportResponseDto,
     BugSearchCategoryResponseDto,
     BugSearchResponseDto,
@@ -15,76 +16,61 @@ from domain.views.dbms import (
 from fastapi import APIRouter, Request
 from internal.errors import NotFoundError
 from internal.errors.client_errors import BadRequestError
+from services.ai_summary_service import AiSummaryService
 from services.dbms_service import DbmsService
-from utilities.prompts import get_dbms_ai_summary_prompt
 
 router = APIRouter(prefix="/api/v1/dbms", tags=["dbms"])
 
 
 @router.get("/")
-async def get_all_dbms(r: Request) -> Sequence[DbmsListResponseDto]:
+def get_all_dbms(r: Request) -> Sequence[DbmsListResponseDto]:
     tx = get_db(r)
     return DbmsService.get_dbms(tx)
 
 
 @router.get("/{dbms_id}")
-async def get_dbms_by_id(dbms_id: int, r: Request) -> DbmsResponseDto:
+def get_dbms_by_id(dbms_id: int, r: Request) -> DbmsResponseDto:
     tx = get_db(r)
-    dbms = DbmsService.get_dbms_by_id(tx, dbms_id)
-    bug_categories = DbmsService.get_dbms_bug_categories(tx, dbms_id)
-    bug_category_counts = defaultdict(int)
-    for bug_category in bug_categories:
-        bug_count = DbmsService.get_bug_count_category(tx, dbms_id, bug_category.id)
-        bug_category_counts[(bug_category.id, bug_category.name)] = bug_count
+    dbms = DbmsService.get_dbms_overview(tx, dbms_id)
     if dbms is None:
         raise NotFoundError(f"DBMS with id {dbms_id} not found")
-    return DbmsResponseDto(
-        id=dbms_id,
-        name=dbms.name,
-        bug_count=sum(bug_category_counts.values()),
-        bug_categories=[
-            BugCategoryResponseDto(id=id, name=name, count=count)
-            for (id, name), count in bug_category_counts.items()
-        ],
-    )
+    return dbms
 
 
 @router.get("/{dbms_id}/ai_summary")
-async def get_ai_summary(dbms_id: int, r: Request) -> AiSummaryResponseDto:
+def get_ai_summary(dbms_id: int, r: Request) -> AiSummaryResponseDto:
+    """
+    Fetches the AI summary of a DBMS. Summaries are generated in the
+    background, so a placeholder is returned until the first one is ready.
+    """
     tx = get_db(r)
     dbms = DbmsService.get_dbms_by_id(tx, dbms_id)
     if dbms is None:
         raise NotFoundError(f"DBMS with id {dbms_id} not found")
-    sample_desc = DbmsService.get_random_bug_descriptions_sample(tx, dbms_id, 0.005)
-    try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "user",
-                    "content": get_dbms_ai_summary_prompt(dbms.name, sample_desc),
-                },
-            ],
-            max_tokens=200,
-            temperature=0.2,
-        )
-        summary = response["choices"][0]["message"]["content"].strip()
-        return AiSummaryResponseDto(summary=summary)
-
-    except Exception as e:
-        print("eRROR:", e)
+    summary = AiSummaryService.get_dbms_summary(tx, dbms_id)
+    if summary is None:
         return AiSummaryResponseDto(summary="Summary is not ready for this DBMS yet.")
+    return AiSummaryResponseDto(summary=summary)
+
+
+def _to_bug_report_response(report: BugReport) -> BugReportResponseDto:
+    return BugReportResponseDto(
+        **report.model_dump(),
+        category=report.category.name,
+        dbms=report.dbms.name,
+    )
 
 
 @(router.get("/{dbms_id}/bug_search"))
-async def get_bugs(
+def get_bugs(
     dbms_id: int,
     r: Request,
     # Query parameters
-    start: int = 0,
+    cursor: str | None = None,
     limit: int = 10,
     search: str | None = None,
     category_id: int | None = None,
+    mode: SearchMode = SearchMode.Substring,
 ) -> BugSearchResponseDto:
     """
     Searches for bug reports from either all categories, while allocating
@@ -94,49 +80,57 @@ async def get_bugs(
     \f
 
     :param search:
-        The search string, which must match part of bug report titles.
-    :param start:
-        0-based index representing the number of records to skip.
+        The search string to match bug reports against.
+    :param cursor:
+        The next_cursor of the previous page, to fetch the page after it.
+        Only supported when category_id is specified; searches across all
+        categories return a cursor per category in category_cursors, to be
+        passed to bug_search_category.
     :param limit:
         Absolute value representing the maximum number of reports to return.
     :param category_id:
         0-based category_id which corresponds to that in the database.
+    :param mode:
+        substring (default) matches titles containing the search string,
+        newest first. fulltext matches all words of the search string, as
+        prefixes, in bug report titles and descriptions, ranked by relevance.
+        trigram matches titles similar to the search string, tolerating
+        typos, ranked by similarity. fulltext and trigram need the search
+        columns and indexes of db/seeds/1743400000_bug_reports_search.sql.
     """
+    if limit <= 0:
+        raise BadRequestError("Limit must be a positive integer.")
     tx = get_db(r)
-    reports = DbmsService.bug_search(
+    page = DbmsService.bug_search(
         tx,
         dbms_id,
         search,
-        start,
+        cursor,
         limit,
         [category_id] if category_id is not None else [],
+        mode,
     )
 
     return BugSearchResponseDto(
-        bug_reports=[
-            BugReportResponseDto(
-                **report.model_dump(),
-                category=report.category.name,
-                dbms=report.dbms.name,
-            )
-            for report in reports
-        ]
+        bug_reports=[_to_bug_report_response(report) for report in page.bug_reports],
+        next_cursor=page.next_cursor,
+        category_cursors=page.category_cursors,
     )
 
 
 @router.get("/{dbms_id}/bug_search_category")
-async def get_bugs_by_category(
+def get_bugs_by_category(
     dbms_id: int,
     r: Request,
     # Query parameters
     category_id: int,
-    distribution: str,  # passed as csv
     amount: int,
+    cursor: str | None = None,
 ) -> BugSearchCategoryResponseDto:
     """
-    Searches for bug reports in a category from a certain offset as given from a
-    distribution. On the FE, this corresponds to a load more feature for each bug
-    category in the bug explore.
+    Fetches the next bug reports in a category, newest first. On the FE, this
+    corresponds to a load more feature for each bug category in the bug
+    explore.
 
     \f
 
@@ -144,68 +138,75 @@ async def get_bugs_by_category(
         0-based category_id which corresponds to that in db
     :param amount:
         Number of additional reports to add
-    :param distribution:
-        Comma-separated values representing number of bugs present for
-        each category, starting from the 0th category, this convenintely
-        corresponds to the offset from which we should fetch our bugs
+    :param cursor:
+        The cursor of the category from the previous response, either from
+        category_cursors of bug_search or next_cursor of this endpoint.
+        If omitted, starts from the newest bug report of the category.
     """
-    tx = get_db(r)
-
-    try:
-        distr = [int(i) for i in distribution.strip().split(",")]
-
-        if amount == 0 or category_id >= len(distr) or category_id < 0:
-            raise BadRequestError(
-                "Invalid request, amount or distribution not passed or passed incorrectly.",
-            )
-
-        delta = DbmsService.bug_search_category(
-            tx, dbms_id, category_id, distr[category_id], amount
-        )
-
-        delta_count = len(delta)
-        distr[category_id] += delta_count
-        return BugSearchCategoryResponseDto(
-            bug_reports_delta=[
-                BugReportResponseDto(
-                    **report.model_dump(),
-                    category=report.category.name,
-                    dbms=report.dbms.name,
-                )
-                for report in delta
-            ],
-            new_bug_distr=distr,
-        )
-
-    except Exception as e:
+    if amount <= 0 or category_id < 0:
         raise BadRequestError(
-            "Invalid request, amount or distribution not passed or passed incorrectly.",
+            "Invalid request, amount or category_id passed incorrectly.",
         )
+    tx = get_db(r)
+    page = DbmsService.bug_search_category(tx, dbms_id, category_id, cursor, amount)
+    return BugSearchCategoryResponseDto(
+        bug_reports_delta=[
+            _to_bug_report_response(report) for report in page.bug_reports
+        ],
+        next_cursor=page.next_cursor,
+    )
 
 
 @router.get("/{dbms_id}/bug_trend")
-async def get_bug_trend(
+def get_bug_trend(
     dbms_id: int,
     r: Request,
     # Query parameters
-    days: int = 30,
+    periods: int = 30,
+    granularity: TrendGranularity = TrendGranularity.Day,
 ) -> list[int]:
     """
-    Fetches the bug trend for the last `days` days for a given DBMS.
+    Fetches the bug trend for the last `periods` buckets for a given DBMS.
 
     Query parameters:
-        - days: Number of days to fetch the bug trend for (default: 30)
+        - periods: Number of buckets to fetch the bug trend for (default: 30)
+        - granularity: Size of each bucket, one of day, week or month
+          (default: day)
     """
     tx = get_db(r)
-    if days <= 0:
-        raise BadRequestError("Days must be a positive integer.")
+    if periods <= 0:
+        raise BadRequestError("Periods must be a positive integer.")
 
-    trend_data = DbmsService.get_bug_trend_last_k_days(tx, dbms_id, days)
+    trend_data = DbmsService.get_bug_trend(tx, dbms_id, periods, granularity)
     return trend_data
 
 
+@router.get("/{dbms_id}/bug_trend_categories")
+def get_bug_trend_by_category(
+    dbms_id: int,
+    r: Request,
+    # Query parameters
+    periods: int = 30,
+    granularity: TrendGranularity = TrendGranularity.Day,
+) -> list[BugCategoryTrendResponseDto]:
+    """
+    Fetches the bug trend for the last `periods` buckets for each bug category
+    of a given DBMS.
+
+    Query parameters:
+        - periods: Number of buckets to fetch the bug trend for (default: 30)
+        - granularity: Size of each bucket, one of day, week or month
+          (default: day)
+    """
+    tx = get_db(r)
+    if periods <= 0:
+        raise BadRequestError("Periods must be a positive integer.")
+
+    return DbmsService.get_bug_trend_by_category(tx, dbms_id, periods, granularity)
+
+
 @router.get("/{dbms_id}/new_reports")
-async def get_num_reports_today(dbms_id: int, r: Request) -> int:
+def get_num_reports_today(dbms_id: int, r: Request) -> int:
     """
     Fetches the number of new bug reports for a given DBMS today.
 
@@ -218,7 +219,7 @@ async def get_num_reports_today(dbms_id: int, r: Request) -> int:
 
 
 @router.get("/{dbms_id}/new_report_categories")
-async def get_new_bug_report_categories_today(
+def get_new_bug_report_categories_today(
     dbms_id: int, r: Request
 ) -> list[BugCategoryResponseDto]:
     """
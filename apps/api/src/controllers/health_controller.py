@@ -0,0 +1,35 @@
+from domain.config import engine, get_worker_engine
+from domain.views.health import HealthResponseDto
+from fastapi import APIRouter, Response
+from sqlalchemy import text
+from utilities.pool_metrics import get_pool_stats
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("")
+def get_health(response: Response) -> HealthResponseDto:
+    """
+    Checks that the database is reachable, and reports the state of the
+    connection pools of the process serving the request. Responds with 503
+    if the database is unreachable.
+    """
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        database = True
+    except Exception:
+        database = False
+        response.status_code = 503
+
+    return HealthResponseDto(
+        status="ok" if database else "unavailable",
+        database=database,
+        pools={
+            "api": get_pool_stats(engine.pool),
+            "worker": get_pool_stats(get_worker_engine().pool),
+        },
+    )
+
+
+__all__ = ["router"]
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/public/api/v1/auth", tags=["public_auth"])
 
 
 @router.post("/login")
-async def login(r: Request, dto: LoginRequestDto) -> AuthResponseDto:
+def login(r: Request, dto: LoginRequestDto) -> AuthResponseDto:
     """
     Authenticate a user with email/password and return a JWT pair
     for that user.
@@ -36,7 +36,7 @@ async def login(r: Request, dto: LoginRequestDto) -> AuthResponseDto:
 
 
 @router.post("/signup")
-async def signup(r: Request, dto: SignupRequestDto) -> AuthResponseDto:
+def signup(r: Request, dto: SignupRequestDto) -> AuthResponseDto:
     """
     Create a new user if email has not been used, and return a JWT pair
     for that user.
@@ -12,13 +12,13 @@ router = APIRouter(prefix="/api/v1/users", tags=["users"])
 
 
 @router.get("/")
-async def get_all_users(r: Request) -> Sequence[UserSummaryResponseDto]:
+def get_all_users(r: Request) -> Sequence[UserSummaryResponseDto]:
     tx = get_db(r)
     return UserService.get_users(tx)
 
 
 @router.get("/{user_id}")
-async def get_single_user(user_id: int, r: Request) -> UserSummaryResponseDto:
+def get_single_user(user_id: int, r: Request) -> UserSummaryResponseDto:
     tx = get_db(r)
     user = UserService.get_user(tx, user_id)
     if user is None:
@@ -27,7 +27,7 @@ async def get_single_user(user_id: int, r: Request) -> UserSummaryResponseDto:
 
 
 @router.delete("/{user_id}")
-async def delete_user(user_id: int, r: Request) -> UserSummaryResponseDto:
+def delete_user(user_id: int, r: Request) -> UserSummaryResponseDto:
     tx = get_db(r)
     return UserService.delete_user(tx, user_id)
 
@@ -1,18 +1,63 @@
+from functools import cache
 from typing import Generator
 
 from fastapi import Depends, Request
+from sqlalchemy import Engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import Session, create_engine
 from utilities.constants import constants
+from utilities.pool_metrics import TimedNullPool, TimedQueuePool
 
-engine = create_engine(constants.DATABASE_URL, echo=constants.IS_DEVELOPMENT)
-session = sessionmaker(
-    bind=engine,
-    class_=Session,
-    expire_on_commit=False,
-    autoflush=False,
-    autocommit=False,
-)
+
+def create_db_engine(pool_size: int, max_overflow: int) -> Engine:
+    """
+    Creates an engine whose pool holds `pool_size` connections, and opens up
+    to `max_overflow` more under load.
+
+    In PgBouncer mode, connections are not pooled here at all: each session
+    gets its own connection from PgBouncer and returns it on close, so that
+    PgBouncer can share a few server connections between all processes.
+    """
+    options = dict(echo=constants.DB_ECHO, pool_pre_ping=constants.DB_POOL_PRE_PING)
+    if constants.DB_PGBOUNCER_MODE:
+        return create_engine(constants.DATABASE_URL, poolclass=TimedNullPool, **options)
+    return create_engine(
+        constants.DATABASE_URL,
+        poolclass=TimedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=constants.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=constants.DB_POOL_RECYCLE_SECONDS,
+        **options,
+    )
+
+
+def _create_sessionmaker(bind: Engine) -> sessionmaker[Session]:
+    return sessionmaker(
+        bind=bind,
+        class_=Session,
+        expire_on_commit=False,
+        autoflush=False,
+        autocommit=False,
+    )
+
+
+# Engine of the API, which serves requests
+engine = create_db_engine(constants.DB_POOL_SIZE, constants.DB_MAX_OVERFLOW)
+session = _create_sessionmaker(engine)
+
+
+@cache
+def get_worker_engine() -> Engine:
+    """
+    Returns the engine of the Celery tasks of this process. It is separate
+    from the API's, so that the fetcher cannot take the connections that
+    requests need when both run in one process, and is created on first use,
+    so that each prefork child opens its own connections.
+    """
+    return create_db_engine(
+        constants.WORKER_DB_POOL_SIZE, constants.WORKER_DB_MAX_OVERFLOW
+    )
 
 
 def _create_session() -> Generator[Session, None, None]:
@@ -31,7 +76,8 @@ def get_db(request: Request) -> Session:
 
 
 def get_session() -> Session:
-    return session()
+    """Opens a session for a Celery task."""
+    return Session(get_worker_engine(), expire_on_commit=False, autoflush=False)
 
 
 __all__ = [
@@ -39,4 +85,5 @@ __all__ = [
     "db_txn_manager_generator",
     "get_db",
     "get_session",
+    "get_worker_engine",
 ]
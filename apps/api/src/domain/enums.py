@@ -6,3 +6,23 @@ class PriorityLevel(str, Enum):
     Medium = "Medium"
     High = "High"
     Unassigned = "Unassigned"
+
+
+class TrendGranularity(str, Enum):
+    Day = "day"
+    Week = "week"
+    Month = "month"
+
+
+class SearchMode(str, Enum):
+    # Case-insensitive substring match on titles
+    Substring = "substring"
+    # Ranked full-text search over titles and descriptions
+    FullText = "fulltext"
+    # Ranked trigram similarity on titles, tolerant of typos
+    Trigram = "trigram"
+
+
+class AiSummaryEntity(str, Enum):
+    Dbms = "dbms"
+    BugReport = "bug_report"
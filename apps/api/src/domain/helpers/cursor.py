@@ -0,0 +1,49 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass(frozen=True)
+class SearchCursor:
+    """
+    Position of the last bug report on a page of search results, in the
+    (rank, created_at, id) order that results are returned in. The rank is
+    only set for ranked searches.
+    """
+
+    created_at: datetime
+    id: int
+    rank: float | None = None
+
+
+def encode_cursor(cursor: SearchCursor) -> str:
+    payload = {"c": cursor.created_at.isoformat(), "i": cursor.id}
+    if cursor.rank is not None:
+        payload["r"] = cursor.rank
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> SearchCursor:
+    """
+    Decodes a cursor token created by encode_cursor.
+
+    :raises ValueError:
+        If the token is not a valid cursor.
+    """
+    try:
+        data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(data)
+        rank = payload.get("r")
+        return SearchCursor(
+            created_at=datetime.fromisoformat(payload["c"]),
+            id=int(payload["i"]),
+            rank=float(rank) if rank is not None else None,
+        )
+    except (binascii.Error, AttributeError, TypeError, KeyError) as e:
+        raise ValueError(f"Invalid cursor: {token}") from e
+
+
+__all__ = ["SearchCursor", "decode_cursor", "encode_cursor"]
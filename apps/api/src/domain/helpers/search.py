@@ -0,0 +1,21 @@
+import re
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def build_prefix_tsquery(search: str) -> str | None:
+    """
+    Builds a to_tsquery expression matching documents that contain every
+    word of the search string. Each word is matched as a prefix, so that
+    partially typed words still match.
+
+    Only word characters are kept, so the result is always a valid query.
+    Returns None if the search string has no words.
+    """
+    words = _WORD_PATTERN.findall(search.lower())
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+__all__ = ["build_prefix_tsquery"]
@@ -0,0 +1,84 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable
+
+from domain.enums import TrendGranularity
+
+# Trends are bucketed by calendar day in UTC+8
+TREND_TIMEZONE = timezone(timedelta(hours=8))
+
+
+def get_trend_today() -> date:
+    return datetime.now(TREND_TIMEZONE).date()
+
+
+def get_trend_day(moment: datetime) -> date:
+    """
+    Returns the UTC+8 calendar day of a timestamp. Naive timestamps are
+    taken to be in UTC.
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(TREND_TIMEZONE).date()
+
+
+def truncate_to_bucket(day: date, granularity: TrendGranularity) -> date:
+    """Returns the first day of the bucket containing `day`."""
+    match granularity:
+        case TrendGranularity.Day:
+            return day
+        case TrendGranularity.Week:
+            # Weeks start on Monday, as with Postgres' date_trunc
+            return day - timedelta(days=day.weekday())
+        case TrendGranularity.Month:
+            return day.replace(day=1)
+
+
+def get_bucket_starts(
+    today: date, periods: int, granularity: TrendGranularity
+) -> list[date]:
+    """
+    Returns the start dates of the last `periods` buckets, oldest first,
+    ending with the bucket that contains `today`.
+    """
+    current = truncate_to_bucket(today, granularity)
+    starts = [current]
+    for _ in range(periods - 1):
+        previous_day = starts[-1] - timedelta(days=1)
+        starts.append(truncate_to_bucket(previous_day, granularity))
+    return starts[::-1]
+
+
+def accumulate_trend(
+    bucket_starts: list[date],
+    granularity: TrendGranularity,
+    baseline: int,
+    daily_counts: Iterable[tuple[date, int]],
+) -> list[int]:
+    """
+    Turns per-day counts into running totals at the end of each bucket.
+
+    :param baseline:
+        The total from before the first bucket.
+    :param daily_counts:
+        (day, count) pairs for days within the buckets.
+    """
+    counts_by_bucket: dict[date, int] = {}
+    for day, count in daily_counts:
+        bucket_start = truncate_to_bucket(day, granularity)
+        counts_by_bucket[bucket_start] = counts_by_bucket.get(bucket_start, 0) + count
+    running_total = baseline
+    trend = []
+    for bucket_start in bucket_starts:
+        running_total += counts_by_bucket.get(bucket_start, 0)
+        trend.append(running_total)
+    return trend
+
+
+__all__ = [
+    "TREND_TIMEZONE",
+    "accumulate_trend",
+    "get_bucket_starts",
+    "get_trend_day",
+    "get_trend_today",
+    "truncate_to_bucket",
+]
@@ -0,0 +1,91 @@
+from domain.enums import AiSummaryEntity
+from domain.helpers.Timestampable import Timestampable
+from sqlalchemy import Enum
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Field, Session, delete, func, or_, select
+
+
+class AiSummary(Timestampable, table=True):
+    """
+    AI summary of a DBMS or bug report, keyed by the version of the prompt
+    template and a hash of the prompt it was generated from. A summary is
+    up to date as long as the prompt built from the current data hashes the
+    same.
+    """
+
+    __tablename__ = "ai_summaries"
+    entity_type: AiSummaryEntity = Field(
+        sa_type=Enum(AiSummaryEntity, name="ai_summary_entity"), primary_key=True
+    )
+    entity_id: int = Field(primary_key=True)
+    prompt_version: int = Field(primary_key=True)
+    input_hash: str = Field(primary_key=True)
+    summary: str = Field(nullable=False)
+
+
+def get_ai_summary(
+    tx: Session,
+    entity_type: AiSummaryEntity,
+    entity_id: int,
+    prompt_version: int,
+    input_hash: str,
+) -> AiSummary | None:
+    return tx.get(AiSummary, (entity_type, entity_id, prompt_version, input_hash))
+
+
+def get_latest_ai_summary(
+    tx: Session, entity_type: AiSummaryEntity, entity_id: int, prompt_version: int
+) -> AiSummary | None:
+    """
+    Returns the latest summary of an entity with the given prompt version,
+    whatever data it was generated from.
+    """
+    return tx.exec(
+        select(AiSummary)
+        .where(
+            AiSummary.entity_type == entity_type,
+            AiSummary.entity_id == entity_id,
+            AiSummary.prompt_version == prompt_version,
+        )
+        .order_by(AiSummary.created_at.desc())
+        .limit(1)
+    ).first()
+
+
+def save_ai_summary(
+    tx: Session,
+    entity_type: AiSummaryEntity,
+    entity_id: int,
+    prompt_version: int,
+    input_hash: str,
+    summary: str,
+):
+    """
+    Saves a summary, and deletes the summaries of the entity that it
+    supersedes.
+    """
+    dialect = postgresql if tx.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(AiSummary).values(
+        entity_type=entity_type,
+        entity_id=entity_id,
+        prompt_version=prompt_version,
+        input_hash=input_hash,
+        summary=summary,
+    )
+    tx.execute(
+        statement.on_conflict_do_update(
+            index_elements=["entity_type", "entity_id", "prompt_version", "input_hash"],
+            set_={"summary": statement.excluded.summary, "updated_at": func.now()},
+        )
+    )
+    tx.exec(
+        delete(AiSummary).where(
+            AiSummary.entity_type == entity_type,
+            AiSummary.entity_id == entity_id,
+            or_(
+                AiSummary.prompt_version != prompt_version,
+                AiSummary.input_hash != input_hash,
+            ),
+        )
+    )
+    tx.commit()
@@ -1,6 +1,7 @@
 from domain.helpers.Timestampable import Timestampable
 from internal.errors.client_errors import NotFoundError
 from sqlmodel import Field, Session, select
+from utilities.response_cache import CacheNamespace, invalidate_responses
 
 
 class BugCategory(Timestampable, table=True):
@@ -30,6 +31,7 @@ def get_bug_category_id_by_name(tx: Session, name: str):
 def save_bug_category(tx: Session, bug_category: BugCategory):
     tx.add(bug_category)
     tx.commit()
+    invalidate_responses(CacheNamespace.BugCategories)
     return bug_category
 
 
@@ -39,4 +41,5 @@ def delete_bug_category(tx: Session, bug_category_id: int):
         raise NotFoundError(f"Bug category {bug_category_id} not found")
     tx.delete(bug_category)
     tx.commit()
+    invalidate_responses(CacheNamespace.BugCategories)
     return bug_category
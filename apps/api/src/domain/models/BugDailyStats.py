@@ -0,0 +1,213 @@
+from collections import Counter
+from datetime import date, datetime
+
+from domain.enums import TrendGranularity
+from domain.helpers.trend import accumulate_trend, get_bucket_starts, get_trend_day
+from domain.models.BugCategory import BugCategory
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Field, Session, SQLModel, delete, func, insert, select, text
+
+# Unclassified bug reports are counted under this category id, as primary
+# key columns cannot be NULL
+UNCLASSIFIED_CATEGORY_ID = -1
+
+# (dbms_id, category_id, day)
+BugDailyStatsKey = tuple[int, int, date]
+
+# Key of the Postgres advisory lock between increments and rebuilds
+_LOCK_KEY = 0x73746174
+
+
+class BugDailyStats(SQLModel, table=True):
+    """
+    Number of bug reports created per DBMS, category and UTC+8 day.
+
+    Kept up to date in the same transaction as the bug report writes in
+    domain.models.BugReport, and rebuilt from scratch by
+    rebuild_bug_daily_stats, which domain.schema.create_schema runs to
+    backfill an empty table.
+    """
+
+    __tablename__ = "bug_daily_stats"
+    dbms_id: int = Field(foreign_key="dbms_systems.id", primary_key=True)
+    category_id: int = Field(primary_key=True)
+    day: date = Field(primary_key=True)
+    count: int = Field(nullable=False, default=0)
+
+
+def get_bug_daily_stats_key(
+    dbms_id: int, category_id: int | None, created_at: datetime
+) -> BugDailyStatsKey:
+    if category_id is None:
+        category_id = UNCLASSIFIED_CATEGORY_ID
+    return dbms_id, category_id, get_trend_day(created_at)
+
+
+def _to_rows(counts: Counter[BugDailyStatsKey]) -> list[dict]:
+    return [
+        {"dbms_id": dbms_id, "category_id": category_id, "day": day, "count": count}
+        for (dbms_id, category_id, day), count in counts.items()
+        if count != 0
+    ]
+
+
+def lock_bug_daily_stats(tx: Session, exclusive: bool = False):
+    """
+    Holds the lock on the daily counts until this transaction ends.
+    Increments add up in any order, so they share it, but a rebuild must
+    hold it alone: an increment committed between the rebuild's read of the
+    bug reports and its write would otherwise be lost or counted twice.
+    SQLite only allows one writer at a time anyway.
+    """
+    if tx.get_bind().dialect.name == "postgresql":
+        function = (
+            "pg_advisory_xact_lock" if exclusive else "pg_advisory_xact_lock_shared"
+        )
+        tx.exec(text(f"SELECT {function}(:key)").bindparams(key=_LOCK_KEY))
+
+
+def has_bug_daily_stats(tx: Session) -> bool:
+    return tx.exec(select(BugDailyStats.dbms_id).limit(1)).first() is not None
+
+
+def increment_bug_daily_stats(tx: Session, deltas: Counter[BugDailyStatsKey]):
+    """
+    Adds the given deltas to the daily counts with a single upsert.
+    Does not commit, so that the counts change together with the bug
+    reports they describe.
+    """
+    rows = _to_rows(deltas)
+    if not rows:
+        return
+    lock_bug_daily_stats(tx)
+    dialect = postgresql if tx.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(BugDailyStats)
+    tx.execute(
+        statement.on_conflict_do_update(
+            index_elements=["dbms_id", "category_id", "day"],
+            set_={"count": BugDailyStats.count + statement.excluded.count},
+        ),
+        rows,
+    )
+
+
+def replace_bug_daily_stats(
+    tx: Session,
+    counts: Counter[BugDailyStatsKey],
+    dbms_id: int | None = None,
+):
+    """
+    Replaces the daily counts of a DBMS, or of all DBMSes if dbms_id is None,
+    and commits. The caller must hold the exclusive lock_bug_daily_stats
+    since it read the bug reports that `counts` come from.
+    """
+    statement = delete(BugDailyStats)
+    if dbms_id is not None:
+        statement = statement.where(BugDailyStats.dbms_id == dbms_id)
+    tx.exec(statement)
+    rows = _to_rows(counts)
+    if rows:
+        tx.execute(insert(BugDailyStats), rows)
+    tx.commit()
+
+
+def _get_counts_before(tx: Session, dbms_id: int, before: date) -> dict[int, int]:
+    return dict(
+        tx.exec(
+            select(BugDailyStats.category_id, func.sum(BugDailyStats.count))
+            .where(BugDailyStats.dbms_id == dbms_id, BugDailyStats.day < before)
+            .group_by(BugDailyStats.category_id)
+        ).all()
+    )
+
+
+def _get_daily_counts_since(tx: Session, dbms_id: int, since: date):
+    return tx.exec(
+        select(BugDailyStats.category_id, BugDailyStats.day, BugDailyStats.count)
+        .where(BugDailyStats.dbms_id == dbms_id, BugDailyStats.day >= since)
+        .order_by(BugDailyStats.day)
+    ).all()
+
+
+def get_bug_trend_by_category_from_daily_stats(
+    tx: Session,
+    dbms_id: int,
+    periods: int,
+    today: date,
+    granularity: TrendGranularity = TrendGranularity.Day,
+) -> dict[int | None, list[int]]:
+    """
+    Returns the total number of bug reports of a DBMS at the end of each of
+    the last `periods` buckets, oldest first, per category id. Unclassified
+    bug reports are keyed under None.
+
+    Reads one row per category and day in the period, plus one aggregate
+    row per category for the totals before it.
+    """
+    bucket_starts = get_bucket_starts(today, periods, granularity)
+    baselines = _get_counts_before(tx, dbms_id, bucket_starts[0])
+    daily_counts: dict[int, list[tuple[date, int]]] = {}
+    for category_id, day, count in _get_daily_counts_since(
+        tx, dbms_id, bucket_starts[0]
+    ):
+        daily_counts.setdefault(category_id, []).append((day, count))
+
+    trends = {}
+    for category_id in baselines.keys() | daily_counts.keys():
+        trend = accumulate_trend(
+            bucket_starts,
+            granularity,
+            baselines.get(category_id, 0),
+            daily_counts.get(category_id, []),
+        )
+        if category_id == UNCLASSIFIED_CATEGORY_ID:
+            category_id = None
+        trends[category_id] = trend
+    return trends
+
+
+def get_bug_trend_from_daily_stats(
+    tx: Session,
+    dbms_id: int,
+    periods: int,
+    today: date,
+    granularity: TrendGranularity = TrendGranularity.Day,
+) -> list[int]:
+    """
+    Same as get_bug_trend_by_category_from_daily_stats, summed over all
+    categories.
+    """
+    trends = get_bug_trend_by_category_from_daily_stats(
+        tx, dbms_id, periods, today, granularity
+    )
+    return [sum(totals) for totals in zip(*trends.values())] or [0] * periods
+
+
+def get_bug_count_on_day(tx: Session, dbms_id: int, day: date) -> int:
+    count = tx.exec(
+        select(func.sum(BugDailyStats.count)).where(
+            BugDailyStats.dbms_id == dbms_id, BugDailyStats.day == day
+        )
+    ).one()
+    return count or 0
+
+
+def get_bug_category_counts_on_day(tx: Session, dbms_id: int, day: date):
+    """
+    Returns (id, name, count) for each category with new bug reports on the
+    given day.
+    """
+    return tx.exec(
+        select(
+            BugDailyStats.category_id.label("id"),
+            BugCategory.name.label("name"),
+            BugDailyStats.count.label("count"),
+        )
+        .join(BugCategory, BugDailyStats.category_id == BugCategory.id)
+        .where(
+            BugDailyStats.dbms_id == dbms_id,
+            BugDailyStats.day == day,
+            BugDailyStats.count > 0,
+        )
+        .order_by(BugDailyStats.category_id)
+    ).all()
@@ -1,15 +1,45 @@
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
+from collections import Counter
+from typing import Callable, Iterator
 
-from domain.enums import PriorityLevel
+from domain.enums import PriorityLevel, SearchMode
+from domain.helpers.cursor import SearchCursor
+from domain.helpers.search import build_prefix_tsquery
 from domain.helpers.Timestampable import Timestampable
 from domain.models.BugCategory import BugCategory, get_bug_category_by_id
+from domain.models.BugDailyStats import (
+    get_bug_daily_stats_key,
+    increment_bug_daily_stats,
+    lock_bug_daily_stats,
+    replace_bug_daily_stats,
+)
+from domain.models.BugSimilarity import BugSimilarity, delete_bug_similarities
+from domain.models.Comment import Comment
 from domain.models.DBMSSystem import DBMSSystem
 from internal.errors.client_errors import NotFoundError
 from pydantic import ValidationInfo, field_validator
-from sqlalchemy import Enum
+from sqlalchemy import (
+    Enum,
+    Index,
+    case,
+    cast,
+    column,
+    delete,
+    insert,
+    literal,
+    literal_column,
+    null,
+    or_,
+    true,
+    tuple_,
+    values,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import aliased
 from sqlalchemy.sql import func
 from sqlalchemy.sql.operators import is_
-from sqlmodel import TIMESTAMP, Field, Relationship, Session, select, text
+from sqlmodel import TIMESTAMP, Field, Relationship, Session, select, update
+from utilities.constants import constants
 
 
 class BugReport(Timestampable, table=True):
@@ -66,15 +96,75 @@ class BugReport(Timestampable, table=True):
         return value
 
 
+# Indexes for the hot queries below. Existing databases get them through
+# domain.schema.create_schema, which creates any that are missing.
+# Search pages and per-category counts: filter by DBMS and category, then
+# walk the keyset in (created_at, id) order
+Index(
+    "ix_bug_reports_dbms_category_created",
+    BugReport.dbms_id,
+    BugReport.category_id,
+    BugReport.created_at.desc(),
+    BugReport.id.desc(),
+)
+# Natural key of a bug report, which the fetcher upserts on
+BUG_REPORT_KEY_INDEX = Index(
+    "ux_bug_reports_dbms_url",
+    BugReport.dbms_id,
+    BugReport.url,
+    unique=True,
+)
+# Latest issue update per DBMS, for the fetcher's updated:>= watermark
+Index(
+    "ix_bug_reports_dbms_issue_updated",
+    BugReport.dbms_id,
+    BugReport.issue_updated_at.desc(),
+)
+# Work queues of the classifier and vectorizer, which shrink to nothing as
+# the workers catch up
+Index(
+    "ix_bug_reports_unclassified",
+    BugReport.id,
+    postgresql_where=BugReport.category_id.is_(None),
+    sqlite_where=BugReport.category_id.is_(None),
+)
+Index(
+    "ix_bug_reports_unvectorized",
+    BugReport.id,
+    postgresql_where=BugReport.vector.is_(None),
+    sqlite_where=BugReport.vector.is_(None),
+)
+# Incremental refreshes of the similarity index
+Index(
+    "ix_bug_reports_vectorized_updated",
+    BugReport.updated_at,
+    postgresql_where=BugReport.vector.is_not(None),
+    sqlite_where=BugReport.vector.is_not(None),
+)
+
+
 def get_bug_report_ids_by_dbms_id(tx: Session, dbms_id: int):
-    return tx.exec(select(BugReport.id).where(BugReport.dbms_id == dbms_id)).all()
+    # Ordered, so that a seeded sample of the ids is the same on unchanged data
+    return tx.exec(
+        select(BugReport.id).where(BugReport.dbms_id == dbms_id).order_by(BugReport.id)
+    ).all()
 
 
-def get_bug_ids_by_dbms_cat_id(tx: Session, dbms_id: int, category_id: int):
+def get_bug_category_counts_by_dbms_id(tx: Session, dbms_id: int):
+    """
+    Counts the classified bug reports of a DBMS per category, as
+    (id, name, count) rows ordered by category id.
+    """
     return tx.exec(
-        select(BugReport.id).where(
-            BugReport.dbms_id == dbms_id, BugReport.category_id == category_id
+        select(
+            BugCategory.id.label("id"),
+            BugCategory.name.label("name"),
+            func.count(BugReport.id).label("count"),
         )
+        .join(BugCategory, BugReport.category_id == BugCategory.id)
+        .where(BugReport.dbms_id == dbms_id)
+        .group_by(BugCategory.id, BugCategory.name)
+        .order_by(BugCategory.id)
     ).all()
 
 
@@ -96,62 +186,599 @@ def get_bug_categories_by_dbms_id(tx: Session, dbms_id: int):
     ).all()
 
 
+# Generated tsvector over the title and description, which only exists in
+# Postgres (see db/seeds), so it is not part of the model
+_SEARCH_VECTOR = literal_column("bug_reports.search_vector")
+
+
+def _get_search_filter(search: str | None, mode: SearchMode):
+    """
+    Returns the condition that bug reports must meet to match the search
+    string, and an expression to rank the matches by, if the mode has one.
+    """
+    if not search:
+        return true(), None
+    match mode:
+        case SearchMode.FullText:
+            tsquery_text = build_prefix_tsquery(search)
+            if tsquery_text is None:
+                return true(), None
+            tsquery = func.to_tsquery("english", tsquery_text)
+            condition = _SEARCH_VECTOR.op("@@")(tsquery)
+            return condition, func.ts_rank(_SEARCH_VECTOR, tsquery)
+        case SearchMode.Trigram:
+            # Uses the trigram index on titles via the <% operator
+            condition = literal(search).op("<%")(BugReport.title)
+            return condition, func.word_similarity(search, BugReport.title)
+        case _:
+            return BugReport.title.ilike(f"%{search}%"), None
+
+
 def get_bug_report_by_search_and_cat(
     tx: Session,
     dbms_id: int,
     search: str | None,
     categories: list[int],
-    start: int,
-    limit: int | None,
-    per_category_limit: int | None = None,
-):
-    row_number = (
-        func.row_number()
-        .over(
-            partition_by=BugReport.category_id,
-            order_by=BugReport.created_at.desc(),
-        )
-        .label("row_number")
+    limit: int,
+    after: SearchCursor | None = None,
+    per_category: bool = False,
+    mode: SearchMode = SearchMode.Substring,
+) -> list[tuple[BugReport, float | None]]:
+    """
+    Returns a page of bug reports matching the search string, together with
+    their rank, in (rank, created_at, id) descending order. The rank is None
+    unless the search is ranked.
+
+    Pages are fetched by keyset rather than by offset: the next page starts
+    right after the `after` cursor, so that every page is an index seek and
+    new bug reports do not shift later pages.
+
+    :param limit:
+        Maximum number of bug reports to return, or to return per category
+        if `per_category` is set.
+    :raises ValueError:
+        If the cursor comes from a ranked search and this one is not, or
+        the other way round.
+    """
+    condition, rank = _get_search_filter(search, mode)
+    sort_keys = [BugReport.created_at, BugReport.id]
+    if rank is not None:
+        sort_keys.insert(0, rank)
+    order_by = [key.desc() for key in sort_keys]
+
+    query = select(
+        BugReport, (rank if rank is not None else null()).label("rank")
+    ).where(
+        BugReport.dbms_id == dbms_id,
+        BugReport.category_id.in_(categories),
+        condition,
     )
+    if after is not None:
+        if (after.rank is None) != (rank is None):
+            raise ValueError("Cursor does not belong to this search")
+        after_keys = [after.created_at, after.id]
+        if rank is not None:
+            after_keys.insert(0, after.rank)
+        query = query.where(tuple_(*sort_keys) < tuple_(*after_keys))
+
+    if not per_category:
+        return tx.exec(query.order_by(*order_by).limit(limit)).all()
+
+    row_number = func.row_number().over(
+        partition_by=BugReport.category_id, order_by=order_by
+    )
+    ranked = query.add_columns(row_number.label("row_number")).subquery()
+    ranked_report = aliased(BugReport, ranked)
+    return tx.exec(
+        select(ranked_report, ranked.c.rank)
+        .where(ranked.c.row_number <= limit)
+        .order_by(ranked.c.category_id, ranked.c.row_number)
+    ).all()
 
-    query = (
-        select(BugReport, row_number)
-        .where(BugReport.dbms_id == dbms_id)
-        .where(search is None or BugReport.title.ilike(f"%{search}%"))
-        .where(BugReport.category_id.in_(categories))
-        .offset(start)
-        .limit(limit)
+
+def get_latest_bug_report_update_time(tx: Session, dbms_id: int):
+    """
+    Returns the latest time an issue of the DBMS was updated on GitHub, as
+    of its last fetch.
+    """
+    return tx.exec(
+        select(BugReport.issue_updated_at)
+        .where(BugReport.dbms_id == dbms_id, BugReport.issue_updated_at.is_not(None))
+        .order_by(BugReport.issue_updated_at.desc())
+        .limit(1)
+    ).first()
+
+
+# Columns needed to classify a bug report and to move its daily stats
+_CLASSIFIER_COLUMNS = [
+    BugReport.id,
+    BugReport.dbms_id,
+    BugReport.category_id,
+    BugReport.created_at,
+    BugReport.title,
+    BugReport.description,
+]
+
+# Columns needed to vectorize a bug report and to add it to the index
+_VECTORIZER_COLUMNS = [
+    BugReport.id,
+    BugReport.dbms_id,
+    BugReport.title,
+    BugReport.description,
+]
+
+
+def _iter_claimed_batches(
+    tx: Session, columns: list, condition, batch_size: int
+) -> Iterator[list]:
+    """
+    Walks the bug reports matching `condition` in id order, yielding at most
+    `batch_size` rows of `columns` at a time.
+
+    Each batch is read with FOR UPDATE SKIP LOCKED, so rows claimed by
+    another worker are passed over rather than waited on. The claim lasts
+    until the caller's transaction ends, so callers should commit once they
+    are done with a batch, and before asking for the next one.
+    """
+    after_id = None
+    while True:
+        query = select(*columns).where(condition)
+        if after_id is not None:
+            query = query.where(BugReport.id > after_id)
+        batch = tx.exec(
+            query.order_by(BugReport.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not batch:
+            return
+        yield batch
+        if len(batch) < batch_size:
+            return
+        after_id = batch[-1].id
+
+
+def _get_claimed_rows_by_ids(
+    tx: Session, columns: list, condition, bug_report_ids: list[int]
+) -> list:
+    """
+    Claims the given bug reports like _iter_claimed_batches, skipping those
+    that no longer match `condition` or that another worker has claimed.
+    """
+    return tx.exec(
+        select(*columns)
+        .where(BugReport.id.in_(bug_report_ids), condition)
+        .order_by(BugReport.id)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+
+def iter_unclassified_bug_batches(tx: Session, batch_size: int) -> Iterator[list]:
+    """
+    Claims unclassified bug reports in batches of _CLASSIFIER_COLUMNS rows,
+    see _iter_claimed_batches.
+    """
+    return _iter_claimed_batches(
+        tx, _CLASSIFIER_COLUMNS, is_(BugReport.category_id, None), batch_size
     )
 
-    if per_category_limit is None:
-        res = tx.exec(query).all()
-        return [r[0] for r in res]
 
-    # Somehow, we can't just select * despite correct SQL generated
-    query = (
-        select(BugReport)
-        .join(query.subquery().alias("sq"), BugReport.id == text("sq.id"))
-        .where(text("row_number <= :per_category_limit"))
+def get_unclassified_bug_ids(tx: Session) -> list[int]:
+    return tx.exec(
+        select(BugReport.id)
+        .where(is_(BugReport.category_id, None))
+        .order_by(BugReport.id)
+    ).all()
+
+
+def get_unclassified_bugs_by_ids(tx: Session, bug_report_ids: list[int]) -> list:
+    """
+    Claims the given bug reports, skipping any classified in the meantime.
+    Rows have the same columns as in iter_unclassified_bug_batches.
+    """
+    return _get_claimed_rows_by_ids(
+        tx, _CLASSIFIER_COLUMNS, is_(BugReport.category_id, None), bug_report_ids
+    )
+
+
+def iter_unvectorized_bug_batches(tx: Session, batch_size: int) -> Iterator[list]:
+    """
+    Claims unvectorized bug reports in batches of _VECTORIZER_COLUMNS rows,
+    see _iter_claimed_batches.
+    """
+    return _iter_claimed_batches(
+        tx, _VECTORIZER_COLUMNS, is_(BugReport.vector, None), batch_size
+    )
+
+
+def get_unvectorized_bugs_by_ids(tx: Session, bug_report_ids: list[int]) -> list:
+    """
+    Claims the given bug reports, skipping any vectorized in the meantime.
+    Rows have the same columns as in iter_unvectorized_bug_batches.
+    """
+    return _get_claimed_rows_by_ids(
+        tx, _VECTORIZER_COLUMNS, is_(BugReport.vector, None), bug_report_ids
     )
-    return tx.exec(query, params={"per_category_limit": per_category_limit}).all()
 
 
-def get_latest_bug_report_time(tx: Session, dbms_id: int):
-    br = tx.scalars(
+def get_bug_report_vectors(tx: Session, updated_since: datetime | None = None):
+    """
+    Selects only the columns needed to build the similarity index,
+    optionally restricted to rows updated at or after `updated_since`.
+    """
+    query = select(
+        BugReport.id, BugReport.dbms_id, BugReport.vector, BugReport.updated_at
+    ).where(BugReport.vector.is_not(None))
+    if updated_since is not None:
+        query = query.where(BugReport.updated_at >= updated_since)
+    return tx.exec(query).all()
+
+
+def get_precomputed_similar_bug_reports(
+    tx: Session, bug_report_id: int, limit: int
+) -> list[BugReport]:
+    """
+    Returns the first `limit` bug reports of the stored list of those most
+    similar to a bug report, most similar first.
+    """
+    return tx.exec(
         select(BugReport)
-        .where(BugReport.dbms_id == dbms_id)
-        .order_by(BugReport.issue_created_at.desc())
-        .limit(1)
-    ).first()
-    return br.issue_created_at if br else None
+        .join(BugSimilarity, BugSimilarity.neighbor_id == BugReport.id)
+        .where(BugSimilarity.bug_id == bug_report_id)
+        .order_by(BugSimilarity.rank)
+        .limit(limit)
+    ).all()
+
+
+def get_bug_report_vector_batch(tx: Session, after_id: int, limit: int):
+    """
+    Selects the next `limit` (id, vector) pairs with an id greater than
+    `after_id`, for walking all stored vectors in id order.
+    """
+    return tx.exec(
+        select(BugReport.id, BugReport.vector)
+        .where(BugReport.vector.is_not(None), BugReport.id > after_id)
+        .order_by(BugReport.id)
+        .limit(limit)
+    ).all()
+
+
+def _execute_in_batches(
+    tx: Session,
+    rows: list,
+    execute: Callable[[list], None],
+    batch_size: int | None,
+) -> list:
+    """
+    Runs `execute` over `rows` in batches, committing once per batch.
+    If a batch fails, its rows are retried one by one so that a single bad
+    row does not prevent the rest of the batch from being written.
+
+    :return:
+        The rows that could not be written.
+    """
+    batch_size = batch_size or constants.BULK_WRITE_BATCH_SIZE
+    failed = []
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start : start + batch_size]
+        try:
+            execute(batch)
+            tx.commit()
+            continue
+        except Exception:
+            tx.rollback()
+        for row in batch:
+            try:
+                execute([row])
+                tx.commit()
+            except Exception:
+                tx.rollback()
+                failed.append(row)
+    return failed
+
+
+def _build_update_by_id(rows: list[dict]):
+    """
+    Builds a single UPDATE ... FROM (VALUES ...) statement that sets the
+    columns of each row on the bug report with its "id".
+    """
+    table = BugReport.__table__
+    names = list(rows[0])
+    new_values = values(
+        *(column(name, table.c[name].type) for name in names), name="new_values"
+    ).data([tuple(row[name] for name in names) for row in rows])
+    # The columns of a VALUES list are typed after its first row, and NULLs
+    # are untyped, so each one is cast back to the type of its column
+    return (
+        update(table)
+        .where(table.c.id == new_values.c.id)
+        .values(
+            {
+                name: cast(new_values.c[name], table.c[name].type)
+                for name in names
+                if name != "id"
+            }
+        )
+    )
+
+
+def _update_by_id(tx: Session, rows: list[dict]):
+    """
+    Updates bug reports by id in one statement. The ORM bulk UPDATE runs
+    one statement per row on psycopg2, so it is only used on SQLite, which
+    cannot name the columns of a VALUES list.
+    """
+    if tx.get_bind().dialect.name == "postgresql":
+        tx.execute(_build_update_by_id(rows))
+    else:
+        tx.execute(update(BugReport), rows)
+
+
+# Columns filled in by the database on insert
+_SERVER_GENERATED_COLUMNS = {"id", "created_at", "updated_at"}
+
+
+def _get_daily_stats_key(bug_report: BugReport):
+    return get_bug_daily_stats_key(
+        bug_report.dbms_id, bug_report.category_id, bug_report.created_at
+    )
+
+
+def insert_bug_reports(
+    tx: Session, bug_reports: list[BugReport], batch_size: int | None = None
+) -> list[BugReport]:
+    """
+    Inserts new bug reports with one multi-row INSERT per batch, and sets
+    the generated id on each inserted report. The daily stats are updated
+    in the same transaction.
+
+    :return:
+        The bug reports that could not be inserted.
+    """
+    statement = insert(BugReport).returning(
+        BugReport.id, BugReport.created_at, sort_by_parameter_order=True
+    )
+
+    def execute(batch: list[BugReport]):
+        rows = tx.execute(
+            statement,
+            [br.model_dump(exclude=_SERVER_GENERATED_COLUMNS) for br in batch],
+        ).all()
+        for br, (id, created_at) in zip(batch, rows):
+            br.id = id
+            br.created_at = created_at
+        increment_bug_daily_stats(tx, Counter(_get_daily_stats_key(br) for br in batch))
+
+    return _execute_in_batches(tx, bug_reports, execute, batch_size)
+
+
+# Columns of a bug report that come from its GitHub issue
+_ISSUE_COLUMNS = [
+    "title",
+    "description",
+    "issue_updated_at",
+    "issue_closed_at",
+    "is_closed",
+]
+
+
+def upsert_bug_reports(
+    tx: Session, bug_reports: list[BugReport], batch_size: int | None = None
+) -> tuple[list[BugReport], list[BugReport]]:
+    """
+    Inserts new bug reports and updates the issue columns of existing ones
+    with the same (dbms_id, url), with one INSERT ... ON CONFLICT DO UPDATE
+    per batch, and sets the id on each report. Existing reports whose issue
+    columns are unchanged are left untouched, so upserting the same issues
+    again writes nothing. The daily stats are updated in the same
+    transaction.
+
+    Bug reports whose title or description changed lose their category and
+    vector, so that they are classified and vectorized again. Changes to
+    other columns, such as the issue being closed, keep them.
+
+    :return:
+        The bug reports that were inserted or whose title or description
+        changed, and the bug reports that could not be written.
+    """
+    dialect = postgresql if tx.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(BugReport)
+    content_changed = or_(
+        BugReport.title != statement.excluded.title,
+        BugReport.description.is_distinct_from(statement.excluded.description),
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[BugReport.dbms_id, BugReport.url],
+        set_={
+            **{column: statement.excluded[column] for column in _ISSUE_COLUMNS},
+            "category_id": case((content_changed, null()), else_=BugReport.category_id),
+            "vector": case((content_changed, null()), else_=BugReport.vector),
+            "updated_at": func.now(),
+        },
+        # Issues fetched again without changes are not written at all
+        where=or_(
+            *(
+                getattr(BugReport, column).is_distinct_from(statement.excluded[column])
+                for column in _ISSUE_COLUMNS
+            )
+        ),
+    ).returning(BugReport.id, BugReport.dbms_id, BugReport.url, BugReport.created_at)
+    changed: set[int] = set()
+
+    def execute(batch: list[BugReport]):
+        # A statement cannot update the same row twice, so keep the last
+        # copy of an issue that appears twice
+        batch = list({(br.dbms_id, br.url): br for br in batch}.values())
+        keys = [(br.dbms_id, br.url) for br in batch]
+        existing = {
+            (row.dbms_id, row.url): row
+            for row in tx.exec(
+                select(
+                    BugReport.id,
+                    BugReport.dbms_id,
+                    BugReport.url,
+                    BugReport.category_id,
+                    BugReport.created_at,
+                    BugReport.title,
+                    BugReport.description,
+                ).where(tuple_(BugReport.dbms_id, BugReport.url).in_(keys))
+            ).all()
+        }
+        rows = tx.execute(
+            statement,
+            [br.model_dump(exclude=_SERVER_GENERATED_COLUMNS) for br in batch],
+        ).all()
+        written = {(row.dbms_id, row.url): row for row in rows}
+
+        deltas = Counter()
+        for br in batch:
+            key = (br.dbms_id, br.url)
+            # Unchanged rows are not returned
+            row = written.get(key) or existing[key]
+            br.id = row.id
+            br.created_at = row.created_at
+            old = existing.get(key)
+            if old is None:
+                deltas[get_bug_daily_stats_key(br.dbms_id, None, br.created_at)] += 1
+            elif (old.title, old.description) != (br.title, br.description):
+                deltas[_get_daily_stats_key(old)] -= 1
+                deltas[get_bug_daily_stats_key(br.dbms_id, None, br.created_at)] += 1
+            else:
+                continue
+            changed.add(id(br))
+        increment_bug_daily_stats(tx, deltas)
+
+    failed = _execute_in_batches(tx, bug_reports, execute, batch_size)
+    failed_reports = {id(br) for br in failed}
+    changed_reports = [
+        br for br in bug_reports if id(br) in changed and id(br) not in failed_reports
+    ]
+    return changed_reports, failed
+
+
+def _get_duplicate_bug_report_ids(tx: Session) -> list[tuple[int, int]]:
+    """
+    Returns the (id, first id) of every bug report that is not the first of
+    its (dbms_id, url).
+    """
+    first = (
+        select(BugReport.dbms_id, BugReport.url, func.min(BugReport.id).label("id"))
+        .group_by(BugReport.dbms_id, BugReport.url)
+        .having(func.count() > 1)
+        .subquery()
+    )
+    return tx.exec(
+        select(BugReport.id, first.c.id)
+        .join(
+            first,
+            (BugReport.dbms_id == first.c.dbms_id) & (BugReport.url == first.c.url),
+        )
+        .where(BugReport.id != first.c.id)
+    ).all()
+
+
+def count_duplicate_bug_reports(tx: Session) -> int:
+    """Counts the bug reports that merge_duplicate_bug_reports would delete."""
+    return len(_get_duplicate_bug_report_ids(tx))
+
+
+def merge_duplicate_bug_reports(tx: Session, batch_size: int | None = None) -> int:
+    """
+    Deletes all but the first bug report of each (dbms_id, url), moving
+    their comments over to it, and rebuilds the daily stats if any were
+    deleted. Commits.
+
+    :return:
+        The number of bug reports deleted.
+    """
+    duplicates = _get_duplicate_bug_report_ids(tx)
+    if not duplicates:
+        return 0
 
+    for duplicate_id, first_id in duplicates:
+        tx.exec(
+            update(Comment)
+            .where(Comment.bug_report_id == duplicate_id)
+            .values(bug_report_id=first_id)
+        )
+    duplicate_ids = [duplicate_id for duplicate_id, _ in duplicates]
+    delete_bug_similarities(tx, duplicate_ids)
+    tx.exec(delete(BugReport).where(BugReport.id.in_(duplicate_ids)))
+    tx.commit()
+    rebuild_bug_daily_stats(tx, batch_size=batch_size)
+    return len(duplicates)
+
+
+def update_bug_reports(
+    tx: Session, values: list[dict], batch_size: int | None = None
+) -> list[dict]:
+    """
+    Updates existing bug reports with one multi-row UPDATE per batch.
 
-def get_unclassified_bugs(tx: Session):
-    return tx.exec(select(BugReport).where(is_(BugReport.category_id, None))).all()
+    :param values:
+        One dict per bug report, containing its "id" and the columns to set.
+        All dicts in a call should set the same columns.
+    :return:
+        The values that could not be written.
+    """
 
+    def execute(batch: list[dict]):
+        _update_by_id(tx, batch)
 
-def get_unvectorized_bugs(tx: Session):
-    return tx.exec(select(BugReport).where(is_(BugReport.vector, None))).all()
+    return _execute_in_batches(tx, values, execute, batch_size)
+
+
+def classify_bug_reports(
+    tx: Session,
+    classifications: list[tuple[BugReport, int]],
+    batch_size: int | None = None,
+) -> list[tuple[BugReport, int]]:
+    """
+    Sets the category of bug reports with one multi-row UPDATE per batch,
+    moving their daily stats from the old category to the new one in the
+    same transaction.
+
+    :param classifications:
+        (bug report, new category id) pairs. Rows with the id, dbms_id,
+        category_id and created_at of a bug report can stand in for it.
+    :return:
+        The classifications that could not be written.
+    """
+
+    def execute(batch: list[tuple[BugReport, int]]):
+        _update_by_id(
+            tx,
+            [{"id": br.id, "category_id": category_id} for br, category_id in batch],
+        )
+        deltas = Counter()
+        for br, category_id in batch:
+            deltas[_get_daily_stats_key(br)] -= 1
+            deltas[get_bug_daily_stats_key(br.dbms_id, category_id, br.created_at)] += 1
+        increment_bug_daily_stats(tx, deltas)
+
+    return _execute_in_batches(tx, classifications, execute, batch_size)
+
+
+def rebuild_bug_daily_stats(
+    tx: Session, dbms_id: int | None = None, batch_size: int | None = None
+) -> int:
+    """
+    Recomputes the daily stats of a DBMS, or of all DBMSes if dbms_id is
+    None, from the bug reports themselves.
+
+    :return:
+        The number of bug reports counted.
+    """
+    lock_bug_daily_stats(tx, exclusive=True)
+    query = select(BugReport.dbms_id, BugReport.category_id, BugReport.created_at)
+    if dbms_id is not None:
+        query = query.where(BugReport.dbms_id == dbms_id)
+    rows = tx.exec(
+        query.execution_options(yield_per=batch_size or constants.BULK_WRITE_BATCH_SIZE)
+    )
+    counts = Counter(get_bug_daily_stats_key(*row) for row in rows)
+    replace_bug_daily_stats(tx, counts, dbms_id)
+    return counts.total()
 
 
 def save_bug_report(tx: Session, bug_report: BugReport):
@@ -164,7 +791,9 @@ def delete_bug_report(tx: Session, bug_report_id: int):
     bug_report = get_bug_report_by_id(tx, bug_report_id)
     if not bug_report:
         raise NotFoundError(f"Bug report {bug_report_id} not found")
+    delete_bug_similarities(tx, [bug_report_id])
     tx.delete(bug_report)
+    increment_bug_daily_stats(tx, Counter({_get_daily_stats_key(bug_report): -1}))
     tx.commit()
     return bug_report
 
@@ -178,32 +807,15 @@ def update_bug_category(tx: Session, bug_report_id: int, category_id: int):
     if not new_category:
         raise NotFoundError(f"BugCategory with id {category_id} not found")
 
+    deltas = Counter({_get_daily_stats_key(bug_report): -1})
     bug_report.category_id = category_id
+    deltas[_get_daily_stats_key(bug_report)] += 1
     tx.add(bug_report)
+    increment_bug_daily_stats(tx, deltas)
     tx.commit()
     return bug_report
 
 
-def get_bug_trend_last_k_days(tx: Session, dbms_id: int, k: int):
-    today = today = datetime.utcnow().astimezone(timezone(timedelta(hours=8))).date()
-    trend_data = []
-
-    for i in range(k):
-        day_start = today - timedelta(days=i)
-        day_end = day_start + timedelta(days=1)
-
-        count = tx.exec(
-            select(func.count(BugReport.id)).where(
-                BugReport.dbms_id == dbms_id,
-                BugReport.created_at < day_end,
-            )
-        )
-
-        trend_data.append(count.one())
-
-    return trend_data[::-1]
-
-
 def update_bug_priority(tx: Session, bug_report_id: int, priority: PriorityLevel):
     bug_report = tx.get(BugReport, bug_report_id)
     if not bug_report:
@@ -226,21 +838,3 @@ def update_bug_versions_affected(
     tx.add(bug_report)
     tx.commit()
     return bug_report
-
-
-def get_new_bug_report_categories(tx: Session, dbms_id: int):
-    today = datetime.now(timezone(timedelta(hours=8))).date()
-    categories = tx.exec(
-        select(
-            BugReport.category_id.label("id"),
-            BugCategory.name.label("name"),
-            func.count(BugReport.id).label("count"),
-        )
-        .where(
-            BugReport.dbms_id == dbms_id,
-            func.date(BugReport.created_at) == today,
-        )
-        .join(BugCategory, BugReport.category_id == BugCategory.id)
-        .group_by(BugReport.category_id, BugCategory.name)
-    ).all()
-    return categories
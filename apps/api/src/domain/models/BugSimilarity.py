@@ -0,0 +1,123 @@
+from typing import Iterable
+
+from sqlalchemy import Index
+from sqlmodel import Field, Session, SQLModel, delete, func, or_, select, text
+
+# (neighbor id, score) pairs, most similar first
+SimilarityList = list[tuple[int, float]]
+
+# Key of the Postgres advisory lock that serializes writes to the lists
+_LOCK_KEY = 0x62756773
+
+
+class BugSimilarity(SQLModel, table=True):
+    """
+    Precomputed list of the bug reports most similar to each bug report.
+    Keyed by rank, so that the top of a list is a range scan of the primary
+    key.
+    """
+
+    __tablename__ = "bug_similarities"
+    bug_id: int = Field(
+        foreign_key="bug_reports.id", ondelete="CASCADE", primary_key=True
+    )
+    # 1 for the most similar bug report
+    rank: int = Field(primary_key=True)
+    neighbor_id: int = Field(foreign_key="bug_reports.id", ondelete="CASCADE")
+    score: float = Field(nullable=False)
+
+    __table_args__ = (
+        # Finds the lists that contain a bug report, when its vector changes
+        Index("ix_bug_similarities_neighbor_id", "neighbor_id"),
+    )
+
+
+def lock_bug_similarities(tx: Session):
+    """
+    Waits until no other transaction writes the lists, and keeps them from
+    doing so until this one ends. Read-merge-write updates of the lists
+    must hold it, as two of them would otherwise overwrite each other's
+    entrants or collide on the (bug_id, rank) of a rewritten list. SQLite
+    only allows one writer at a time anyway.
+    """
+    if tx.get_bind().dialect.name == "postgresql":
+        tx.exec(text("SELECT pg_advisory_xact_lock(:key)").bindparams(key=_LOCK_KEY))
+
+
+def get_bug_similarity_lists(
+    tx: Session, bug_ids: Iterable[int]
+) -> dict[int, SimilarityList]:
+    """Returns the stored list of each bug report that has one."""
+    lists: dict[int, SimilarityList] = {}
+    rows = tx.exec(
+        select(BugSimilarity.bug_id, BugSimilarity.neighbor_id, BugSimilarity.score)
+        .where(BugSimilarity.bug_id.in_(list(bug_ids)))
+        .order_by(BugSimilarity.bug_id, BugSimilarity.rank)
+    ).all()
+    for bug_id, neighbor_id, score in rows:
+        lists.setdefault(bug_id, []).append((neighbor_id, score))
+    return lists
+
+
+def get_bug_ids_listing_neighbors(tx: Session, neighbor_ids: list[int]) -> set[int]:
+    """Returns the bug reports whose lists contain any of `neighbor_ids`."""
+    return set(
+        tx.exec(
+            select(BugSimilarity.bug_id)
+            .distinct()
+            .where(BugSimilarity.neighbor_id.in_(neighbor_ids))
+        ).all()
+    )
+
+
+def get_min_full_list_score(tx: Session, k: int) -> float | None:
+    """
+    Returns the lowest score that a bug report needs to enter any of the
+    stored lists, which is -inf if some list has fewer than `k` entries, or
+    None if no lists are stored.
+    """
+    listed, full, min_score = tx.exec(
+        select(
+            func.count(func.distinct(BugSimilarity.bug_id)),
+            func.count().filter(BugSimilarity.rank == k),
+            func.min(BugSimilarity.score).filter(BugSimilarity.rank == k),
+        )
+    ).one()
+    if listed == 0:
+        return None
+    if full < listed:
+        return float("-inf")
+    return min_score
+
+
+def replace_bug_similarity_lists(tx: Session, lists: dict[int, SimilarityList]):
+    """Replaces the stored lists of the given bug reports."""
+    if not lists:
+        return
+    tx.exec(delete(BugSimilarity).where(BugSimilarity.bug_id.in_(list(lists))))
+    rows = [
+        {"bug_id": bug_id, "rank": rank, "neighbor_id": neighbor_id, "score": score}
+        for bug_id, neighbors in lists.items()
+        for rank, (neighbor_id, score) in enumerate(neighbors, start=1)
+    ]
+    if rows:
+        tx.execute(BugSimilarity.__table__.insert(), rows)
+
+
+def delete_bug_similarities(tx: Session, bug_ids: list[int]):
+    """
+    Deletes the lists of the given bug reports, and removes them from the
+    lists of others.
+    """
+    tx.exec(
+        delete(BugSimilarity).where(
+            or_(
+                BugSimilarity.bug_id.in_(bug_ids),
+                BugSimilarity.neighbor_id.in_(bug_ids),
+            )
+        )
+    )
+
+
+def delete_all_bug_similarities(tx: Session):
+    tx.exec(delete(BugSimilarity))
@@ -2,6 +2,7 @@ from domain.helpers.Timestampable import Timestampable
 from internal.errors.client_errors import NotFoundError
 from pydantic import computed_field
 from sqlmodel import Field, Session, select
+from utilities.response_cache import CacheNamespace, invalidate_responses
 
 
 class DBMSSystem(Timestampable, table=True):
@@ -31,6 +32,7 @@ def get_dbms_system_by_id(tx: Session, dbms_system_id: int):
 def save_dbms_system(tx: Session, dbms_system: DBMSSystem):
     tx.add(dbms_system)
     tx.commit()
+    invalidate_responses(CacheNamespace.DbmsSystems)
     return dbms_system
 
 
@@ -40,4 +42,5 @@ def delete_dbms_system(tx: Session, dbms_system_id: int):
         raise NotFoundError(f"DBMS system {dbms_system_id} not found")
     tx.delete(dbms_system)
     tx.commit()
+    invalidate_responses(CacheNamespace.DbmsSystems)
     return dbms_system
@@ -0,0 +1,45 @@
+from domain.helpers.Timestampable import Timestampable
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Field, Session, delete, func
+
+
+class GitHubSyncCheckpoint(Timestampable, table=True):
+    """
+    Last page of GitHub search results stored for a DBMS, while a fetch is
+    in progress. A fetch that is retried after failing resumes from here
+    with the same query, rather than starting over.
+    """
+
+    __tablename__ = "github_sync_checkpoints"
+    dbms_id: int = Field(foreign_key="dbms_systems.id", primary_key=True)
+    query: str = Field(nullable=False)
+    page: int = Field(nullable=False)
+
+
+def get_github_sync_checkpoint(
+    tx: Session, dbms_id: int
+) -> GitHubSyncCheckpoint | None:
+    return tx.get(GitHubSyncCheckpoint, dbms_id)
+
+
+def save_github_sync_checkpoint(tx: Session, dbms_id: int, query: str, page: int):
+    dialect = postgresql if tx.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(GitHubSyncCheckpoint).values(
+        dbms_id=dbms_id, query=query, page=page
+    )
+    tx.execute(
+        statement.on_conflict_do_update(
+            index_elements=["dbms_id"],
+            set_={
+                "query": statement.excluded.query,
+                "page": statement.excluded.page,
+                "updated_at": func.now(),
+            },
+        )
+    )
+    tx.commit()
+
+
+def delete_github_sync_checkpoint(tx: Session, dbms_id: int):
+    tx.exec(delete(GitHubSyncCheckpoint).where(GitHubSyncCheckpoint.dbms_id == dbms_id))
+    tx.commit()
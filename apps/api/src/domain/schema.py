@@ -0,0 +1,60 @@
+import domain.models.AiSummary
+import domain.models.BugCategory
+import domain.models.BugDailyStats
+import domain.models.BugReport
+import domain.models.BugSimilarity
+import domain.models.Comment
+import domain.models.DBMSSystem
+import domain.models.GitHubSyncCheckpoint
+import domain.models.User
+from domain.models.BugDailyStats import has_bug_daily_stats
+from domain.models.BugReport import (
+    BUG_REPORT_KEY_INDEX,
+    count_duplicate_bug_reports,
+    rebuild_bug_daily_stats,
+)
+from sqlalchemy import Engine, inspect
+from sqlmodel import Session, SQLModel
+
+
+def create_schema(engine: Engine, batch_size: int | None = None):
+    """
+    Creates the tables of all models, along with their indexes.
+
+    create_all only creates the indexes of tables that it creates, so the
+    indexes of existing tables are created here if they are missing. This is
+    idempotent, and safe to run on every startup.
+
+    The daily stats are only ever adjusted by the bug report writes, so they
+    are backfilled from the existing bug reports while the table is empty.
+
+    :param batch_size:
+        Number of bug reports read at a time by the backfill.
+    :raises RuntimeError:
+        If duplicate bug reports prevent the creation of a unique index.
+    """
+    SQLModel.metadata.create_all(engine)
+
+    # A unique index cannot be created over rows that break it. Merging them
+    # deletes bug reports, so it is left to merge_duplicate_bug_reports.py
+    bug_report_indexes = inspect(engine).get_indexes(BUG_REPORT_KEY_INDEX.table.name)
+    if BUG_REPORT_KEY_INDEX.name not in {index["name"] for index in bug_report_indexes}:
+        with Session(engine) as tx:
+            duplicate_count = count_duplicate_bug_reports(tx)
+        if duplicate_count:
+            raise RuntimeError(
+                f"Cannot create {BUG_REPORT_KEY_INDEX.name}: {duplicate_count} bug "
+                "reports duplicate the (dbms_id, url) of another. Merge them with "
+                "`yarn merge:duplicates` first."
+            )
+
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+    with Session(engine, expire_on_commit=False) as tx:
+        if not has_bug_daily_stats(tx):
+            rebuild_bug_daily_stats(tx, batch_size=batch_size)
+
+
+__all__ = ["create_schema"]
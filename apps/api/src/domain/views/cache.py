@@ -0,0 +1,8 @@
+from utilities.views import BaseResponseModel
+
+
+class CacheStatsResponseDto(BaseResponseModel):
+    hits: int
+    misses: int
+    # Requests served without the cache because Redis was unreachable
+    errors: int
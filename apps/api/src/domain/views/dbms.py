@@ -15,6 +15,12 @@ class BugCategoryResponseDto(BaseResponseModel):
     count: int = 0
 
 
+class BugCategoryTrendResponseDto(BaseResponseModel):
+    id: int
+    name: str
+    trend: list[int]
+
+
 class BugCategoryUpdateDto(BaseResponseModel):
     category_id: int
 
@@ -58,11 +64,17 @@ class BugReportResponseDto(BaseResponseModel):
 
 class BugSearchResponseDto(BaseResponseModel):
     bug_reports: list[BugReportResponseDto]
+    # Opaque cursor to the next page, None on the last page
+    next_cursor: str | None = None
+    # Cursor to the next page of each category, by category id, when
+    # searching across all categories. Used to load more bugs per category
+    # on Bug Explore on the FE
+    category_cursors: dict[int, str | None] = {}
 
 
 class BugSearchCategoryResponseDto(BaseResponseModel):
-    # Bug distribution used to establish the current loaded bugs
-    # on Bug Explore on the FE
-    new_bug_distr: list[int]
     # Load more feature
     bug_reports_delta: list[BugReportResponseDto]
+    # Cursor to pass when loading more bugs of this category, None once
+    # all bugs of the category are loaded
+    next_cursor: str | None
@@ -0,0 +1,22 @@
+from utilities.views import BaseResponseModel
+
+
+class PoolStatsResponseDto(BaseResponseModel):
+    # Only reported when connections are pooled, i.e. not in PgBouncer mode
+    size: int | None = None
+    checked_out: int | None = None
+    overflow: int | None = None
+    checkouts: int
+    # Checkouts that gave up waiting for a connection
+    timeouts: int
+    # Time taken by recent checkouts, including waiting for a connection
+    wait_p50_ms: float
+    wait_p99_ms: float
+    wait_max_ms: float
+
+
+class HealthResponseDto(BaseResponseModel):
+    status: str
+    database: bool
+    # Connection pools of this process, by "api" or "worker"
+    pools: dict[str, PoolStatsResponseDto]
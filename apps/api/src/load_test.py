@@ -0,0 +1,114 @@
+import argparse
+import asyncio
+import time
+from collections import defaultdict
+
+import httpx
+import numpy as np
+
+
+def get_endpoints(dbms_id: int, bug_id: int) -> list[str]:
+    """A mix of the dashboard reads and of the slower bug report pages."""
+    return [
+        "/api/v1/dbms/",
+        f"/api/v1/dbms/{dbms_id}",
+        f"/api/v1/dbms/{dbms_id}/bug_trend",
+        f"/api/v1/dbms/{dbms_id}/new_reports",
+        f"/api/v1/dbms/{dbms_id}/new_report_categories",
+        f"/api/v1/dbms/{dbms_id}/bug_search?search=crash",
+        f"/api/v1/dbms/{dbms_id}/ai_summary",
+        "/api/v1/categories/",
+        f"/api/v1/bug_reports/{bug_id}",
+        f"/api/v1/bug_reports/{bug_id}/similar_bugs?limit=10",
+        f"/api/v1/bug_reports/{bug_id}/ai_summary",
+    ]
+
+
+async def run_client(
+    client: httpx.AsyncClient,
+    endpoints: list[str],
+    offset: int,
+    deadline: float,
+    latencies: dict[str, list[float]],
+    errors: dict[str, int],
+):
+    """Requests the endpoints in turn, one at a time, until the deadline."""
+    i = offset
+    while time.perf_counter() < deadline:
+        endpoint = endpoints[i % len(endpoints)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            response = await client.get(endpoint)
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            failed = True
+        if failed:
+            errors[endpoint] += 1
+        else:
+            latencies[endpoint].append(time.perf_counter() - start)
+
+
+async def run_load_test(
+    base_url: str,
+    endpoints: list[str],
+    concurrency: int,
+    seconds: float,
+    token: str | None,
+):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, headers=headers, limits=limits, timeout=60
+    ) as client:
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(
+            *(
+                run_client(client, endpoints, offset, deadline, latencies, errors)
+                for offset in range(concurrency)
+            )
+        )
+
+    print(f"{'endpoint':<60} {'ok':>6} {'err':>5} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for endpoint in endpoints:
+        times = np.array(latencies[endpoint]) * 1000
+        p50, p95, p99 = np.percentile(times, [50, 95, 99]) if len(times) else [0] * 3
+        print(
+            f"{endpoint:<60} {len(times):>6} {errors[endpoint]:>5} "
+            f"{p50:>6.0f}ms {p95:>6.0f}ms {p99:>6.0f}ms"
+        )
+    total = sum(len(times) for times in latencies.values())
+    print(f"\nThroughput: {total / seconds:.1f} requests/s with {concurrency} clients")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the throughput and latency of a running API under "
+        "concurrent requests. Run it against the API before and after a change "
+        "to compare them."
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--dbms-id", type=int, default=1)
+    parser.add_argument("--bug-id", type=int, default=1)
+    parser.add_argument(
+        "--token", help="Access token, unless the API runs in development mode"
+    )
+    args = parser.parse_args()
+
+    asyncio.run(
+        run_load_test(
+            args.base_url,
+            get_endpoints(args.dbms_id, args.bug_id),
+            args.concurrency,
+            args.seconds,
+            args.token,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,17 @@
+from configuration.cache import configure_response_cache
 from configuration.config import load_configurations
 from configuration.db import configure_database
 from configuration.logger import configure_logger
 from configuration.openai import configure_openai
 from configuration.startup_info import configure_startup_info
+from configuration.thread_pool import configure_thread_pool
 from controllers.auth_controller import router as auth_router
 from controllers.bug_category_controller import router as bug_category_router
 from controllers.bug_report_controller import router as bug_report_router
+from controllers.cache_controller import router as cache_router
 from controllers.dbms_controller import router as dbms_router
 from controllers.discussion_controller import router as discussions_router
+from controllers.health_controller import router as health_router
 from controllers.public_auth_controller import router as public_auth_router
 from controllers.user_controller import router as user_router
 from domain.config import db_txn_manager_generator
@@ -26,6 +30,8 @@ app = FastAPI(
         configure_startup_info,
         configure_database,
         configure_openai,
+        configure_response_cache,
+        configure_thread_pool,
         # In production, workers are hosted separately
         post_config_hook=start_celery_workers if constants.IS_DEVELOPMENT else None,
     ),
@@ -55,3 +61,5 @@ app.include_router(user_router)
 app.include_router(dbms_router)
 app.include_router(bug_report_router)
 app.include_router(bug_category_router)
+app.include_router(cache_router)
+app.include_router(health_router)
@@ -0,0 +1,29 @@
+import argparse
+
+from domain.config import engine
+from domain.models.BugReport import merge_duplicate_bug_reports
+from domain.schema import create_schema
+from sqlmodel import Session
+from utilities.constants import constants
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Merge the bug reports stored more than once for the same "
+        "issue into the first one, moving their comments over, then create "
+        "the unique index that prevents duplicates. Deletes bug reports, so "
+        "back up the database first."
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=constants.BULK_WRITE_BATCH_SIZE
+    )
+    args = parser.parse_args()
+
+    with Session(engine, expire_on_commit=False) as tx:
+        merged = merge_duplicate_bug_reports(tx, args.batch_size)
+    create_schema(engine)
+    print(f"Merged {merged} duplicate bug reports. All done!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+
+from domain.config import engine
+from domain.models.BugReport import get_bug_report_vector_batch, update_bug_reports
+from sqlmodel import Session
+from utilities.constants import constants
+from utilities.vector_codec import decode_vector, encode_vector, is_legacy_vector
+
+
+def migrate_vectors(tx: Session, batch_size: int, dtype: str) -> int:
+    """
+    Rewrites pickled bug report vectors into the binary vector format,
+    walking the table in id order and committing once per batch.
+    Rows already in the binary format are left untouched. Rows that cannot
+    be decoded are reset to NULL, for the vectorizer to vectorize again.
+    """
+    migrated_count = 0
+    last_id = -1
+    while True:
+        rows = get_bug_report_vector_batch(tx, last_id, batch_size)
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        migrated = []
+        for id, vector in rows:
+            if not is_legacy_vector(vector):
+                continue
+            try:
+                vector = encode_vector(decode_vector(vector), dtype)
+            except Exception as e:
+                print(f"Resetting undecodable vector of bug report {id}: {e}")
+                vector = None
+            migrated.append({"id": id, "vector": vector})
+        failed = update_bug_reports(tx, migrated, batch_size)
+        for row in failed:
+            print(f"Failed to migrate vector for bug report {row['id']}")
+        migrated_count += len(migrated) - len(failed)
+        print(f"Migrated {len(migrated)} of {len(rows)} vectors up to id {last_id}")
+    return migrated_count
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Migrate pickled bug report vectors to the binary vector format"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=constants.BULK_WRITE_BATCH_SIZE
+    )
+    parser.add_argument(
+        "--dtype",
+        choices=["float32", "float16"],
+        default=constants.VECTOR_DTYPE,
+    )
+    args = parser.parse_args()
+
+    with Session(engine, expire_on_commit=False) as tx:
+        migrated_count = migrate_vectors(tx, args.batch_size, args.dtype)
+    print(f"Migrated {migrated_count} vectors. All done!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import argparse
+
+from configuration.logger import configure_logger
+from domain.config import engine
+from fastapi import FastAPI
+from services.bug_similarity_service import BugSimilarityService
+from sqlmodel import Session
+from utilities.constants import constants
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rebuild the stored lists of the most similar bug reports "
+        "of each bug report from the bug report vectors"
+    )
+    parser.add_argument("--top-k", type=int, default=constants.SIMILARITY_TOP_K)
+    parser.add_argument(
+        "--block-size",
+        type=int,
+        default=constants.SIMILARITY_BLOCK_SIZE,
+        help="Bug reports scored at a time; memory grows with it",
+    )
+    args = parser.parse_args()
+
+    # The services log through the application logger
+    app = FastAPI(title="Rebuild similar bug lists")
+    with configure_logger(app), Session(engine, expire_on_commit=False) as tx:
+        count = BugSimilarityService.rebuild_similarities(
+            tx, args.top_k, args.block_size
+        )
+    print(f"Rebuilt {count} similar bug lists. All done!")
+
+
+if __name__ == "__main__":
+    main()
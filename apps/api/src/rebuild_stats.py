@@ -0,0 +1,30 @@
+import argparse
+
+from domain.config import engine
+from domain.models.BugReport import rebuild_bug_daily_stats
+from sqlmodel import Session
+from utilities.constants import constants
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rebuild the daily bug statistics from the bug reports"
+    )
+    parser.add_argument(
+        "--dbms-id",
+        type=int,
+        default=None,
+        help="Only rebuild the statistics of this DBMS",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=constants.BULK_WRITE_BATCH_SIZE
+    )
+    args = parser.parse_args()
+
+    with Session(engine, expire_on_commit=False) as tx:
+        counted = rebuild_bug_daily_stats(tx, args.dbms_id, args.batch_size)
+    print(f"Counted {counted} bug reports. All done!")
+
+
+if __name__ == "__main__":
+    main()
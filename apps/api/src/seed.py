@@ -2,7 +2,8 @@ import os
 from textwrap import dedent
 
 from domain.config import engine
-from sqlmodel import Session, SQLModel, text
+from domain.schema import create_schema
+from sqlmodel import Session, text
 
 
 class Runner:
@@ -14,8 +15,8 @@ class Runner:
         self.create_table_if_missing()
 
     def create_table_if_missing(self):
-        print("Creating tables for entities")
-        SQLModel.metadata.create_all(engine)
+        print("Creating tables and indexes for entities")
+        create_schema(engine)
         print("Creating table for seeds")
         self.tx.exec(
             text(
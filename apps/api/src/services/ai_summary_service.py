@@ -0,0 +1,184 @@
+import hashlib
+
+from domain.enums import AiSummaryEntity
+from domain.models.AiSummary import (
+    get_ai_summary,
+    get_latest_ai_summary,
+    save_ai_summary,
+)
+from domain.models.BugReport import get_bug_report_by_id
+from domain.models.DBMSSystem import get_dbms_system_by_id
+from redis import Redis
+from services.dbms_service import DbmsService
+from sqlmodel import Session
+from utilities.classes import Service
+from utilities.llm import LlmClient
+from utilities.prompts import (
+    BUG_REPORT_AI_SUMMARY_PROMPT_VERSION,
+    DBMS_AI_SUMMARY_PROMPT_VERSION,
+    get_bug_report_ai_summary_prompt,
+    get_dbms_ai_summary_prompt,
+)
+from utilities.redis_client import get_redis_client
+
+# Proportion of the bug descriptions of a DBMS that its summary is based on
+DBMS_SUMMARY_SAMPLE_PERCENT = 0.005
+# Minimum number of bug descriptions that the summary of a DBMS is based on
+DBMS_SUMMARY_MIN_SAMPLE_SIZE = 10
+
+# Seconds for which further requests to summarise the same entity are
+# dropped, while the first one is queued or running
+_REQUEST_DEDUPE_SECONDS = 300
+
+_PROMPT_VERSIONS = {
+    AiSummaryEntity.Dbms: DBMS_AI_SUMMARY_PROMPT_VERSION,
+    AiSummaryEntity.BugReport: BUG_REPORT_AI_SUMMARY_PROMPT_VERSION,
+}
+
+
+def _hash_prompt(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode()).hexdigest()
+
+
+def _get_request_key(entity_type: AiSummaryEntity, entity_id: int) -> str:
+    return f"bug-track:ai-summary:requested:{entity_type.value}:{entity_id}"
+
+
+class _AiSummaryService(Service):
+    """
+    Serves stored AI summaries, and generates them in the background.
+
+    Pages never wait on the LLM: a summary that is missing or out of date is
+    queued for generation, and until it is ready, the previous summary is
+    served if there is one.
+    """
+
+    def _get_prompt(
+        self, tx: Session, entity_type: AiSummaryEntity, entity_id: int
+    ) -> str | None:
+        """
+        Builds the prompt of the summary of an entity from its current data,
+        or returns None if there is nothing to summarise.
+        """
+        if entity_type == AiSummaryEntity.BugReport:
+            bug_report = get_bug_report_by_id(tx, entity_id)
+            if bug_report is None or bug_report.description is None:
+                return None
+            return get_bug_report_ai_summary_prompt(
+                bug_report.dbms.name, bug_report.description
+            )
+
+        dbms = get_dbms_system_by_id(tx, entity_id)
+        if dbms is None:
+            return None
+        # Seeded with the DBMS so that the sample, and so the prompt, only
+        # changes when the bug reports of the DBMS do
+        descriptions = DbmsService.get_random_bug_descriptions_sample(
+            tx,
+            entity_id,
+            DBMS_SUMMARY_SAMPLE_PERCENT,
+            random_seed=entity_id,
+            min_sample_size=DBMS_SUMMARY_MIN_SAMPLE_SIZE,
+        )
+        if not descriptions:
+            return None
+        return get_dbms_ai_summary_prompt(dbms.name, descriptions)
+
+    def get_bug_report_summary(
+        self, tx: Session, bug_report_id: int, dbms_name: str, description: str
+    ) -> str | None:
+        """
+        Returns the summary of a bug report, or None if it has never been
+        summarised. Queues a new summary if the description changed since.
+        """
+        prompt = get_bug_report_ai_summary_prompt(dbms_name, description)
+        summary = get_ai_summary(
+            tx,
+            AiSummaryEntity.BugReport,
+            bug_report_id,
+            BUG_REPORT_AI_SUMMARY_PROMPT_VERSION,
+            _hash_prompt(prompt),
+        )
+        if summary is not None:
+            return summary.summary
+
+        self.request_summary(AiSummaryEntity.BugReport, bug_report_id)
+        stale = get_latest_ai_summary(
+            tx,
+            AiSummaryEntity.BugReport,
+            bug_report_id,
+            BUG_REPORT_AI_SUMMARY_PROMPT_VERSION,
+        )
+        return stale.summary if stale is not None else None
+
+    def get_dbms_summary(self, tx: Session, dbms_id: int) -> str | None:
+        """
+        Returns the latest summary of a DBMS, or None if it has never been
+        summarised, in which case one is queued.
+
+        Checking whether the summary is up to date would mean sampling the
+        bug reports of the DBMS on every request, so the fetcher queues a new
+        summary whenever it stores bug reports of the DBMS instead.
+        """
+        summary = get_latest_ai_summary(
+            tx, AiSummaryEntity.Dbms, dbms_id, DBMS_AI_SUMMARY_PROMPT_VERSION
+        )
+        if summary is None:
+            self.request_summary(AiSummaryEntity.Dbms, dbms_id)
+            return None
+        return summary.summary
+
+    def request_summary(
+        self,
+        entity_type: AiSummaryEntity,
+        entity_id: int,
+        client: Redis | None = None,
+    ):
+        """Queues the generation of a summary, unless one is already queued."""
+        from workers.ai_summary_task import generate_ai_summary_task
+
+        client = client or get_redis_client()
+        key = _get_request_key(entity_type, entity_id)
+        if client.set(key, 1, nx=True, ex=_REQUEST_DEDUPE_SECONDS):
+            generate_ai_summary_task.delay(entity_type.value, entity_id)
+
+    def clear_summary_request(
+        self,
+        entity_type: AiSummaryEntity,
+        entity_id: int,
+        client: Redis | None = None,
+    ):
+        """Lets the summary of an entity be requested again."""
+        client = client or get_redis_client()
+        client.delete(_get_request_key(entity_type, entity_id))
+
+    def generate_summary(
+        self,
+        tx: Session,
+        entity_type: AiSummaryEntity,
+        entity_id: int,
+        llm: LlmClient,
+    ) -> bool:
+        """
+        Generates and stores the summary of an entity, unless the stored one
+        is already based on its current data.
+
+        :return:
+            Whether the LLM was asked for a new summary.
+        """
+        prompt = self._get_prompt(tx, entity_type, entity_id)
+        if prompt is None:
+            return False
+        prompt_version = _PROMPT_VERSIONS[entity_type]
+        input_hash = _hash_prompt(prompt)
+        if get_ai_summary(tx, entity_type, entity_id, prompt_version, input_hash):
+            return False
+
+        summary = llm.complete(prompt)
+        save_ai_summary(tx, entity_type, entity_id, prompt_version, input_hash, summary)
+        return True
+
+
+AiSummaryService = _AiSummaryService()
+
+__all__ = ["AiSummaryService"]
@@ -1,10 +1,13 @@
 from domain.models.BugCategory import get_bug_categories
+from domain.views.dbms import BugCategoryResponseDto
 from sqlmodel import Session
 from utilities.classes import Service
+from utilities.response_cache import CacheNamespace, cached
 
 
 class _BugCategoryService(Service):
 
+    @cached([CacheNamespace.BugCategories], list[BugCategoryResponseDto])
     def get_bug_categories(self, tx: Session):
         self.logger.info("Fetching all bug categories")
         return get_bug_categories(tx)
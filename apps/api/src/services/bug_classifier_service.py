@@ -1,33 +1,44 @@
 import re
+import threading
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
 
 import joblib
 import markdown
 import numpy as np
-import spacy
 from bs4 import BeautifulSoup
 from domain.models.BugCategory import get_bug_category_id_by_name
 from domain.models.BugReport import (
-    get_unclassified_bugs,
-    save_bug_report,
+    BugReport,
+    classify_bug_reports,
+    get_unclassified_bugs_by_ids,
+    iter_unclassified_bug_batches,
 )
-from fuzzywuzzy import fuzz
-from sklearn.calibration import LabelEncoder
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
 from sqlmodel import Session
 from utilities.category_keywords import CATEGORY_KEYWORDS
 from utilities.classes import Service
+from utilities.constants import constants
+from utilities.keyword_matcher import KeywordMatcher
+from utilities.nlp_models import NlpComponent, get_nlp_model
+from utilities.response_cache import CacheNamespace, invalidate_responses
+
+if TYPE_CHECKING:
+    # The pickled models import scikit-learn themselves when they are loaded
+    from sklearn.calibration import LabelEncoder
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
 
 
 class _BugClassifierService(Service):
-    """Service for classifying bug reports."""
+    """
+    Service for classifying bug reports.
 
-    # Load spaCy model
-    NLP = spacy.load("en_core_web_lg")
+    The spaCy pipeline and the trained models are loaded on first use, so
+    that importing the service is cheap.
+    """
 
-    # Custom stopwords (keep useful words like 'error', 'failure', etc.)
-    CUSTOM_STOPWORDS = NLP.Defaults.stop_words - {
+    # Words to keep despite being stopwords, like 'error', 'failure', etc.
+    KEPT_STOPWORDS = {
         "error",
         "failure",
         "issue",
@@ -38,26 +49,55 @@ class _BugClassifierService(Service):
     FUZZY_WEIGHT = 0.4
     SPACY_WEIGHT = 0.4
     TOKEN_OVERLAP_WEIGHT = 0.2
+    KEYWORD_MATCH_THRESHOLD = 0.7
 
     # Load trained ML model
     MODEL_DIR = Path(__file__).parent.parent / "model"
 
     def __init__(self):
+        self._load_lock = threading.Lock()
+        self._loaded = False
+
+    def load(self):
+        """Loads the spaCy pipeline and the trained models, if not loaded yet."""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            self._load()
+            self._loaded = True
+
+    def _load(self):
         try:
+            self.nlp = get_nlp_model(NlpComponent.Classifier)
+            self.custom_stopwords = (
+                self.nlp.Defaults.stop_words - _BugClassifierService.KEPT_STOPWORDS
+            )
+
             with open(
                 _BugClassifierService.MODEL_DIR / "bug_classifier_model.pickle", "rb"
             ) as model_file:
-                self.model: LogisticRegression = joblib.load(model_file)
+                self.model: "LogisticRegression" = joblib.load(model_file)
 
             with open(
                 _BugClassifierService.MODEL_DIR / "label_encoder.pickle", "rb"
             ) as encoder_file:
-                self.label_encoder: LabelEncoder = joblib.load(encoder_file)
+                self.label_encoder: "LabelEncoder" = joblib.load(encoder_file)
 
             with open(
                 _BugClassifierService.MODEL_DIR / "tfidf_vectorizer.pickle", "rb"
             ) as vectorizer_file:
-                self.vectorizer: TfidfVectorizer = joblib.load(vectorizer_file)
+                self.vectorizer: "TfidfVectorizer" = joblib.load(vectorizer_file)
+
+            self.keyword_matcher = KeywordMatcher(
+                self.nlp,
+                CATEGORY_KEYWORDS,
+                fuzzy_weight=_BugClassifierService.FUZZY_WEIGHT,
+                spacy_weight=_BugClassifierService.SPACY_WEIGHT,
+                token_overlap_weight=_BugClassifierService.TOKEN_OVERLAP_WEIGHT,
+                threshold=_BugClassifierService.KEYWORD_MATCH_THRESHOLD,
+            )
 
             self.logger.info("Successfully loaded bug classifier models and resources")
         except (FileNotFoundError, Exception) as e:
@@ -83,81 +123,24 @@ class _BugClassifierService(Service):
         text = re.sub(r"\s+", " ", text).strip()
 
         # Process with SpaCy
-        doc = _BugClassifierService.NLP(text.lower())
+        doc = self.nlp(text.lower())
 
         # Remove Stopwords, Lemmatize
         return " ".join(
             [
                 token.lemma_
                 for token in doc
-                if token.is_alpha
-                and token.text not in _BugClassifierService.CUSTOM_STOPWORDS
+                if token.is_alpha and token.text not in self.custom_stopwords
             ]
         )
 
     def _get_category_by_keywords(self, issue_title: str) -> str | None:
         """Finds category using exact, fuzzy, and semantic similarity matching (title only)."""
-        issue_title = issue_title.lower()
-        issue_doc = _BugClassifierService.NLP(issue_title)
-
-        best_match = None
-        best_score = 0.0
-
-        for category, keywords in CATEGORY_KEYWORDS.items():
-            for keyword in keywords:
-                keyword_lower = keyword.lower()
-                keyword_doc = _BugClassifierService.NLP(keyword_lower)
-
-                # Exact Match (Highest Priority)
-                if keyword_lower in issue_title:
-                    return category
-
-                # Fuzzy Matching (Handles Typos & Variations)
-                fuzzy_score = (
-                    fuzz.partial_ratio(issue_title, keyword_lower) / 100
-                )  # Normalize 0-1
-
-                # Word Vector Similarity (SpaCy)
-                spacy_score = (
-                    issue_doc.similarity(keyword_doc)
-                    if issue_doc.has_vector and keyword_doc.has_vector
-                    else 0.0
-                )
-
-                # Common Token Overlap (Better Context Matching)
-                issue_tokens = set(
-                    token.text for token in issue_doc if not token.is_stop
-                )
-                keyword_tokens = set(
-                    token.text for token in keyword_doc if not token.is_stop
-                )
-                common_token_score = len(issue_tokens & keyword_tokens) / max(
-                    len(keyword_tokens), 1
-                )
-
-                # Dynamic Weighted Scoring
-                length_factor = min(
-                    len(issue_title) / 100, 1
-                )  # Normalize length impact
-                combined_score = (
-                    (_BugClassifierService.FUZZY_WEIGHT * fuzzy_score)
-                    + (_BugClassifierService.SPACY_WEIGHT * spacy_score)
-                    + (
-                        _BugClassifierService.TOKEN_OVERLAP_WEIGHT
-                        * common_token_score
-                        * length_factor
-                    )
-                )
-
-                # Update best match
-                if combined_score > best_score and combined_score > 0.7:
-                    best_score = combined_score
-                    best_match = category
-
-        return best_match
+        return self.keyword_matcher.match(issue_title)
 
     def _predict_bug_category(self, title: str, body: str) -> str:
         """Predicts the category using the saved model and vectorizer."""
+        self.load()
 
         # Try keyword-based classification first (only on title)
         keyword_category = self._get_category_by_keywords(title)
@@ -177,28 +160,62 @@ class _BugClassifierService(Service):
 
         return predicted_label if max_prob >= 0.7 else "Others"
 
+    def _save_classifications(
+        self, tx: Session, classifications: list[tuple[BugReport, int]]
+    ) -> int:
+        """Writes a batch of classifications, returning the number saved."""
+        failed = classify_bug_reports(tx, classifications)
+        for bug, _ in failed:
+            self.logger.error(f"Failed to save classification for bug ID {bug.id}")
+        return len(classifications) - len(failed)
+
     def classify_unclassified_bugs(self, tx: Session) -> int:
         """Classifies all unclassified bug reports in the database."""
-        unclassified_bugs = get_unclassified_bugs(tx)
-
+        batches = iter_unclassified_bug_batches(tx, constants.BULK_WRITE_BATCH_SIZE)
+        return self._classify_bugs(tx, batches)
+
+    def classify_bugs_by_ids(self, tx: Session, bug_ids: list[int]) -> int:
+        """
+        Classifies the given bug reports, skipping those that are already
+        classified.
+        """
+        return self._classify_bugs(tx, [get_unclassified_bugs_by_ids(tx, bug_ids)])
+
+    def _classify_bugs(self, tx: Session, batches: Iterable[list]) -> int:
+        """
+        Classifies and saves one batch at a time, committing after each so
+        that rows claimed by iter_unclassified_bug_batches are released.
+        """
         classified_count = 0
-        for bug in unclassified_bugs:
-            predicted_category_name = self._predict_bug_category(
-                bug.title, bug.description or ""
-            )
+        category_ids: dict[str, int | None] = {}
+        for batch in batches:
+            classifications: list[tuple[BugReport, int]] = []
+            for bug in batch:
+                predicted_category_name = self._predict_bug_category(
+                    bug.title, bug.description or ""
+                )
 
-            bug.category_id = get_bug_category_id_by_name(tx, predicted_category_name)
+                if predicted_category_name not in category_ids:
+                    category_ids[predicted_category_name] = get_bug_category_id_by_name(
+                        tx, predicted_category_name
+                    )
+                category_id = category_ids[predicted_category_name]
+                if category_id is None:
+                    self.logger.warning(
+                        f"Category {predicted_category_name} not found in database for bug ID {bug.id}"
+                    )
+                    continue
 
-            if bug.category_id:
-                save_bug_report(tx, bug)
-                classified_count += 1
+                classifications.append((bug, category_id))
                 self.logger.info(
                     f"Classified bug ID {bug.id} as {predicted_category_name}"
                 )
-            else:
-                self.logger.warning(
-                    f"Category {predicted_category_name} not found in database for bug ID {bug.id}"
-                )
+
+            if classifications:
+                classified_count += self._save_classifications(tx, classifications)
+            tx.commit()
+            if classifications:
+                invalidate_responses(CacheNamespace.BugReports)
         return classified_count
 
 
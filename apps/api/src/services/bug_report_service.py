@@ -1,23 +1,23 @@
 from datetime import datetime
 
-import pickle
-from scipy.spatial.distance import cosine
-
 from domain.views.dbms import BugReportResponseDto
 from domain.enums import PriorityLevel
 from domain.models.BugReport import (
+    BugReport,
     get_bug_report_by_id,
+    get_bug_report_by_ids,
     get_bug_reports,
+    get_precomputed_similar_bug_reports,
     update_bug_category,
     update_bug_priority,
     update_bug_versions_affected,
 )
-import openai
 from pydantic import BaseModel
+from services.bug_similarity_service import BugSimilarityService
 from sqlmodel import Session
 from utilities.classes import Service
-from utilities.prompts import get_bug_report_ai_summary_prompt
-from internal.errors import NotFoundError
+from utilities.constants import constants
+from utilities.response_cache import CacheNamespace, invalidate_responses
 
 
 class _BugReportService(Service):
@@ -30,8 +30,9 @@ class _BugReportService(Service):
         id: int
         dbms_id: int
         dbms: str
-        category_id: int
-        category: str
+        # None until the bug report is classified
+        category_id: int | None
+        category: str | None
         title: str
         description: str | None
         url: str | None = None
@@ -66,6 +67,7 @@ class _BugReportService(Service):
             f"Updating bug report with id {bug_report_id} to category {category_id}"
         )
         br = update_bug_category(tx, bug_report_id, category_id)
+        invalidate_responses(CacheNamespace.BugReports)
         return _BugReportService.BugReportViewModel(
             **br.model_dump(),
             dbms=br.dbms.name,
@@ -87,26 +89,6 @@ class _BugReportService(Service):
             category=br.category.name,
         )
 
-    def get_ai_summary(self, bug_report: BugReportViewModel) -> str:
-        try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": get_bug_report_ai_summary_prompt(
-                            bug_report.dbms, bug_report.description
-                        ),
-                    },
-                ],
-                max_tokens=200,
-                temperature=0.2,
-            )
-            summary = response["choices"][0]["message"]["content"].strip()
-            return summary
-        except Exception as e:
-            raise NotFoundError("AI Summary not found")
-
     def update_bug_versions_affected(
         self, tx: Session, bug_report_id: int, updated_versions: str
     ):
@@ -122,41 +104,49 @@ class _BugReportService(Service):
         )
 
     def get_similar_bug_reports(
-        self, tx: Session, bug_id: int, top_n=3
+        self, tx: Session, bug_id: int, top_n=3, dbms_id: int | None = None
     ) -> list[BugReportResponseDto]:
         self.logger.info(
             f"Fetching similar bug reports for bug report with id {bug_id}"
         )
 
-        target_report = get_bug_report_by_id(tx, bug_id)
-        if target_report is None:
-            self.logger.warning(f"Bug report with id {bug_id} not found")
-            return []
+        if dbms_id is None and top_n <= constants.SIMILARITY_TOP_K:
+            reports = get_precomputed_similar_bug_reports(tx, bug_id, top_n)
+            # Bug reports vectorized since the last rebuild may have no list
+            if reports:
+                return [self._to_similar_view_model(br) for br in reports]
 
-        all_reports = get_bug_reports(tx)
-        similar_reports = []
-        if not target_report.vector:
-            self.logger.warning(f"Bug report with id {bug_id} does not have a vector")
+        similar_ids = BugSimilarityService.get_similar_bug_ids(
+            tx, bug_id, top_n, dbms_id
+        )
+        if similar_ids is None:
+            if get_bug_report_by_id(tx, bug_id) is None:
+                self.logger.warning(f"Bug report with id {bug_id} not found")
+            else:
+                self.logger.warning(
+                    f"Bug report with id {bug_id} does not have a vector"
+                )
             return []
-        target_report_vector = pickle.loads(target_report.vector)
-        for report in all_reports:
-            if report.id == bug_id or report.vector is None:
-                continue
-            report_vector = pickle.loads(report.vector)
-            similarity = 1 - cosine(target_report_vector, report_vector)
-            similar_reports.append((report, similarity))
-
-        similar_reports.sort(key=lambda x: x[1], reverse=True)
+
+        reports = {
+            br.id: br for br in get_bug_report_by_ids(tx, [id for id, _ in similar_ids])
+        }
         return [
-            _BugReportService.BugReportViewModel(
-                **br.model_dump(),
-                dbms=br.dbms.name,
-                repository=br.dbms.repository,
-                category=br.category.name,
-            )
-            for br, _ in similar_reports[:top_n]
+            self._to_similar_view_model(br)
+            for br in (reports.get(id) for id, _ in similar_ids)
+            if br is not None
         ]
 
+    def _to_similar_view_model(self, br: BugReport) -> BugReportViewModel:
+        # Bug reports are vectorized, and so listed as similar, before the
+        # classifier may have run
+        return _BugReportService.BugReportViewModel(
+            **br.model_dump(),
+            dbms=br.dbms.name,
+            repository=br.dbms.repository,
+            category=br.category.name if br.category else None,
+        )
+
 
 BugReportService = _BugReportService()
 
@@ -0,0 +1,353 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from domain.models.BugReport import get_bug_report_vectors
+from domain.models.BugSimilarity import (
+    SimilarityList,
+    delete_all_bug_similarities,
+    get_bug_ids_listing_neighbors,
+    get_bug_similarity_lists,
+    get_min_full_list_score,
+    lock_bug_similarities,
+    replace_bug_similarity_lists,
+)
+from sqlmodel import Session
+from utilities.classes import Service
+from utilities.constants import constants
+from utilities.ivf_index import IvfIndex, get_current_version
+from utilities.vector_codec import decode_vector
+from utilities.vector_index import VectorIndex, top_k
+
+
+class _BugSimilarityService(Service):
+    """
+    Maintains a process-wide similarity index over bug report vectors.
+
+    The index is loaded from the database on first use. Afterwards, vectors
+    written in this process are added directly, while vectors written by
+    other processes (e.g. the Celery vectorizer) are picked up by a periodic
+    incremental refresh keyed on `updated_at`.
+
+    With the "ivf" backend, similar bugs are searched in an approximate
+    index memory-mapped from disk instead, together with an exact index of
+    only the vectors written since the approximate index was built.
+    """
+
+    def __init__(self):
+        self._index = VectorIndex()
+        self._refresh_lock = threading.Lock()
+        self._loaded = False
+        self._watermark: datetime | None = None
+        self._last_refresh = 0.0
+
+        self._ann_index: IvfIndex | None = None
+        self._ann_version: str | None = None
+        # Vectors written since the approximate index was built
+        self._ann_delta = VectorIndex()
+        self._ann_watermark: datetime | None = None
+        self._ann_lock = threading.Lock()
+        self._ann_last_refresh = 0.0
+
+    def _load_rows(
+        self, index: VectorIndex, rows, watermark: datetime | None
+    ) -> tuple[int, datetime | None]:
+        """
+        Upserts (id, dbms_id, vector, updated_at) rows into `index`.
+
+        :return:
+            The number of rows, and the latest of `watermark` and their
+            `updated_at`.
+        """
+        ids, dbms_ids, vectors = [], [], []
+        for id, dbms_id, vector, updated_at in rows:
+            ids.append(id)
+            dbms_ids.append(dbms_id)
+            vectors.append(decode_vector(vector))
+            if watermark is None or updated_at > watermark:
+                watermark = updated_at
+        if ids:
+            index.upsert(ids, dbms_ids, np.stack(vectors))
+        return len(ids), watermark
+
+    def _get_vectors_since(self, tx: Session, watermark: datetime | None):
+        """
+        Reads the vectors updated since `watermark`, with an overlap of one
+        refresh interval. `updated_at` is set when the writing transaction
+        starts, so one that commits after a refresh can still write rows
+        older than the watermark. Rows read twice are simply upserted again.
+        """
+        if watermark is not None:
+            overlap = timedelta(seconds=constants.SIMILARITY_INDEX_REFRESH_SECONDS)
+            watermark -= overlap
+        return get_bug_report_vectors(tx, watermark)
+
+    def _is_fresh(self) -> bool:
+        elapsed = time.monotonic() - self._last_refresh
+        return self._loaded and elapsed < constants.SIMILARITY_INDEX_REFRESH_SECONDS
+
+    def refresh(self, tx: Session, force: bool = False):
+        """
+        Loads the index if needed, and pulls in vectors written since the
+        last refresh once the refresh interval has elapsed.
+        """
+        if not force and self._is_fresh():
+            return
+        with self._refresh_lock:
+            if not force and self._is_fresh():
+                return
+            if not self._loaded:
+                self.logger.info("Loading bug similarity index")
+                count, self._watermark = self._load_rows(
+                    self._index, get_bug_report_vectors(tx), self._watermark
+                )
+                self._loaded = True
+                self.logger.info(f"Loaded {count} vectors into similarity index")
+            else:
+                count, self._watermark = self._load_rows(
+                    self._index,
+                    self._get_vectors_since(tx, self._watermark),
+                    self._watermark,
+                )
+                self.logger.debug(f"Refreshed {count} vectors in similarity index")
+            self._last_refresh = time.monotonic()
+
+    def add_vectors(self, ids: list[int], dbms_ids: list[int], vectors: np.ndarray):
+        """
+        Adds freshly computed vectors to the index. This is a no-op until the
+        index has been loaded, as the initial load will include them anyway.
+        """
+        if self._ann_index is not None:
+            self._ann_delta.upsert(ids, dbms_ids, vectors)
+        if not self._loaded:
+            return
+        self._index.upsert(ids, dbms_ids, vectors)
+
+    def _is_ann_fresh(self) -> bool:
+        elapsed = time.monotonic() - self._ann_last_refresh
+        return (
+            self._ann_index is not None
+            and elapsed < constants.SIMILARITY_INDEX_REFRESH_SECONDS
+        )
+
+    def refresh_ann(self, tx: Session) -> bool:
+        """
+        Switches to the latest approximate index saved to disk, and pulls
+        the vectors written since it was built into the delta index, once
+        the refresh interval has elapsed.
+
+        :return:
+            False if no approximate index has been built yet.
+        """
+        if self._is_ann_fresh():
+            return True
+        with self._ann_lock:
+            if self._is_ann_fresh():
+                return True
+            directory = constants.SIMILARITY_ANN_DIR
+            version = get_current_version(directory)
+            if version is None:
+                return False
+            if version != self._ann_version:
+                self.logger.info(f"Loading approximate similarity index {version}")
+                self._ann_index = IvfIndex.load(directory, version)
+                self._ann_version = version
+                self._ann_delta = VectorIndex()
+                self._ann_watermark = self._ann_index.built_at
+            count, self._ann_watermark = self._load_rows(
+                self._ann_delta,
+                self._get_vectors_since(tx, self._ann_watermark),
+                self._ann_watermark,
+            )
+            self.logger.debug(f"Refreshed {count} vectors in delta index")
+            self._ann_last_refresh = time.monotonic()
+            return True
+
+    def _search_ann(
+        self, bug_id: int, top_n: int, dbms_id: int | None, n_probe: int
+    ) -> list[tuple[int, float]] | None:
+        ann_index, delta = self._ann_index, self._ann_delta
+        query = delta.get_vector(bug_id)
+        if query is None:
+            query = ann_index.get_vector(bug_id)
+        if query is None:
+            return None
+        # Vectors rewritten since the build are stale in the approximate index
+        exclude_ids = np.append(delta.get_ids(), bug_id)
+        results = ann_index.search_vector(
+            query, top_n, n_probe, dbms_id, exclude_ids
+        ) + delta.search_vector(query, top_n, dbms_id, exclude_id=bug_id)
+        return sorted(results, key=lambda pair: pair[1], reverse=True)[:top_n]
+
+    def build_ann_index(
+        self,
+        tx: Session,
+        directory: str,
+        n_lists: int | None = None,
+        iterations: int = 10,
+    ) -> IvfIndex:
+        """
+        Builds an approximate index of all bug report vectors, and saves it
+        as the current version in `directory` for every process to load on
+        its next refresh.
+        """
+        rows = get_bug_report_vectors(tx)
+        if not rows:
+            raise ValueError("No bug report has a vector yet")
+        ann_index = IvfIndex.build(
+            [id for id, _, _, _ in rows],
+            [dbms_id for _, dbms_id, _, _ in rows],
+            np.stack([decode_vector(vector) for _, _, vector, _ in rows]),
+            n_lists,
+            iterations,
+            built_at=max(updated_at for *_, updated_at in rows),
+        )
+        ann_index.save(directory)
+        return ann_index
+
+    def get_similar_bug_ids(
+        self, tx: Session, bug_id: int, top_n: int, dbms_id: int | None = None
+    ) -> list[tuple[int, float]] | None:
+        """
+        Returns the ids and similarity scores of the `top_n` bug reports most
+        similar to `bug_id`, or None if `bug_id` has no vector.
+        """
+        if constants.SIMILARITY_INDEX_BACKEND == "ivf" and self.refresh_ann(tx):
+            return self._search_ann(
+                bug_id, top_n, dbms_id, constants.SIMILARITY_ANN_N_PROBE
+            )
+        self.refresh(tx)
+        if bug_id not in self._index:
+            return None
+        return self._index.search(bug_id, top_n, dbms_id)
+
+    def update_similarities(
+        self,
+        tx: Session,
+        bug_ids: list[int],
+        k: int | None = None,
+        block_size: int | None = None,
+    ) -> int:
+        """
+        Updates the stored similar bug lists after the vectors of `bug_ids`
+        were written. Their own lists, and the lists that contained them
+        before, are searched in full. Every other list is only rewritten if
+        one of `bug_ids` now scores above its last entry. Holds the lock on
+        the lists until the transaction ends. Does not commit.
+
+        :return:
+            The number of lists written.
+        """
+        k = k or constants.SIMILARITY_TOP_K
+        block_size = block_size or constants.SIMILARITY_BLOCK_SIZE
+        lock_bug_similarities(tx)
+        # The vectors may have been written by another process moments ago
+        self.refresh(tx, force=True)
+        new_ids = [id for id in bug_ids if id in self._index]
+        if not new_ids:
+            return 0
+
+        # Read before the lists below are written, so that it only covers
+        # the lists that are merged into
+        min_score = get_min_full_list_score(tx, k)
+        stale_ids = get_bug_ids_listing_neighbors(tx, new_ids) - set(new_ids)
+        lists: dict[int, SimilarityList] = {
+            id: self._index.search(id, k) for id in [*new_ids, *stale_ids]
+        }
+        if min_score is not None:
+            for row_ids, query_ids, scores in self._index.iter_score_blocks(
+                new_ids, block_size
+            ):
+                lists.update(
+                    self._merge_entrants(
+                        tx, row_ids, query_ids, scores, min_score, lists, k
+                    )
+                )
+
+        replace_bug_similarity_lists(tx, lists)
+        return len(lists)
+
+    def _merge_entrants(
+        self,
+        tx: Session,
+        row_ids: np.ndarray,
+        query_ids: np.ndarray,
+        scores: np.ndarray,
+        min_score: float,
+        skip: dict[int, SimilarityList],
+        k: int,
+    ) -> dict[int, SimilarityList]:
+        """
+        Merges the query bug reports into the stored lists of the bug
+        reports of a block that they enter.
+        """
+        rows = [
+            row
+            for row in np.nonzero(scores.max(axis=1, initial=-np.inf) > min_score)[0]
+            if int(row_ids[row]) not in skip
+        ]
+        if not rows:
+            return {}
+        stored = get_bug_similarity_lists(tx, (int(row_ids[row]) for row in rows))
+        query_id_set = {int(id) for id in query_ids}
+        merged: dict[int, SimilarityList] = {}
+        for row in rows:
+            neighbors = stored.get(int(row_ids[row]))
+            if neighbors is None:
+                # No list is stored yet, a rebuild fills it in
+                continue
+            threshold = neighbors[k - 1][1] if len(neighbors) >= k else -np.inf
+            entrants = [
+                (int(id), float(score))
+                for id, score in zip(query_ids, scores[row])
+                if score > threshold
+            ]
+            if not entrants:
+                continue
+            kept = [pair for pair in neighbors if pair[0] not in query_id_set]
+            merged[int(row_ids[row])] = sorted(
+                kept + entrants, key=lambda pair: pair[1], reverse=True
+            )[:k]
+        return merged
+
+    def rebuild_similarities(
+        self, tx: Session, k: int | None = None, block_size: int | None = None
+    ) -> int:
+        """
+        Recomputes the stored similar bug lists of all bug reports from
+        scratch, one block of bug reports at a time, committing after each.
+
+        :return:
+            The number of lists written.
+        """
+        k = k or constants.SIMILARITY_TOP_K
+        block_size = block_size or constants.SIMILARITY_BLOCK_SIZE
+        self.refresh(tx, force=True)
+        lock_bug_similarities(tx)
+        delete_all_bug_similarities(tx)
+        tx.commit()
+
+        count = 0
+        for row_ids, query_ids, scores in self._index.iter_score_blocks(
+            None, block_size
+        ):
+            columns, top_scores = top_k(scores, k)
+            lists = {
+                int(id): [
+                    (int(query_ids[column]), float(score))
+                    for column, score in zip(row_columns, row_scores)
+                    if np.isfinite(score)
+                ]
+                for id, row_columns, row_scores in zip(row_ids, columns, top_scores)
+            }
+            lock_bug_similarities(tx)
+            replace_bug_similarity_lists(tx, lists)
+            tx.commit()
+            count += len(lists)
+        return count
+
+
+BugSimilarityService = _BugSimilarityService()
+
+__all__ = ["BugSimilarityService"]
@@ -1,57 +1,139 @@
+import time
+from typing import Iterable
+
 import numpy as np
-import spacy
-import pickle
 from domain.models.BugReport import (
-    save_bug_report,
-    get_unvectorized_bugs,
+    get_unvectorized_bugs_by_ids,
+    iter_unvectorized_bug_batches,
+    update_bug_reports,
 )
+from services.bug_similarity_service import BugSimilarityService
 from sqlmodel import Session
 from utilities.classes import Service
+from utilities.constants import constants
+from utilities.nlp_models import NlpComponent, get_nlp_model
+from utilities.vector_codec import encode_vector
 
 
 class _BugVectorizerService(Service):
     """Service for vectorizing bug reports."""
 
-    # Load spaCy model
-    NLP = spacy.load("en_core_web_lg")
+    def _get_vector(self, doc) -> np.ndarray | None:
+        """Averages the vectors of all tokens in the document that have one."""
+        token_vectors = [token.vector for token in doc if token.has_vector]
+        if not token_vectors:
+            return None
+        return np.mean(token_vectors, axis=0)
 
-    def vectorize_no_vector_bug_reports(self, tx: Session) -> int:
-        """Vectorizes reports that have no vector representation."""
-        unvectorized_bugs = get_unvectorized_bugs(tx)
-        self.logger.info(
-            f"Vectorizing {len(unvectorized_bugs)} bug reports with no vector representation"
+    def _write_batch(
+        self, tx: Session, batch: list[tuple[int, int, np.ndarray]]
+    ) -> list[tuple[int, int, np.ndarray]]:
+        """
+        Writes a batch of (id, dbms_id, vector) back in bulk, without
+        committing.
+
+        :return:
+            The (id, dbms_id, vector) rows written.
+        """
+        failed = update_bug_reports(
+            tx,
+            [
+                {"id": id, "vector": encode_vector(vector, constants.VECTOR_DTYPE)}
+                for id, _, vector in batch
+            ],
         )
+        for row in failed:
+            self.logger.error(f"Failed to save vector for bug ID {row['id']}")
+        failed_ids = {row["id"] for row in failed}
+        return [row for row in batch if row[0] not in failed_ids]
+
+    def _publish_vectors(self, written: list[tuple[int, int, np.ndarray]]):
+        """
+        Adds committed vectors to the similarity index, and queues the update
+        of the similar bug lists. Both must only see committed vectors, or the
+        task finds none of them and the lists are never updated.
+        """
+        from workers.bug_similarity_task import update_bug_similarities_task
+
+        ids, dbms_ids, vectors = zip(*written)
+        BugSimilarityService.add_vectors(list(ids), list(dbms_ids), np.stack(vectors))
+        # Queued rather than run here, so that the lists are retried on their
+        # own if updating them fails
+        update_bug_similarities_task.delay(list(ids))
+
+    def vectorize_no_vector_bug_reports(self, tx: Session) -> int:
+        """Vectorizes all reports that have no vector representation."""
+        self.logger.info("Vectorizing bug reports with no vector representation")
+        batches = iter_unvectorized_bug_batches(tx, constants.VECTORIZER_BATCH_SIZE)
+        return self._vectorize_bugs(tx, batches)
 
+    def vectorize_bugs_by_ids(self, tx: Session, bug_ids: list[int]) -> int:
+        """
+        Vectorizes the given bug reports, skipping those that already have a
+        vector.
+        """
+        return self._vectorize_bugs(tx, [get_unvectorized_bugs_by_ids(tx, bug_ids)])
+
+    def _vectorize_bugs(self, tx: Session, batches: Iterable[list]) -> int:
+        """
+        Vectorizes and saves one batch at a time, committing after each so
+        that rows claimed by iter_unvectorized_bug_batches are released.
+        """
+        batch_size = constants.VECTORIZER_BATCH_SIZE
+        nlp = get_nlp_model(NlpComponent.Vectorizer)
+        # Token vectors come from the static vector table, so none of the
+        # pipeline components (tagger, parser, lemmatizer, NER...) are needed
+        disabled_pipes = nlp.pipe_names
         vectorized_count = 0
-        for bug in unvectorized_bugs:
-            try:
-                doc = _BugVectorizerService.NLP(
-                    bug.title + " " + (bug.description or "")
-                )
-                vector = np.mean(
-                    [token.vector for token in doc if token.has_vector], axis=0
-                )
-
-                if vector is None or vector.shape[0] == 0:
+        for bugs in batches:
+            batch_started = time.perf_counter()
+            docs = nlp.pipe(
+                (
+                    (bug.title + " " + (bug.description or ""), (bug.id, bug.dbms_id))
+                    for bug in bugs
+                ),
+                as_tuples=True,
+                batch_size=batch_size,
+                n_process=constants.VECTORIZER_N_PROCESS,
+                disable=disabled_pipes,
+            )
+
+            batch: list[tuple[int, int, np.ndarray]] = []
+            for doc, (bug_id, dbms_id) in docs:
+                vector = self._get_vector(doc)
+                if vector is None:
                     self.logger.warning(
-                        f"Could not generate vector for bug ID {bug.id}"
+                        f"Could not generate vector for bug ID {bug_id}"
                     )
-                    continue
-
-                vector_binary = pickle.dumps(vector)
-                bug.vector = vector_binary
-                save_bug_report(tx, bug)
-                vectorized_count += 1
-
-                self.logger.info(f"Vectorized bug ID {bug.id}")
-            except Exception as e:
-                self.logger.error(f"Failed to vectorize bug ID {bug.id}: {e}")
+                else:
+                    batch.append((bug_id, dbms_id, vector))
+            written = self._flush_batch(tx, batch, batch_started) if batch else []
+            # Release the claim on bugs that could not be vectorized too
+            tx.commit()
+            if written:
+                self._publish_vectors(written)
+            vectorized_count += len(written)
 
         self.logger.info(
             f"Completed vectorization. Total vectorized: {vectorized_count}"
         )
         return vectorized_count
 
+    def _flush_batch(
+        self,
+        tx: Session,
+        batch: list[tuple[int, int, np.ndarray]],
+        started: float,
+    ) -> list[tuple[int, int, np.ndarray]]:
+        written = self._write_batch(tx, batch)
+        written_count = len(written)
+        elapsed = time.perf_counter() - started
+        self.logger.info(
+            f"Vectorized {written_count} bug reports in {elapsed:.2f}s "
+            f"({written_count / max(elapsed, 1e-9):.1f} reports/s)"
+        )
+        return written
+
 
 BugVectorizerService = _BugVectorizerService()
 
@@ -1,32 +1,71 @@
 import random
 
+from domain.helpers.trend import get_trend_today
 from domain.models.BugCategory import get_bug_category_by_ids
+from domain.models.BugDailyStats import (
+    get_bug_category_counts_on_day,
+    get_bug_count_on_day,
+    get_bug_trend_by_category_from_daily_stats,
+    get_bug_trend_from_daily_stats,
+)
 from domain.models.BugReport import (
+    BugReport,
     get_bug_categories_by_dbms_id,
-    get_bug_ids_by_dbms_cat_id,
+    get_bug_category_counts_by_dbms_id,
     get_bug_report_by_ids,
     get_bug_report_by_search_and_cat,
     get_bug_report_ids_by_dbms_id,
-    get_bug_trend_last_k_days,
-    get_new_bug_report_categories,
 )
 from domain.models.DBMSSystem import *
+from domain.enums import SearchMode, TrendGranularity
+from domain.helpers.cursor import SearchCursor, decode_cursor, encode_cursor
+from domain.views.dbms import (
+    BugCategoryResponseDto,
+    BugCategoryTrendResponseDto,
+    DbmsListResponseDto,
+    DbmsResponseDto,
+)
+from internal.errors.client_errors import BadRequestError
+from pydantic import BaseModel
 from sqlmodel import Session
 from utilities.classes import Service
+from utilities.response_cache import CacheNamespace, cached
 
 
 class _DbmsService(Service):
+    @cached([CacheNamespace.DbmsSystems], list[DbmsListResponseDto])
     def get_dbms(self, tx: Session):
         return get_dbms_systems(tx)
 
     def get_dbms_by_id(self, tx: Session, dbms_id: int):
         return get_dbms_system_by_id(tx, dbms_id)
 
-    def get_dbms_bug_categories(self, tx: Session, dbms_id: int):
-        category_ids = get_bug_categories_by_dbms_id(tx, dbms_id)
-        print(f"Found categories: {category_ids} for dbms_id: {dbms_id}")
-        bug_categories = get_bug_category_by_ids(tx, category_ids)
-        return bug_categories
+    @cached(
+        [
+            CacheNamespace.DbmsSystems,
+            CacheNamespace.BugCategories,
+            CacheNamespace.BugReports,
+        ],
+        DbmsResponseDto | None,
+    )
+    def get_dbms_overview(self, tx: Session, dbms_id: int) -> DbmsResponseDto | None:
+        """
+        Get a DBMS together with its bug count per category, using a single
+        aggregate query for the counts.
+        """
+        dbms = get_dbms_system_by_id(tx, dbms_id)
+        if dbms is None:
+            return None
+        bug_categories = [
+            BugCategoryResponseDto(id=id, name=name, count=count)
+            for id, name, count in get_bug_category_counts_by_dbms_id(tx, dbms_id)
+        ]
+        return DbmsResponseDto(
+            id=dbms.id,
+            name=dbms.name,
+            bug_count=sum(c.count for c in bug_categories),
+            bug_categories=bug_categories,
+        )
 
     def get_random_bug_descriptions_sample(
         self,
@@ -34,6 +73,7 @@ class _DbmsService(Service):
         dbms_id: int,
         sample_percent: float,
         random_seed: int | None = None,
+        min_sample_size: int = 0,
     ) -> list[str]:
         """
         Sample a random set of bug descriptions.
@@ -43,60 +83,145 @@ class _DbmsService(Service):
 
         :param sample_percent:
             Proportion (number between 0-1) of bug descriptions to sample.
+
+        :param min_sample_size:
+            Minimum number of bug descriptions to sample, if there are as many.
         """
         bug_reports = get_bug_report_ids_by_dbms_id(tx, dbms_id)
         print(f"Found bug reports: {bug_reports} for dbms_id: {dbms_id}")
-        if random_seed is not None:
-            random.seed(random_seed)
-        sample_ids = random.sample(bug_reports, int(len(bug_reports) * sample_percent))
-        reports = get_bug_report_by_ids(tx, sample_ids)
-        return [r.description or "" for r in reports]
+        # A local generator, so that seeding it leaves the global one alone
+        rng = random.Random(random_seed)
+        sample_size = max(
+            int(len(bug_reports) * sample_percent),
+            min(min_sample_size, len(bug_reports)),
+        )
+        sample_ids = rng.sample(bug_reports, sample_size)
+        # Keep the sample order, so that the same seed gives the same prompt
+        reports = {r.id: r for r in get_bug_report_by_ids(tx, sample_ids)}
+        return [reports[id].description or "" for id in sample_ids if id in reports]
+
+    class BugSearchPage(BaseModel):
+        bug_reports: list[BugReport]
+        # Cursor to the next page, or None if this is the last page
+        next_cursor: str | None = None
+        # Cursor to the next page of each category, when searching across
+        # all categories
+        category_cursors: dict[int, str | None] = {}
+
+    def _search_page(
+        self,
+        tx: Session,
+        dbms_id: int,
+        search: str | None,
+        categories: list[int],
+        cursor: str | None,
+        limit: int,
+        per_category: bool,
+        mode: SearchMode,
+    ) -> list[tuple[BugReport, float | None]]:
+        """
+        Fetches one more row than requested (per category, if applicable),
+        so that callers can tell whether there is a next page.
+        """
+        try:
+            after = decode_cursor(cursor) if cursor is not None else None
+            return get_bug_report_by_search_and_cat(
+                tx, dbms_id, search, categories, limit + 1, after, per_category, mode
+            )
+        except ValueError as e:
+            raise BadRequestError(str(e))
 
     def bug_search(
         self,
         tx: Session,
         dbms_id: int,
         search: str | None,
-        start: int = 0,
+        cursor: str | None = None,
         limit: int = 100,
         categories: list[int] = [],
-    ):
+        mode: SearchMode = SearchMode.Substring,
+    ) -> BugSearchPage:
         """
         :param tx:
             The ORM session.
         :param dbms_id:
             The ID of the DBMS to query from.
         :param search:
-            The search string for which our bug report titles should contain.
-        :param start:
-            0-based starting index to offset our queries from.
+            The search string for which our bug reports should match.
+        :param cursor:
+            Cursor returned with the previous page, or None for the first page.
         :param limit:
             Maximum number of bug reports to fetch.
         :param categories:
             A list of categories from which our bug reports should come from.
-            If empty, query from all categories.
+            If empty, query the first page of every category, with the limit
+            split evenly between them.
+        :param mode:
+            How bug reports are matched against the search string. Matches
+            are ranked by relevance in the full-text and trigram modes.
         """
+        if categories:
+            rows = self._search_page(
+                tx, dbms_id, search, categories, cursor, limit, False, mode
+            )
+            return self._to_page(rows, limit)
 
-        per_category_limit = None
-        if not categories:
-            self.logger.info(
-                f"No categories provided; querying all categories for dbms_id: {dbms_id}"
+        if cursor is not None:
+            raise BadRequestError(
+                "Searches across all categories are paged per category."
             )
-            categories = get_bug_categories_by_dbms_id(tx, dbms_id)
-            self.logger.info(f"Found categories: {categories} for dbms_id: {dbms_id}")
-            per_category_limit = max(limit // max(len(categories), 1), 1)
-            self.logger.info(
-                f"Setting per_category_limit to {per_category_limit} for dbms_id: {dbms_id}"
+        self.logger.info(
+            f"No categories provided; querying all categories for dbms_id: {dbms_id}"
+        )
+        categories = get_bug_categories_by_dbms_id(tx, dbms_id)
+        self.logger.info(f"Found categories: {categories} for dbms_id: {dbms_id}")
+        per_category_limit = max(limit // max(len(categories), 1), 1)
+        self.logger.info(
+            f"Setting per_category_limit to {per_category_limit} for dbms_id: {dbms_id}"
+        )
+        rows = self._search_page(
+            tx, dbms_id, search, categories, None, per_category_limit, True, mode
+        )
+        rows_by_category: dict[int, list[tuple[BugReport, float | None]]] = {}
+        for row in rows:
+            rows_by_category.setdefault(row[0].category_id, []).append(row)
+
+        bug_reports = []
+        category_cursors = {}
+        for category_id, category_rows in rows_by_category.items():
+            page = self._to_page(category_rows, per_category_limit)
+            bug_reports.extend(page.bug_reports)
+            category_cursors[category_id] = page.next_cursor
+        return _DbmsService.BugSearchPage(
+            bug_reports=bug_reports, category_cursors=category_cursors
+        )
+
+    def _to_page(
+        self, rows: list[tuple[BugReport, float | None]], limit: int
+    ) -> BugSearchPage:
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_report, last_rank = rows[-1]
+            next_cursor = encode_cursor(
+                SearchCursor(
+                    created_at=last_report.created_at,
+                    id=last_report.id,
+                    rank=last_rank,
+                )
             )
-            limit = None
-        reports = get_bug_report_by_search_and_cat(
-            tx, dbms_id, search, categories, start, limit, per_category_limit
+        return _DbmsService.BugSearchPage(
+            bug_reports=[report for report, _ in rows], next_cursor=next_cursor
         )
-        return reports
 
     def bug_search_category(
-        self, tx: Session, dbms_id: int, category: int, start: int, amount: int = 5
-    ):
+        self,
+        tx: Session,
+        dbms_id: int,
+        category: int,
+        cursor: str | None,
+        amount: int = 5,
+    ) -> BugSearchPage:
         """
         :param tx:
             The ORM session.
@@ -104,48 +229,80 @@ class _DbmsService(Service):
             The ID of the DBMS to query from.
         :param category:
             0-based index of the category as per DB.
-        :param start:
-            0-based starting index to offset our queries from.
+        :param cursor:
+            Cursor of the category returned by the previous page, or None to
+            start from the newest bug report.
         :param amount:
             Number of bug reports to fetch.
         """
-        reports = get_bug_report_by_search_and_cat(
-            tx, dbms_id, "", [category], start, amount
+        rows = self._search_page(
+            tx, dbms_id, "", [category], cursor, amount, False, SearchMode.Substring
         )
+        return self._to_page(rows, amount)
 
-        return reports
-
-    def get_bug_count_category(self, tx: Session, dbms_id: int, category_id: int):
-        """
-        Get the number of bug reports for a given DBMS.
-        """
-        reports = get_bug_ids_by_dbms_cat_id(tx, dbms_id, category_id)
-        return len(reports)
-
-    def get_bug_trend_last_k_days(
-        self, tx: Session, dbms_id: int, days: int
+    @cached([CacheNamespace.BugReports], list[int], key_extra=get_trend_today)
+    def get_bug_trend(
+        self,
+        tx: Session,
+        dbms_id: int,
+        periods: int,
+        granularity: TrendGranularity = TrendGranularity.Day,
     ) -> list[int]:
         """
-        Get the number of bug reports for a given DBMS and category in the last k days.
+        Get the total number of bug reports for a given DBMS at the end of each
+        of the last `periods` buckets, with buckets of the given granularity.
         """
-        trend = get_bug_trend_last_k_days(tx, dbms_id, days)
+        trend = get_bug_trend_from_daily_stats(
+            tx, dbms_id, periods, get_trend_today(), granularity
+        )
 
         return trend
 
+    @cached(
+        [CacheNamespace.BugCategories, CacheNamespace.BugReports],
+        list[BugCategoryTrendResponseDto],
+        key_extra=get_trend_today,
+    )
+    def get_bug_trend_by_category(
+        self,
+        tx: Session,
+        dbms_id: int,
+        periods: int,
+        granularity: TrendGranularity = TrendGranularity.Day,
+    ) -> list[BugCategoryTrendResponseDto]:
+        """
+        Get the bug trend of a given DBMS for each of its bug categories.
+        Unclassified bug reports are left out.
+        """
+        trends = get_bug_trend_by_category_from_daily_stats(
+            tx, dbms_id, periods, get_trend_today(), granularity
+        )
+        category_ids = [id for id in trends if id is not None]
+        categories = get_bug_category_by_ids(tx, category_ids)
+        return [
+            BugCategoryTrendResponseDto(
+                id=category.id, name=category.name, trend=trends[category.id]
+            )
+            for category in sorted(categories, key=lambda c: c.id)
+        ]
+
+    @cached([CacheNamespace.BugReports], int, key_extra=get_trend_today)
     def get_num_reports_today(self, tx: Session, dbms_id: int) -> int:
         """
         Get the number of new bug reports for a given DBMS today.
         """
-        trend = get_bug_trend_last_k_days(tx, dbms_id, 2)
-        if len(trend) == 2:
-            return trend[1] - trend[0]
-        return 0
+        return get_bug_count_on_day(tx, dbms_id, get_trend_today())
 
+    @cached(
+        [CacheNamespace.BugCategories, CacheNamespace.BugReports],
+        list[BugCategoryResponseDto],
+        key_extra=get_trend_today,
+    )
     def get_new_bug_report_categories_today(self, tx, dbms_id: int):
         """
         Fetches the categories of new bug reports for a given DBMS today.
         """
-        categories = get_new_bug_report_categories(tx, dbms_id)
+        categories = get_bug_category_counts_on_day(tx, dbms_id, get_trend_today())
         return categories
 
 
@@ -14,6 +14,79 @@ class _Constants(BaseSettings, frozen=True):
     REDIS_BROKER_URL: RedisDsn
     CELERY_BEAT_SCHEDULE: str
     FRONTEND_ALLOWED_ORIGINS: set[str] = set()
+    # Seconds between checks for vectors written by other processes
+    SIMILARITY_INDEX_REFRESH_SECONDS: int = 60
+    # Length of the stored list of most similar bug reports of each report;
+    # requests for more similar bugs than this search the index instead
+    SIMILARITY_TOP_K: int = 10
+    # Bug reports scored per block when building the similar bug lists; each
+    # block holds a (block size, bug reports scored against) float32 matrix
+    SIMILARITY_BLOCK_SIZE: int = 64
+    # "exact" searches every vector in memory, "ivf" searches the approximate
+    # index built by build_similarity_index.py, if one has been built
+    SIMILARITY_INDEX_BACKEND: str = "exact"
+    # Directory of the approximate index, memory-mapped by every process
+    SIMILARITY_ANN_DIR: str = "data/similarity_index"
+    # Clusters of the approximate index, or 0 for about 4 * sqrt(vectors)
+    SIMILARITY_ANN_N_LISTS: int = 0
+    # Clusters searched per query; higher finds more of the exact neighbours
+    # but takes longer, and searching all clusters is exact
+    SIMILARITY_ANN_N_PROBE: int = 8
+    # Storage precision of bug report vectors, "float32" or "float16"
+    VECTOR_DTYPE: str = "float32"
+    # Maximum number of rows written per bulk INSERT/UPDATE by the workers
+    BULK_WRITE_BATCH_SIZE: int = 500
+    # spaCy pipeline of each component; components with the same pipeline
+    # share one copy of it per process
+    CLASSIFIER_SPACY_MODEL: str = "en_core_web_lg"
+    VECTORIZER_SPACY_MODEL: str = "en_core_web_lg"
+    # Number of bug reports vectorized and written back per batch
+    VECTORIZER_BATCH_SIZE: int = 256
+    # spaCy worker processes; keep at 1 inside daemonic prefork Celery children
+    VECTORIZER_N_PROCESS: int = 1
+    # "serial" classifies in one task, "parallel" fans chunks out over the pool
+    CLASSIFIER_EXECUTION_MODE: str = "serial"
+    # Number of bug reports per chunk task in the parallel classifier
+    CLASSIFIER_CHUNK_SIZE: int = 200
+    # Requests per minute shared by all concurrent GitHub searches
+    GITHUB_SEARCH_REQUESTS_PER_MINUTE: int = 30
+    # Directory of recorded GitHub responses to fetch from instead of GitHub
+    GITHUB_FIXTURE_DIR: str | None = None
+    # Fetch from GitHub and record the responses into GITHUB_FIXTURE_DIR
+    GITHUB_RECORD_FIXTURES: bool = False
+    # TTL of the Redis leases that keep one fetcher/classifier/vectorizer
+    # running at a time; holders renew them every third of this period
+    COORDINATOR_LEASE_SECONDS: int = 60
+    # Where read endpoints cache their responses: "memory" (per process),
+    # "redis" (shared) or "none"
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    # Seconds before a cached response expires, even if nothing was written
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    # Maximum number of responses kept by the memory backend of each process
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    # "openai", or "fake" to generate AI summaries offline without a key
+    LLM_BACKEND: str = "openai"
+    # Threads running the synchronous endpoints of each API process; keep at
+    # most DB_POOL_SIZE + DB_MAX_OVERFLOW so that no thread waits on the pool
+    API_THREAD_POOL_SIZE: int = 20
+    # Connections kept open by the API of each process, and opened on top
+    # of those under load
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    # Connections of the Celery tasks of each worker process
+    WORKER_DB_POOL_SIZE: int = 1
+    WORKER_DB_MAX_OVERFLOW: int = 2
+    # Seconds to wait for a connection before failing the request or task
+    DB_POOL_TIMEOUT_SECONDS: int = 10
+    # Seconds after which pooled connections are replaced, to stay under
+    # idle timeouts of the server or of proxies in between
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    # Test connections before handing them out, to survive database restarts
+    DB_POOL_PRE_PING: bool = True
+    # Leave connection pooling to PgBouncer (in transaction pooling mode)
+    DB_PGBOUNCER_MODE: bool = False
+    # Log every SQL statement
+    DB_ECHO: bool = False
 
     def __init__(self):
         # TODO: Investigate if there is a better way
@@ -0,0 +1,286 @@
+import asyncio
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import AsyncIterator, Callable, MutableMapping
+
+import httpx
+
+GITHUB_API_URL = "https://api.github.com"
+SEARCH_ISSUES_PATH = "/search/issues"
+# Searches return at most this many results; GitHub answers later pages
+# with 422 Unprocessable Entity
+SEARCH_RESULT_LIMIT = 1000
+
+# Response headers kept in recorded fixtures
+_RECORDED_HEADERS = {
+    "content-type",
+    "etag",
+    "last-modified",
+    "retry-after",
+    "x-ratelimit-limit",
+    "x-ratelimit-remaining",
+    "x-ratelimit-reset",
+}
+
+
+class GitHubAuthError(Exception):
+    """Raised when GitHub rejects the token, which retrying will not fix."""
+
+
+class TokenBucket:
+    """
+    Limits the rate of requests shared by concurrent coroutines.
+
+    Holds up to `capacity` tokens, refilled at `rate` tokens per second.
+    Each request takes one token, waiting for the next one if none is left.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        """Holds back all requests for `seconds`, and empties the bucket."""
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+        self._tokens = 0.0
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    self._updated = self._clock()
+                    continue
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def get_rate_limit_wait(response: httpx.Response) -> float | None:
+    """
+    Returns how many seconds to wait before retrying a request that hit a
+    primary or secondary rate limit, or None if the response is not a rate
+    limit error.
+    """
+    if response.status_code not in (403, 429):
+        return None
+    if "retry-after" in response.headers:
+        return float(response.headers["retry-after"])
+    if response.headers.get("x-ratelimit-remaining") == "0":
+        reset = float(response.headers.get("x-ratelimit-reset", time.time()))
+        return max(reset - time.time(), 0) + 1
+    return None
+
+
+class GitHubSearchClient:
+    """
+    Async client for the GitHub issue search API.
+
+    Every request takes a token from a limiter shared by all concurrent
+    searches. Searches are conditional: the ETag and Last-Modified of each
+    response are kept in `validators`, so that repeating an unchanged search
+    is answered with 304 Not Modified, which GitHub does not count against
+    the rate limit. Rate limit errors are waited out until the reset time
+    given by GitHub rather than raised.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        limiter: TokenBucket,
+        validators: MutableMapping[str, str] | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        per_page: int = 100,
+        max_rate_limit_waits: int = 3,
+    ):
+        self.limiter = limiter
+        self.validators = validators if validators is not None else {}
+        self.per_page = per_page
+        self.max_rate_limit_waits = max_rate_limit_waits
+        # Keys of the validators of all searches made by this client
+        self.requested_keys: set[str] = set()
+        self._client = httpx.AsyncClient(
+            base_url=GITHUB_API_URL,
+            headers={
+                "Accept": "application/vnd.github+json",
+                "Authorization": f"Bearer {token}",
+                "X-GitHub-Api-Version": "2022-11-28",
+            },
+            transport=transport,
+            timeout=30,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    @property
+    def max_page(self) -> int:
+        """The last page of results that GitHub serves."""
+        return SEARCH_RESULT_LIMIT // self.per_page
+
+    async def search_issues(
+        self, query: str, page: int, sort: str = "created"
+    ) -> list[dict] | None:
+        """
+        Fetches one page (starting from 1) of issues matching the query, in
+        ascending order of `sort`, "created" or "updated".
+
+        :return:
+            The issues as returned by GitHub, or None if the page has not
+            changed since it was last fetched.
+        :raises GitHubAuthError:
+            If the token is invalid.
+        :raises httpx.HTTPError:
+            If the request fails for any other reason.
+        """
+        params = {
+            "q": query,
+            "sort": sort,
+            "order": "asc",
+            "per_page": self.per_page,
+            "page": page,
+        }
+        key = str(httpx.URL(SEARCH_ISSUES_PATH, params=params))
+        self.requested_keys.add(key)
+        headers = {}
+        if key in self.validators:
+            validator = json.loads(self.validators[key])
+            if validator.get("etag"):
+                headers["If-None-Match"] = validator["etag"]
+            if validator.get("last_modified"):
+                headers["If-Modified-Since"] = validator["last_modified"]
+
+        for _ in range(self.max_rate_limit_waits + 1):
+            await self.limiter.acquire()
+            response = await self._client.get(
+                SEARCH_ISSUES_PATH, params=params, headers=headers
+            )
+            wait = get_rate_limit_wait(response)
+            if wait is None:
+                break
+            self.limiter.pause(wait)
+
+        if response.status_code == 304:
+            return None
+        if response.status_code == 401:
+            raise GitHubAuthError("Invalid GitHub token")
+        response.raise_for_status()
+
+        self.validators[key] = json.dumps(
+            {
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+            }
+        )
+        return response.json()["items"]
+
+    async def iter_search_pages(
+        self, query: str, page: int = 1, sort: str = "created"
+    ) -> AsyncIterator[tuple[int, list[dict] | None]]:
+        """
+        Fetches the pages of issues matching the query from `page` on, as
+        (page, issues) pairs, as with `search_issues`. Stops after a page
+        that is not full, has not changed since it was last fetched, or is
+        the last page that GitHub serves.
+        """
+        while True:
+            issues = await self.search_issues(query, page, sort)
+            yield page, issues
+            if issues is None or len(issues) < self.per_page:
+                return
+            if page >= self.max_page:
+                return
+            page += 1
+
+
+def _get_fixture_name(request: httpx.Request) -> str:
+    params = sorted(request.url.params.multi_items())
+    key = json.dumps([request.method, request.url.path, params])
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+class FixtureTransport(httpx.AsyncBaseTransport):
+    """
+    Serves GitHub responses from JSON fixtures in `fixture_dir`, so that the
+    fetcher can run offline.
+
+    Given a `record_with` transport, passes requests on to it instead and
+    records the responses as fixtures. When replaying, a request whose
+    If-None-Match matches the recorded ETag gets a 304, like from GitHub.
+    """
+
+    def __init__(
+        self,
+        fixture_dir: str | Path,
+        record_with: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.fixture_dir = Path(fixture_dir)
+        self.record_with = record_with
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        path = self.fixture_dir / f"{_get_fixture_name(request)}.json"
+        if self.record_with is not None:
+            response = await self.record_with.handle_async_request(request)
+            body = await response.aread()
+            self.fixture_dir.mkdir(parents=True, exist_ok=True)
+            fixture = {
+                "url": str(request.url),
+                "status": response.status_code,
+                "headers": {
+                    name: value
+                    for name, value in response.headers.items()
+                    if name.lower() in _RECORDED_HEADERS
+                },
+                "body": body.decode(),
+            }
+            path.write_text(json.dumps(fixture, indent=2))
+            return httpx.Response(
+                fixture["status"], headers=fixture["headers"], content=body
+            )
+
+        if not path.exists():
+            return httpx.Response(
+                404, json={"message": f"No fixture recorded for {request.url}"}
+            )
+        fixture = json.loads(path.read_text())
+        headers = fixture["headers"]
+        etag = request.headers.get("if-none-match")
+        if etag is not None and etag == headers.get("etag"):
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(
+            fixture["status"], headers=headers, content=fixture["body"].encode()
+        )
+
+
+__all__ = [
+    "FixtureTransport",
+    "GitHubAuthError",
+    "GitHubSearchClient",
+    "SEARCH_RESULT_LIMIT",
+    "TokenBucket",
+    "get_rate_limit_wait",
+]
@@ -0,0 +1,287 @@
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+
+import numpy as np
+
+_ARRAYS = [
+    "centroids",
+    "offsets",
+    "ids",
+    "dbms_ids",
+    "vectors",
+    "sorted_ids",
+    "sorted_positions",
+]
+_CURRENT_FILE = "CURRENT"
+_META_FILE = "meta.json"
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, block_size=4096):
+    """Returns the index of the most similar centroid of each vector."""
+    assignments = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), block_size):
+        block = vectors[start : start + block_size] @ centroids.T
+        assignments[start : start + block_size] = block.argmax(axis=1)
+    return assignments
+
+
+def kmeans(
+    vectors: np.ndarray, n_clusters: int, iterations: int, seed: int = 0
+) -> np.ndarray:
+    """
+    Clusters L2-normalised vectors by cosine similarity (spherical k-means).
+
+    :return:
+        A (n_clusters, dim) array of L2-normalised centroids.
+    """
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)]
+    for _ in range(iterations):
+        assignments = _assign(vectors, centroids)
+        counts = np.bincount(assignments, minlength=n_clusters)
+        order = np.argsort(assignments, kind="stable")
+        non_empty = np.nonzero(counts)[0]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[non_empty]
+        sums = np.zeros_like(centroids)
+        sums[non_empty] = np.add.reduceat(vectors[order], starts, axis=0)
+        # Restart empty clusters from random vectors
+        empty = np.nonzero(counts == 0)[0]
+        sums[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+        centroids = _normalize(sums)
+    return centroids
+
+
+def get_current_version(directory: str) -> str | None:
+    """Returns the version of the latest index saved to `directory`, if any."""
+    try:
+        with open(os.path.join(directory, _CURRENT_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+class IvfIndex:
+    """
+    Approximate index of L2-normalised vectors for cosine similarity search
+    (IVF-flat).
+
+    Vectors are clustered with k-means, and stored grouped by cluster, so
+    that a query only scores the vectors of the `n_probe` clusters with the
+    centroids most similar to it, one matrix-vector product per cluster.
+    Raising `n_probe` finds more of the exact neighbours at the cost of
+    latency; with `n_probe` equal to the number of clusters, the search is
+    exact.
+
+    The index is immutable. It is saved to a directory of .npy files, which
+    are memory-mapped when loaded, so that all processes on a host share one
+    copy of the vectors through the page cache.
+    """
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        offsets: np.ndarray,
+        ids: np.ndarray,
+        dbms_ids: np.ndarray,
+        vectors: np.ndarray,
+        sorted_ids: np.ndarray,
+        sorted_positions: np.ndarray,
+        built_at: datetime | None = None,
+    ):
+        self._centroids = centroids
+        # Vectors of cluster i are at rows offsets[i] to offsets[i + 1]
+        self._offsets = offsets
+        self._ids = ids
+        self._dbms_ids = dbms_ids
+        self._vectors = vectors
+        # Ids in ascending order, and their rows, to find a vector by id
+        self._sorted_ids = sorted_ids
+        self._sorted_positions = sorted_positions
+        self.built_at = built_at
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, id: int) -> bool:
+        return self._find(id) is not None
+
+    @property
+    def n_lists(self) -> int:
+        return len(self._centroids)
+
+    @classmethod
+    def build(
+        cls,
+        ids: list[int],
+        dbms_ids: list[int],
+        vectors: np.ndarray,
+        n_lists: int | None = None,
+        iterations: int = 10,
+        built_at: datetime | None = None,
+        seed: int = 0,
+    ) -> "IvfIndex":
+        """
+        Clusters raw, unnormalised vectors into an index.
+
+        :param n_lists:
+            Number of clusters, by default about 4 * sqrt(len(ids)).
+        :param iterations:
+            Number of k-means iterations.
+        :param built_at:
+            The time of the latest vector in the index, for the caller to
+            find the vectors written after it was built.
+        """
+        if len(ids) == 0:
+            raise ValueError("Cannot build an index without vectors")
+        vectors = _normalize(np.asarray(vectors).reshape(len(ids), -1))
+        ids = np.asarray(ids, dtype=np.int64)
+        dbms_ids = np.asarray(dbms_ids, dtype=np.int64)
+        n_lists = min(n_lists or int(4 * np.sqrt(len(ids))) or 1, len(ids))
+
+        # Train on a sample, which finds nearly the same clusters faster
+        rng = np.random.default_rng(seed)
+        sample_size = min(len(ids), n_lists * 256)
+        sample = vectors[rng.choice(len(ids), sample_size, replace=False)]
+        centroids = kmeans(sample, n_lists, iterations, seed)
+        assignments = _assign(vectors, centroids)
+
+        order = np.argsort(assignments, kind="stable")
+        counts = np.bincount(assignments, minlength=n_lists)
+        offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        ids, dbms_ids, vectors = ids[order], dbms_ids[order], vectors[order]
+        sorted_positions = np.argsort(ids, kind="stable")
+        return cls(
+            centroids,
+            offsets,
+            ids,
+            dbms_ids,
+            vectors,
+            ids[sorted_positions],
+            sorted_positions,
+            built_at,
+        )
+
+    def _find(self, id: int) -> int | None:
+        i = int(np.searchsorted(self._sorted_ids, id))
+        if i < len(self._sorted_ids) and self._sorted_ids[i] == id:
+            return int(self._sorted_positions[i])
+        return None
+
+    def get_vector(self, id: int) -> np.ndarray | None:
+        """Returns a copy of the normalised vector stored under `id`."""
+        pos = self._find(id)
+        return None if pos is None else np.array(self._vectors[pos])
+
+    def search_vector(
+        self,
+        query: np.ndarray,
+        k: int,
+        n_probe: int,
+        dbms_id: int | None = None,
+        exclude_ids: np.ndarray | None = None,
+    ) -> list[tuple[int, float]]:
+        """
+        Finds about the `k` vectors most similar to a normalised query
+        vector, among the vectors of the `n_probe` closest clusters.
+
+        :param exclude_ids:
+            Ids that are left out of the results.
+        :return:
+            (id, cosine similarity) pairs, most similar first.
+        """
+        if k <= 0:
+            return []
+        n_probe = min(max(n_probe, 1), self.n_lists)
+        centroid_scores = self._centroids @ query
+        probed = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+        rows = np.concatenate(
+            [
+                np.arange(self._offsets[cluster], self._offsets[cluster + 1])
+                for cluster in probed
+            ]
+        )
+        ids = self._ids[rows]
+        scores = np.concatenate(
+            [
+                self._vectors[self._offsets[cluster] : self._offsets[cluster + 1]]
+                @ query
+                for cluster in probed
+            ]
+        )
+        if dbms_id is not None:
+            scores[self._dbms_ids[rows] != dbms_id] = -np.inf
+        if exclude_ids is not None and len(exclude_ids) > 0:
+            scores[np.isin(ids, exclude_ids)] = -np.inf
+
+        k = min(k, int(np.count_nonzero(np.isfinite(scores))))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+    def save(self, directory: str) -> str:
+        """
+        Saves the index as a new version in `directory`, makes it the
+        current version, and deletes the older versions. Processes that
+        still have an older version mapped keep reading it until they load
+        the new one.
+
+        :return:
+            The version of the saved index.
+        """
+        os.makedirs(directory, exist_ok=True)
+        version = str(time.time_ns())
+        staging = os.path.join(directory, f".{version}")
+        os.makedirs(staging)
+        for name in _ARRAYS:
+            np.save(os.path.join(staging, f"{name}.npy"), getattr(self, f"_{name}"))
+        with open(os.path.join(staging, _META_FILE), "w") as f:
+            built_at = self.built_at.isoformat() if self.built_at else None
+            json.dump({"built_at": built_at}, f)
+        os.rename(staging, os.path.join(directory, version))
+
+        # Switch readers over atomically
+        current = os.path.join(directory, f".{_CURRENT_FILE}.{version}")
+        with open(current, "w") as f:
+            f.write(version)
+        os.replace(current, os.path.join(directory, _CURRENT_FILE))
+
+        for entry in os.listdir(directory):
+            path = os.path.join(directory, entry)
+            if entry != version and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+        return version
+
+    @classmethod
+    def load(cls, directory: str, version: str | None = None) -> "IvfIndex | None":
+        """
+        Memory-maps a saved version of the index, by default the current
+        one. Returns None if no index has been saved to `directory`.
+        """
+        version = version or get_current_version(directory)
+        if version is None:
+            return None
+        path = os.path.join(directory, version)
+        arrays = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            for name in _ARRAYS
+        }
+        with open(os.path.join(path, _META_FILE)) as f:
+            built_at = json.load(f)["built_at"]
+        return cls(
+            **arrays,
+            built_at=datetime.fromisoformat(built_at) if built_at else None,
+        )
+
+
+__all__ = ["IvfIndex", "get_current_version", "kmeans"]
@@ -0,0 +1,130 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+from fuzzywuzzy import fuzz
+
+if TYPE_CHECKING:
+    from spacy.language import Language
+
+
+class KeywordMatcher:
+    """
+    Precompiled keyword matcher for classifying bug titles into categories.
+
+    All keyword processing (lowercasing, spaCy parsing, stopword removal and
+    vector lookup) happens once on construction, so matching a title costs a
+    single tokenizer pass plus one matrix-vector product for the semantic
+    similarity of every keyword at once.
+
+    Matching uses three tiers, in order:
+    1. Exact: the first keyword (in declaration order) that is a substring of
+       the title wins outright.
+    2. Otherwise, each keyword is scored by a weighted sum of fuzzy partial
+       ratio, word vector similarity and stopword-free token overlap, and the
+       best scoring keyword above `threshold` wins.
+    3. Otherwise, there is no match.
+    """
+
+    def __init__(
+        self,
+        nlp: "Language",
+        category_keywords: dict[str, list[str]],
+        fuzzy_weight: float,
+        spacy_weight: float,
+        token_overlap_weight: float,
+        threshold: float,
+    ):
+        self._nlp = nlp
+        self._fuzzy_weight = fuzzy_weight
+        self._spacy_weight = spacy_weight
+        self._token_overlap_weight = token_overlap_weight
+        self._threshold = threshold
+
+        self._categories: list[str] = []
+        self._keywords: list[str] = []
+        for category, keywords in category_keywords.items():
+            for keyword in keywords:
+                self._categories.append(category)
+                self._keywords.append(keyword.lower())
+
+        # Only the tokenizer and static vector table are used, so skip all
+        # pipeline components when parsing
+        self._disabled_pipes = nlp.pipe_names
+        keyword_docs = list(nlp.pipe(self._keywords, disable=self._disabled_pipes))
+        self._keyword_tokens = [
+            {token.text for token in doc if not token.is_stop} for doc in keyword_docs
+        ]
+        self._keyword_token_counts = np.array(
+            [max(len(tokens), 1) for tokens in self._keyword_tokens],
+            dtype=np.float64,
+        )
+        self._keyword_vectors = np.stack(
+            [np.asarray(doc.vector, dtype=np.float32) for doc in keyword_docs]
+        ).reshape(len(keyword_docs), -1)
+        self._keyword_norms = np.array(
+            [doc.vector_norm for doc in keyword_docs], dtype=np.float64
+        )
+        self._keyword_has_vector = np.array(
+            [doc.has_vector and doc.vector_norm != 0 for doc in keyword_docs],
+            dtype=bool,
+        )
+
+    def _get_spacy_scores(self, issue_doc) -> np.ndarray:
+        """Cosine similarity between the title and every keyword."""
+        scores = np.zeros(len(self._keywords), dtype=np.float64)
+        issue_norm = issue_doc.vector_norm
+        if not issue_doc.has_vector or issue_norm == 0:
+            return scores
+        issue_vector = np.asarray(issue_doc.vector, dtype=np.float32)
+        mask = self._keyword_has_vector
+        # Mirror Doc.similarity: float32 dot product over float32-rounded norms
+        norms = (issue_norm * self._keyword_norms[mask]).astype(np.float32)
+        scores[mask] = (self._keyword_vectors[mask] @ issue_vector) / norms
+        return scores
+
+    def match(self, issue_title: str) -> str | None:
+        """Returns the category matching the issue title, if any."""
+        issue_title = issue_title.lower()
+
+        # Exact match (highest priority)
+        for category, keyword in zip(self._categories, self._keywords):
+            if keyword in issue_title:
+                return category
+
+        issue_doc = self._nlp(issue_title, disable=self._disabled_pipes)
+
+        # Fuzzy matching (handles typos & variations), normalised to 0-1
+        fuzzy_scores = np.array(
+            [fuzz.partial_ratio(issue_title, keyword) for keyword in self._keywords],
+            dtype=np.float64,
+        )
+        fuzzy_scores /= 100
+
+        # Word vector similarity
+        spacy_scores = self._get_spacy_scores(issue_doc)
+
+        # Common token overlap (better context matching)
+        issue_tokens = {token.text for token in issue_doc if not token.is_stop}
+        common_token_scores = (
+            np.array(
+                [len(issue_tokens & tokens) for tokens in self._keyword_tokens],
+                dtype=np.float64,
+            )
+            / self._keyword_token_counts
+        )
+
+        # Dynamic weighted scoring, normalising the impact of title length
+        length_factor = min(len(issue_title) / 100, 1)
+        combined_scores = (
+            (self._fuzzy_weight * fuzzy_scores)
+            + (self._spacy_weight * spacy_scores)
+            + (self._token_overlap_weight * common_token_scores * length_factor)
+        )
+
+        best = int(np.argmax(combined_scores))
+        if combined_scores[best] > self._threshold:
+            return self._categories[best]
+        return None
+
+
+__all__ = ["KeywordMatcher"]
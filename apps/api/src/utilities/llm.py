@@ -0,0 +1,60 @@
+import hashlib
+from typing import Protocol
+
+import openai
+from utilities.constants import constants
+
+
+class LlmClient(Protocol):
+    def complete(self, prompt: str) -> str:
+        """Returns the answer of the model to a single user prompt."""
+        ...
+
+
+class OpenAiLlmClient:
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        max_tokens: int = 200,
+        temperature: float = 0.2,
+    ):
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+
+    def complete(self, prompt: str) -> str:
+        response = openai.ChatCompletion.create(
+            # Passed explicitly, as workers do not run the API's configure_openai
+            api_key=constants.OPENAI_API_KEY,
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+        )
+        return response["choices"][0]["message"]["content"].strip()
+
+
+class FakeLlmClient:
+    """
+    Stand-in for the LLM in tests and offline development. Answers each
+    prompt instantly with a summary derived from its hash, so the same
+    prompt always gets the same answer, and records the prompts it got.
+    """
+
+    def __init__(self):
+        self.prompts: list[str] = []
+
+    def complete(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        digest = hashlib.sha256(prompt.encode()).hexdigest()[:12]
+        return f"Fake summary {digest}"
+
+
+def get_llm_client() -> LlmClient:
+    """Returns the LLM client configured by LLM_BACKEND."""
+    if constants.LLM_BACKEND == "fake":
+        return FakeLlmClient()
+    return OpenAiLlmClient()
+
+
+__all__ = ["FakeLlmClient", "LlmClient", "OpenAiLlmClient", "get_llm_client"]
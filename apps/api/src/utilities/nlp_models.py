@@ -0,0 +1,73 @@
+import threading
+from enum import Enum
+from typing import TYPE_CHECKING, Callable
+
+from utilities.constants import constants
+
+if TYPE_CHECKING:
+    from spacy.language import Language
+
+
+class NlpComponent(str, Enum):
+    """The parts of the app that use a spaCy pipeline."""
+
+    Classifier = "classifier"
+    Vectorizer = "vectorizer"
+
+
+def _get_configured_model_name(component: NlpComponent) -> str:
+    if component == NlpComponent.Classifier:
+        return constants.CLASSIFIER_SPACY_MODEL
+    return constants.VECTORIZER_SPACY_MODEL
+
+
+def _load_spacy_model(name: str) -> "Language":
+    # Imported here, so that processes that never load a model, such as the
+    # API, do not pay for importing spaCy
+    import spacy
+
+    return spacy.load(name)
+
+
+class NlpModelRegistry:
+    """
+    Loads spaCy pipelines on first use, once per model name, so that all
+    components configured with the same model share one copy of it.
+
+    Components that only need some of the pipeline disable the rest when
+    they run it, rather than loading their own copy without it.
+    """
+
+    def __init__(
+        self,
+        get_model_name: Callable[[NlpComponent], str] = _get_configured_model_name,
+        load_model: Callable[[str], "Language"] = _load_spacy_model,
+    ):
+        self._get_model_name = get_model_name
+        self._load_model = load_model
+        self._lock = threading.Lock()
+        self._models: dict[str, "Language"] = {}
+
+    def get(self, component: NlpComponent) -> "Language":
+        name = self._get_model_name(component)
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        with self._lock:
+            if name not in self._models:
+                self._models[name] = self._load_model(name)
+            return self._models[name]
+
+    def is_loaded(self, component: NlpComponent) -> bool:
+        return self._get_model_name(component) in self._models
+
+
+_registry = NlpModelRegistry()
+
+
+def get_nlp_model(component: NlpComponent) -> "Language":
+    """Returns the spaCy pipeline of a component, loading it if needed."""
+    return _registry.get(component)
+
+
+__all__ = ["NlpComponent", "NlpModelRegistry", "get_nlp_model"]
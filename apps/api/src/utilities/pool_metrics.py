@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import deque
+
+import numpy as np
+from sqlalchemy import exc
+from sqlalchemy.pool import NullPool, Pool, QueuePool
+
+
+class PoolMetrics:
+    """
+    Counts the connection checkouts of a pool, and keeps the time that the
+    latest `window` checkouts took, including waiting for a connection to
+    be returned to the pool or for a new one to be opened.
+    """
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._waits: deque[float] = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.max_wait = 0.0
+
+    def record_checkout(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.max_wait = max(self.max_wait, seconds)
+            self._waits.append(seconds)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def get_wait_percentiles(self, percentiles: list[float]) -> list[float]:
+        """Returns percentiles of the recent checkout times, in seconds."""
+        with self._lock:
+            waits = list(self._waits)
+        if not waits:
+            return [0.0] * len(percentiles)
+        return [float(wait) for wait in np.percentile(waits, percentiles)]
+
+
+class _TimedPool(Pool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # Keep counting across Engine.dispose(), which recreates the pool
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(_TimedPool, QueuePool):
+    """QueuePool that records its checkouts in `metrics`."""
+
+
+class TimedNullPool(_TimedPool, NullPool):
+    """NullPool that records its connects in `metrics`."""
+
+
+def get_pool_stats(pool: Pool) -> dict:
+    """Returns the state of a pool, and its metrics if it records them."""
+    stats = {}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        p50, p99 = metrics.get_wait_percentiles([50, 99])
+        stats.update(
+            checkouts=metrics.checkouts,
+            timeouts=metrics.timeouts,
+            wait_p50_ms=p50 * 1000,
+            wait_p99_ms=p99 * 1000,
+            wait_max_ms=metrics.max_wait * 1000,
+        )
+    return stats
+
+
+__all__ = [
+    "PoolMetrics",
+    "TimedNullPool",
+    "TimedQueuePool",
+    "get_pool_stats",
+]
@@ -1,5 +1,10 @@
 from typing import List
 
+# Bump when changing a prompt template, so that the stored AI summaries
+# generated from the old template are regenerated
+DBMS_AI_SUMMARY_PROMPT_VERSION = 1
+BUG_REPORT_AI_SUMMARY_PROMPT_VERSION = 1
+
 
 def get_dbms_ai_summary_prompt(dbms_name: str, desc: List[str]) -> str:
     desc_numbered = "\n".join([f"{i + 1}. {d}" for i, d in enumerate(desc)])
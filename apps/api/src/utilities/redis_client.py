@@ -0,0 +1,18 @@
+from functools import cache
+
+from redis import Redis
+from utilities.constants import constants
+
+
+@cache
+def get_redis_client() -> Redis:
+    """
+    Returns the client of this process for the Redis instance that also
+    serves as the Celery broker.
+    """
+    # redis-py resets its connection pool after a fork, so one client per
+    # process is safe under the prefork pool
+    return Redis.from_url(constants.REDIS_BROKER_URL.unicode_string())
+
+
+__all__ = ["get_redis_client"]
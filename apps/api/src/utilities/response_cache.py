@@ -0,0 +1,274 @@
+import inspect
+import json
+import threading
+import time
+from collections import Counter, OrderedDict
+from enum import Enum
+from functools import wraps
+from typing import Any, Callable, Iterable, Protocol
+
+from pydantic import TypeAdapter
+from redis import Redis, RedisError
+from utilities.constants import constants
+from utilities.redis_client import get_redis_client
+
+_KEY_PREFIX = "bug-track:cache"
+
+
+class CacheNamespace(str, Enum):
+    """The data read by cached methods, each versioned separately."""
+
+    DbmsSystems = "dbms_systems"
+    BugCategories = "bug_categories"
+    BugReports = "bug_reports"
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes, ttl_seconds: int): ...
+
+
+class MemoryCacheBackend:
+    """
+    Least recently used cache of up to `max_entries` values, held by this
+    process. Each value expires `ttl_seconds` after it is set.
+    """
+
+    def __init__(
+        self, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Key to (expiry time, value), least recently used first
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl_seconds: int):
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class RedisCacheBackend:
+    """Cache shared by all processes, which leaves eviction to Redis."""
+
+    def __init__(self, client: Redis):
+        self.client = client
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(f"{_KEY_PREFIX}:entry:{key}")
+
+    def set(self, key: str, value: bytes, ttl_seconds: int):
+        self.client.set(f"{_KEY_PREFIX}:entry:{key}", value, ex=ttl_seconds)
+
+
+class ResponseCache:
+    """
+    Caches the results of read methods by their arguments and by the
+    current version of each namespace they read from.
+
+    The versions are counters kept in Redis, so that every process sees the
+    same ones. Writers bump the versions of the namespaces they change,
+    which makes all entries read from them unreachable at once, in every
+    backend. Unreachable entries are left to expire or be evicted.
+
+    Hits and misses are counted per method, in this process.
+    """
+
+    def __init__(self, backend: CacheBackend, client: Redis, ttl_seconds: int = 300):
+        self.backend = backend
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+        # Responses served without the cache because Redis was unreachable
+        self.errors: Counter[str] = Counter()
+
+    def _get_version_key(self, namespace: CacheNamespace) -> str:
+        return f"{_KEY_PREFIX}:version:{namespace.value}"
+
+    def get_versions(self, namespaces: Iterable[CacheNamespace]) -> list[int]:
+        keys = [self._get_version_key(namespace) for namespace in namespaces]
+        return [int(version or 0) for version in self.client.mget(keys)]
+
+    def bump_versions(self, *namespaces: CacheNamespace):
+        with self.client.pipeline(transaction=False) as pipe:
+            for namespace in namespaces:
+                pipe.incr(self._get_version_key(namespace))
+            pipe.execute()
+
+    def get_or_compute(
+        self,
+        name: str,
+        namespaces: list[CacheNamespace],
+        key: str,
+        compute: Callable[[], Any],
+        adapter: TypeAdapter,
+    ) -> Any:
+        """
+        Returns the cached result of `compute`, or computes and caches it.
+
+        :param name:
+            Name of the cached method, under which hits and misses are counted.
+        :param key:
+            Identifies the arguments of the call.
+        :param adapter:
+            Converts the result to and from JSON. Results are converted on a
+            miss too, so that hits and misses return the same types.
+        """
+        try:
+            versions = self.get_versions(namespaces)
+            entry_key = f"{name}:{':'.join(map(str, versions))}:{key}"
+            cached = self.backend.get(entry_key)
+        except RedisError:
+            self.errors[name] += 1
+            return adapter.validate_python(compute(), from_attributes=True)
+
+        if cached is not None:
+            self.hits[name] += 1
+            return adapter.validate_json(cached)
+        self.misses[name] += 1
+        value = adapter.validate_python(compute(), from_attributes=True)
+        try:
+            self.backend.set(entry_key, adapter.dump_json(value), self.ttl_seconds)
+        except RedisError:
+            self.errors[name] += 1
+        return value
+
+    def get_stats(self) -> dict[str, dict[str, int]]:
+        return {
+            name: {
+                "hits": self.hits[name],
+                "misses": self.misses[name],
+                "errors": self.errors[name],
+            }
+            for name in sorted(self.hits | self.misses | self.errors)
+        }
+
+
+_response_cache: ResponseCache | None = None
+
+
+def create_response_cache() -> ResponseCache | None:
+    """
+    Creates the response cache of this process as configured, or returns
+    None if caching is turned off.
+    """
+    backend_name = constants.RESPONSE_CACHE_BACKEND
+    if backend_name == "none":
+        return None
+    client = get_redis_client()
+    if backend_name == "memory":
+        backend = MemoryCacheBackend(constants.RESPONSE_CACHE_MAX_ENTRIES)
+    elif backend_name == "redis":
+        backend = RedisCacheBackend(client)
+    else:
+        raise ValueError(f"Unknown response cache backend: {backend_name}")
+    return ResponseCache(backend, client, constants.RESPONSE_CACHE_TTL_SECONDS)
+
+
+def get_response_cache() -> ResponseCache | None:
+    return _response_cache
+
+
+def set_response_cache(cache: ResponseCache | None):
+    global _response_cache
+    _response_cache = cache
+
+
+def cached(
+    namespaces: list[CacheNamespace],
+    returns: Any,
+    key_extra: Callable[[], Any] | None = None,
+):
+    """
+    Caches a service method of the form `method(self, tx, *args)` in the
+    response cache of the process, if there is one. Calls are keyed by
+    the values of their parameters other than the session, however they
+    were passed.
+
+    :param namespaces:
+        The data the method reads from.
+    :param returns:
+        Type of the cached result, which the result of the method is
+        converted to.
+    :param key_extra:
+        Returns anything else the result depends on, such as the current
+        day, to add to the key.
+    """
+
+    def decorator(method):
+        name = method.__qualname__
+        adapter = TypeAdapter(returns)
+        signature = inspect.signature(method)
+
+        @wraps(method)
+        def wrapper(self, tx, *args, **kwargs):
+            cache = get_response_cache()
+            if cache is None:
+                return method(self, tx, *args, **kwargs)
+            bound = signature.bind(self, tx, *args, **kwargs)
+            bound.apply_defaults()
+            # Skip self and the session
+            key_parts = [list(bound.arguments.items())[2:]]
+            if key_extra is not None:
+                key_parts.append(key_extra())
+            key = json.dumps(key_parts, default=str)
+            return cache.get_or_compute(
+                name,
+                namespaces,
+                key,
+                lambda: method(self, tx, *args, **kwargs),
+                adapter,
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate_responses(*namespaces: CacheNamespace):
+    """
+    Makes the cached responses read from `namespaces` unreachable. Call
+    after committing a write to them.
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return
+    try:
+        cache.bump_versions(*namespaces)
+    except RedisError:
+        # Stale entries still expire after the TTL
+        pass
+
+
+__all__ = [
+    "CacheBackend",
+    "CacheNamespace",
+    "MemoryCacheBackend",
+    "RedisCacheBackend",
+    "ResponseCache",
+    "cached",
+    "create_response_cache",
+    "get_response_cache",
+    "invalidate_responses",
+    "set_response_cache",
+]
@@ -0,0 +1,81 @@
+import io
+import pickle
+import struct
+
+import numpy as np
+
+# Encoded vectors are a fixed 4-byte header followed by the raw little-endian
+# components. The header keeps float32 payloads 4-byte aligned, so they can be
+# decoded with np.frombuffer without copying.
+_MAGIC = b"BV"
+_VERSION = 1
+_HEADER = struct.Struct("<2sBB")  # magic, version, dtype code
+_DTYPES = {
+    1: np.dtype("<f4"),
+    2: np.dtype("<f2"),
+}
+_DTYPE_CODES = {dtype.name: code for code, dtype in _DTYPES.items()}
+
+# Opcode that starts every pickle of protocol 2 and above
+_PICKLE_PROTO = b"\x80"
+
+
+class _NumpyUnpickler(pickle.Unpickler):
+    """Unpickler that only reconstructs numpy arrays."""
+
+    _ALLOWED = {
+        ("numpy", "ndarray"),
+        ("numpy", "dtype"),
+        ("numpy.core.multiarray", "_reconstruct"),
+        ("numpy._core.multiarray", "_reconstruct"),
+    }
+
+    def find_class(self, module: str, name: str):
+        if (module, name) not in _NumpyUnpickler._ALLOWED:
+            raise pickle.UnpicklingError(f"Refusing to load {module}.{name}")
+        return super().find_class(module, name)
+
+
+def encode_vector(vector: np.ndarray, dtype: str = "float32") -> bytes:
+    """
+    Encodes a 1-D vector into the versioned binary vector format.
+
+    :param dtype:
+        Storage precision, either "float32" or "float16".
+    """
+    code = _DTYPE_CODES.get(dtype)
+    if code is None:
+        raise ValueError(f"Unsupported vector dtype: {dtype}")
+    payload = np.ascontiguousarray(vector, dtype=_DTYPES[code]).ravel()
+    return _HEADER.pack(_MAGIC, _VERSION, code) + payload.tobytes()
+
+
+def is_legacy_vector(data: bytes) -> bool:
+    """Whether `data` is a pickled numpy array from before the binary format."""
+    return data[:1] == _PICKLE_PROTO
+
+
+def decode_vector(data: bytes) -> np.ndarray:
+    """
+    Decodes a vector stored in either the binary vector format or the legacy
+    pickle format. Binary vectors are returned as read-only views over `data`.
+    """
+    if is_legacy_vector(data):
+        vector = _NumpyUnpickler(io.BytesIO(data)).load()
+        if not isinstance(vector, np.ndarray) or vector.dtype.kind != "f":
+            raise ValueError("Pickled data is not a float vector")
+        return vector.ravel()
+    if len(data) < _HEADER.size:
+        raise ValueError("Vector data is too short")
+    magic, version, code = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError("Unrecognised vector format")
+    if version != _VERSION:
+        raise ValueError(f"Unsupported vector format version: {version}")
+    dtype = _DTYPES.get(code)
+    if dtype is None:
+        raise ValueError(f"Unsupported vector dtype code: {code}")
+    return np.frombuffer(data, dtype=dtype, offset=_HEADER.size)
+
+
+__all__ = ["decode_vector", "encode_vector", "is_legacy_vector"]
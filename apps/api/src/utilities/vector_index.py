@@ -0,0 +1,221 @@
+import threading
+from typing import Iterator
+
+import numpy as np
+
+
+class VectorIndex:
+    """
+    In-memory index of L2-normalised vectors for cosine similarity search.
+
+    Vectors are stored in a single contiguous float32 matrix alongside their
+    ids and DBMS ids, so that a query is one matrix-vector product followed
+    by a partial sort. Rows are appended in amortised O(1) time and updated
+    in place when an id is re-inserted.
+    """
+
+    _INITIAL_CAPACITY = 1024
+
+    def __init__(self, dim: int | None = None):
+        self._lock = threading.Lock()
+        self._dim = dim
+        self._size = 0
+        self._ids = np.empty(0, dtype=np.int64)
+        self._dbms_ids = np.empty(0, dtype=np.int64)
+        self._vectors = np.empty((0, dim or 0), dtype=np.float32)
+        self._positions: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, id: int) -> bool:
+        return id in self._positions
+
+    @property
+    def dim(self) -> int | None:
+        return self._dim
+
+    def clear(self):
+        with self._lock:
+            self._size = 0
+            self._ids = np.empty(0, dtype=np.int64)
+            self._dbms_ids = np.empty(0, dtype=np.int64)
+            self._vectors = np.empty((0, self._dim or 0), dtype=np.float32)
+            self._positions = {}
+
+    def _reserve(self, capacity: int):
+        """Grows the backing arrays to hold at least `capacity` rows."""
+        if capacity <= self._ids.shape[0]:
+            return
+        new_capacity = max(capacity, self._ids.shape[0] * 2, self._INITIAL_CAPACITY)
+        ids = np.empty(new_capacity, dtype=np.int64)
+        dbms_ids = np.empty(new_capacity, dtype=np.int64)
+        vectors = np.zeros((new_capacity, self._dim), dtype=np.float32)
+        ids[: self._size] = self._ids[: self._size]
+        dbms_ids[: self._size] = self._dbms_ids[: self._size]
+        vectors[: self._size] = self._vectors[: self._size]
+        self._ids, self._dbms_ids, self._vectors = ids, dbms_ids, vectors
+
+    def upsert(self, ids: list[int], dbms_ids: list[int], vectors: np.ndarray):
+        """
+        Inserts or replaces vectors in the index.
+
+        :param ids:
+            Ids of the vectors, e.g. bug report ids.
+        :param dbms_ids:
+            DBMS id of each vector, used to scope queries.
+        :param vectors:
+            A (len(ids), dim) array of raw, unnormalised vectors.
+        """
+        if len(ids) == 0:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        # Zero vectors stay zero, and therefore never score above 0
+        vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+        with self._lock:
+            if self._dim is None:
+                self._dim = vectors.shape[1]
+                self._vectors = np.empty((0, self._dim), dtype=np.float32)
+            if vectors.shape[1] != self._dim:
+                raise ValueError(
+                    f"Expected vectors of dimension {self._dim}, got {vectors.shape[1]}"
+                )
+            self._reserve(self._size + len(ids))
+            for id, dbms_id, vector in zip(ids, dbms_ids, vectors):
+                pos = self._positions.get(id)
+                if pos is None:
+                    pos = self._size
+                    self._positions[id] = pos
+                    self._size += 1
+                self._ids[pos] = id
+                self._dbms_ids[pos] = dbms_id
+                self._vectors[pos] = vector
+
+    def get_ids(self) -> np.ndarray:
+        """Returns the ids of all vectors in the index."""
+        with self._lock:
+            return self._ids[: self._size].copy()
+
+    def get_vector(self, id: int) -> np.ndarray | None:
+        """Returns a copy of the normalised vector stored under `id`."""
+        with self._lock:
+            pos = self._positions.get(id)
+            return None if pos is None else self._vectors[pos].copy()
+
+    def search(
+        self, id: int, k: int, dbms_id: int | None = None
+    ) -> list[tuple[int, float]]:
+        """
+        Finds the `k` vectors most similar to the vector stored under `id`.
+
+        :param id:
+            Id of the query vector, which is excluded from the results.
+        :param k:
+            Maximum number of neighbours to return.
+        :param dbms_id:
+            If given, only vectors belonging to this DBMS are considered.
+        :return:
+            (id, cosine similarity) pairs, most similar first.
+        """
+        query = self.get_vector(id)
+        if query is None:
+            return []
+        return self.search_vector(query, k, dbms_id, exclude_id=id)
+
+    def search_vector(
+        self,
+        query: np.ndarray,
+        k: int,
+        dbms_id: int | None = None,
+        exclude_id: int | None = None,
+    ) -> list[tuple[int, float]]:
+        """
+        Finds the `k` vectors most similar to a normalised query vector,
+        leaving out the vector stored under `exclude_id`.
+        """
+        with self._lock:
+            if k <= 0 or self._size == 0:
+                return []
+            # Snapshot the live region; rows appended later are not visible
+            ids = self._ids[: self._size]
+            dbms_ids = self._dbms_ids[: self._size]
+            vectors = self._vectors[: self._size]
+            pos = self._positions.get(exclude_id)
+
+        scores = vectors @ query
+        if pos is not None:
+            scores[pos] = -np.inf
+        if dbms_id is not None:
+            scores[dbms_ids != dbms_id] = -np.inf
+
+        k = min(k, int(np.count_nonzero(np.isfinite(scores))))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+    def iter_score_blocks(
+        self, query_ids: list[int] | None, block_size: int
+    ) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Computes the similarity of every vector to each query vector, one
+        block of `block_size` vectors at a time, so that only a
+        (block_size, len(query_ids)) matrix is held at once.
+
+        :param query_ids:
+            Ids of the query vectors, or None to query all vectors. Ids not
+            in the index are skipped.
+        :return:
+            For each block, the ids of its vectors, the ids of the query
+            vectors, and the (block, queries) cosine similarities. The
+            similarity of each vector to itself is -inf.
+        """
+        with self._lock:
+            ids = self._ids[: self._size]
+            vectors = self._vectors[: self._size]
+            if query_ids is None:
+                query_positions = np.arange(self._size)
+            else:
+                query_positions = np.array(
+                    [self._positions[id] for id in query_ids if id in self._positions],
+                    dtype=np.int64,
+                )
+        query_ids = ids[query_positions]
+        queries = vectors[query_positions].T
+
+        for start in range(0, len(ids), block_size):
+            end = min(start + block_size, len(ids))
+            scores = vectors[start:end] @ queries
+            # Queries that are in this block
+            self_columns = np.nonzero(
+                (query_positions >= start) & (query_positions < end)
+            )[0]
+            scores[query_positions[self_columns] - start, self_columns] = -np.inf
+            yield ids[start:end], query_ids, scores
+
+
+def top_k(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Finds the `k` highest finite scores in each row of a matrix.
+
+    :return:
+        The column indices and the scores of the top `k` of each row, highest
+        first. Rows with fewer than `k` finite scores are padded with -inf.
+    """
+    k = min(k, scores.shape[1])
+    if k == 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.int64), empty
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    return (
+        np.take_along_axis(top, order, axis=1),
+        np.take_along_axis(top_scores, order, axis=1),
+    )
+
+
+__all__ = ["VectorIndex", "top_k"]
@@ -0,0 +1,30 @@
+from configuration.logger import get_logger
+from domain.config import get_session
+from domain.enums import AiSummaryEntity
+from services.ai_summary_service import AiSummaryService
+from utilities.llm import get_llm_client
+from workers.celery_app import celery_app
+
+
+@celery_app.task(bind=True, max_retries=3)
+def generate_ai_summary_task(self, entity_type: str, entity_id: int):
+    """
+    Generates the AI summary of a DBMS or bug report in the background, if
+    its data changed since it was last summarised.
+    """
+    logger = get_logger()
+    entity = AiSummaryEntity(entity_type)
+    try:
+        with get_session() as session:
+            generated = AiSummaryService.generate_summary(
+                session, entity, entity_id, get_llm_client()
+            )
+    except Exception as e:
+        logger.error(f"Error generating AI summary of {entity.value} {entity_id}: {e}")
+        raise self.retry(exc=e, countdown=60)
+    # Requests made while the summary was being generated were dropped, and
+    # may have seen newer data
+    AiSummaryService.clear_summary_request(entity, entity_id)
+    if generated:
+        logger.info(f"Generated AI summary of {entity.value} {entity_id}")
+    return generated
@@ -1,63 +1,120 @@
-import time
-
+from celery import chord
 from configuration.logger import get_logger
 from domain.config import get_session
+from domain.models.BugReport import get_unclassified_bug_ids
 from services.bug_classifier_service import BugClassifierService
+from utilities.constants import constants
 from workers.celery_app import celery_app
-from workers.task_coordinator import TaskCoordinator
+from workers.task_coordinator import TaskCoordinator, TaskRole
+
+
+@celery_app.task(ignore_result=False)
+def classify_bug_chunk_task(bug_ids: list[int], lease_token: str) -> int:
+    """Classifies one chunk of bug reports, in whichever pool process takes it."""
+    # Each chunk keeps the lease of the whole run alive for as long as it
+    # works, and takes it again if it expired while the chunk was queued
+    lease = TaskCoordinator().resume_lease(TaskRole.Classifier, lease_token)
+    if lease is None:
+        # Another sweep took over, and classifies these bug reports itself
+        get_logger().warning(
+            f"Classifier lease was taken over. Skipping a chunk of {len(bug_ids)} "
+            "bug reports."
+        )
+        return 0
+    try:
+        with get_session() as session:
+            return BugClassifierService.classify_bugs_by_ids(session, bug_ids)
+    finally:
+        lease.stop_heartbeat()
+
+
+@celery_app.task
+def finish_parallel_classification_task(classified_counts: list[int], lease_token: str):
+    """Joins the chunk tasks of a parallel classification run."""
+    logger = get_logger()
+    coordinator = TaskCoordinator()
+    logger.info(
+        f"Parallel classification completed. Total classified: "
+        f"{sum(classified_counts)} bug reports in {len(classified_counts)} chunks."
+    )
+    coordinator.release_lease(TaskRole.Classifier, lease_token)
+
+
+def dispatch_parallel_classification(lease_token: str) -> int:
+    """
+    Partitions the unclassified bug reports into chunks and fans them out
+    over the worker pool as a chord. The chunks renew the classifier lease
+    held under `lease_token`, and the chord callback releases it.
+
+    :return:
+        The number of chunks dispatched.
+    """
+    with get_session() as session:
+        bug_ids = get_unclassified_bug_ids(session)
+    chunk_size = constants.CLASSIFIER_CHUNK_SIZE
+    chunks = [bug_ids[i : i + chunk_size] for i in range(0, len(bug_ids), chunk_size)]
+    if chunks:
+        chord(classify_bug_chunk_task.s(chunk, lease_token) for chunk in chunks)(
+            finish_parallel_classification_task.s(lease_token)
+        )
+    return len(chunks)
 
 
 @celery_app.task(bind=True, max_retries=3)
-def classify_bugs_task(self, bug_ids=None):
+def classify_bugs_task(self, bug_ids: list[int] | None = None):
     """
     Runs the bug classifier as a background task.
-    Can classify specific bugs by ID or all unclassified bugs if bug_ids is None.
+
+    Classifies exactly the given bugs if bug_ids is set, which is how the
+    fetcher hands over each page of new bugs. Otherwise sweeps all
+    unclassified bugs, e.g. those whose own task failed; in the parallel
+    execution mode the sweep is split into chunks classified by
+    classify_bug_chunk_task instead.
     """
     logger = get_logger()
+
+    if bug_ids:
+        try:
+            with get_session() as session:
+                classified_count = BugClassifierService.classify_bugs_by_ids(
+                    session, bug_ids
+                )
+        except Exception as e:
+            logger.error(f"Error in classification task: {e}")
+            raise self.retry(exc=e, countdown=30)
+        logger.info(f"Classified {classified_count} of {len(bug_ids)} bug reports.")
+        return classified_count
+
     coordinator = TaskCoordinator()
-    coordinator.set_classifier_running(True)
-    logger.info(
-        f"Starting bug classification task: {'specific bugs' if bug_ids else 'all unclassified bugs'}"
-    )
+    parallel = constants.CLASSIFIER_EXECUTION_MODE == "parallel"
+    # In the parallel mode the lease outlives this task, and is kept alive by
+    # the heartbeats of the chunk tasks instead
+    lease = coordinator.acquire_lease(TaskRole.Classifier, heartbeat=not parallel)
+    if lease is None:
+        logger.info("Classifier is already running. Exiting task.")
+        return 0
+    logger.info("Starting classification of all unclassified bug reports")
 
-    total_classified = self.request.get("total_classified", 0)
+    if parallel:
+        try:
+            chunk_count = dispatch_parallel_classification(lease.token)
+        except Exception:
+            lease.release()
+            raise
+        logger.info(f"Dispatched {chunk_count} classification chunks.")
+        if chunk_count == 0:
+            lease.release()
+        return chunk_count
 
     try:
-        while True:
-            with get_session() as session:
-                if bug_ids:
-                    # Future implementation for specific bug IDs
-                    logger.info(f"Classifying specific {len(bug_ids)} bug reports.")
-                    # TODO: Implement specific bug classification
-                    classified_count = 0
-                    break
-                else:
-                    # Classify all unclassified bugs in this batch
-                    classified_count = BugClassifierService.classify_unclassified_bugs(
-                        session
-                    )
-
-                    total_classified += classified_count
-                    self.update_state(state={"total_classified": total_classified})
-
-                    if classified_count > 0:
-                        continue
-
-                    # Check if fetcher is still running
-                    if not coordinator.is_fetcher_running():
-                        break
-
-                    logger.info("Waiting for more bugs from fetcher...")
-                    time.sleep(5)
-
-        coordinator.set_classifier_running(False)
+        with get_session() as session:
+            total_classified = BugClassifierService.classify_unclassified_bugs(session)
         logger.info(
             f"Classification task completed. Total classified: {total_classified} bug reports."
         )
         return total_classified
-
     except Exception as e:
         logger.error(f"Error in classification task: {e}")
-        if self.request.retries >= self.max_retries:
-            coordinator.set_classifier_running(False)
         raise self.retry(exc=e, countdown=30)
+    finally:
+        lease.release()
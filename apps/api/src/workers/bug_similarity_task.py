@@ -0,0 +1,23 @@
+from configuration.logger import get_logger
+from domain.config import get_session
+from services.bug_similarity_service import BugSimilarityService
+from workers.celery_app import celery_app
+
+
+@celery_app.task(bind=True, max_retries=5)
+def update_bug_similarities_task(self, bug_ids: list[int]):
+    """
+    Updates the stored similar bug lists after the vectorizer wrote the
+    vectors of `bug_ids`. Safe to retry, as their own lists are searched in
+    full again.
+    """
+    logger = get_logger()
+    try:
+        with get_session() as session:
+            updated_count = BugSimilarityService.update_similarities(session, bug_ids)
+            session.commit()
+    except Exception as e:
+        logger.error(f"Error updating similar bug lists: {e}")
+        raise self.retry(exc=e, countdown=30)
+    logger.info(f"Updated {updated_count} similar bug lists.")
+    return updated_count
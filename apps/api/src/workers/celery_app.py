@@ -1,3 +1,4 @@
+import gc
 import os
 import threading
 
@@ -5,20 +6,79 @@ from celery import Celery
 from celery.apps.beat import Beat
 from celery.apps.worker import Worker
 from celery.schedules import crontab
+from celery.signals import worker_init
 from configuration.logger import get_logger
 from utilities.constants import constants
+from utilities.response_cache import (
+    create_response_cache,
+    get_response_cache,
+    set_response_cache,
+)
 
-celery_app = Celery("tasks", broker=constants.REDIS_BROKER_URL.unicode_string())
+celery_app = Celery(
+    "tasks",
+    broker=constants.REDIS_BROKER_URL.unicode_string(),
+    # Only needed to join the chunk tasks of the parallel classifier in a
+    # chord, so results are ignored unless a task opts in
+    backend=constants.REDIS_BROKER_URL.unicode_string(),
+)
 
 celery_app.conf.update(
     task_serializer="json",
     timezone="UTC",
     enable_utc=True,
     worker_pool="solo" if os.name == "nt" else "prefork",
-    imports=["workers.issues_fetcher_task"],
+    imports=[
+        "workers.issues_fetcher_task",
+        "workers.ai_summary_task",
+        "workers.bug_similarity_task",
+    ],
+    task_ignore_result=True,
 )
 
 
+@worker_init.connect
+def preload_models(**_):
+    """
+    Loads the NLP models and the similarity index in the main worker
+    process, before the prefork pool forks its children, so that all
+    children share their pages copy-on-write instead of each loading their
+    own copy.
+
+    Skipped in development, where the worker runs inside the API process,
+    which loads the models lazily on first use.
+    """
+    if constants.IS_DEVELOPMENT:
+        return
+
+    from domain.config import get_session
+    from services.bug_classifier_service import BugClassifierService
+    from services.bug_similarity_service import BugSimilarityService
+    from utilities.nlp_models import NlpComponent, get_nlp_model
+
+    BugClassifierService.load()
+    get_nlp_model(NlpComponent.Vectorizer)
+    # Searched by the similar bug list updates, which any child may run
+    with get_session() as session:
+        BugSimilarityService.refresh(session)
+
+    # Move everything loaded so far out of the garbage collector's reach, so
+    # that collections in the children do not write to (and so copy) the
+    # shared pages
+    gc.freeze()
+
+
+@worker_init.connect
+def configure_worker_response_cache(**_):
+    """
+    Lets the workers invalidate the responses cached by the API after they
+    write, unless the worker runs inside the API process, which already has
+    a response cache.
+    """
+    if get_response_cache() is None:
+        set_response_cache(create_response_cache())
+
+
 def start_worker():
     logger = get_logger()
     try:
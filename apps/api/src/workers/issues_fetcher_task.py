@@ -1,37 +1,44 @@
-import time
-from datetime import datetime, timezone
+import asyncio
+from datetime import datetime
 
+import httpx
 from configuration.logger import get_logger
 from domain.config import get_session
-from domain.enums import PriorityLevel
+from domain.enums import AiSummaryEntity, PriorityLevel
 from domain.models.BugReport import (
     BugReport,
-    get_latest_bug_report_time,
-    save_bug_report,
+    get_latest_bug_report_update_time,
+    upsert_bug_reports,
 )
-from domain.models.DBMSSystem import get_dbms_systems
-from github import (
-    BadCredentialsException,
-    Github,
-    GithubException,
-    RateLimitExceededException,
+from domain.models.DBMSSystem import DBMSSystem, get_dbms_systems
+from domain.models.GitHubSyncCheckpoint import (
+    delete_github_sync_checkpoint,
+    get_github_sync_checkpoint,
+    save_github_sync_checkpoint,
 )
+from services.ai_summary_service import AiSummaryService
 from utilities.constants import constants
+from utilities.github_search import (
+    FixtureTransport,
+    GitHubAuthError,
+    SEARCH_RESULT_LIMIT,
+    GitHubSearchClient,
+    TokenBucket,
+)
+from utilities.redis_client import get_redis_client
+from utilities.response_cache import CacheNamespace, invalidate_responses
 from workers.bug_classifier_task import classify_bugs_task
 from workers.bug_vectorizer_task import vectorize_bugs_task
 from workers.celery_app import celery_app
-from workers.task_coordinator import TaskCoordinator
-
+from workers.task_coordinator import TaskCoordinator, TaskRole
 
-def get_github_client():
-    if not constants.GITHUB_TOKEN:
-        raise ValueError("GitHub Token not found!")
-    return Github(constants.GITHUB_TOKEN, per_page=100)
+# Redis hash of the ETag/Last-Modified of the last searches of each DBMS
+_VALIDATORS_KEY = "bug-track:github-validators:{dbms_id}"
 
 
 def build_github_query(
     repo: str,
-    latest_issue_time: datetime | None,
+    updated_since: datetime | None,
     label: str | None,
 ) -> str:
     base_query = f"repo:{repo} is:issue"
@@ -41,131 +48,255 @@ def build_github_query(
             base_query += " sqlancer"
     else:
         base_query += " sqlancer"
-    if latest_issue_time:
-        base_query += f" created:>{latest_issue_time.isoformat()}"
+    if updated_since:
+        # Inclusive, as issues updated in the same second as the last one
+        # stored may not have been fetched yet. Upserting them again is a
+        # no-op.
+        base_query += f" updated:>={updated_since.isoformat()}"
     return base_query
 
 
+def get_github_transport() -> httpx.AsyncBaseTransport | None:
+    """
+    Returns the transport for GitHub requests: the network by default, or
+    recorded fixtures if GITHUB_FIXTURE_DIR is set.
+    """
+    if not constants.GITHUB_FIXTURE_DIR:
+        return None
+    record_with = (
+        httpx.AsyncHTTPTransport() if constants.GITHUB_RECORD_FIXTURES else None
+    )
+    return FixtureTransport(constants.GITHUB_FIXTURE_DIR, record_with)
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _to_bug_report(dbms_id: int, issue: dict) -> BugReport:
+    return BugReport(
+        dbms_id=dbms_id,
+        title=issue["title"].strip(),
+        description=issue["body"].strip() if issue["body"] else "",
+        url=issue["html_url"],
+        issue_created_at=_parse_time(issue["created_at"]),
+        issue_updated_at=_parse_time(issue["updated_at"]),
+        issue_closed_at=_parse_time(issue["closed_at"]),
+        is_closed=issue["state"] == "closed",
+        priority=PriorityLevel.Unassigned,
+    )
+
+
+def _get_latest_issue_update_time(dbms_id: int) -> datetime | None:
+    with get_session() as session:
+        return get_latest_bug_report_update_time(session, dbms_id)
+
+
+def _get_checkpoint(dbms_id: int) -> tuple[str, int] | None:
+    with get_session() as session:
+        checkpoint = get_github_sync_checkpoint(session, dbms_id)
+        return (checkpoint.query, checkpoint.page) if checkpoint else None
+
+
+def _delete_checkpoint(dbms_id: int):
+    with get_session() as session:
+        delete_github_sync_checkpoint(session, dbms_id)
+
+
+def _store_page(dbms_id: int, query: str, page: int, issues: list[dict]) -> int:
+    """
+    Upserts a page of issues and checkpoints it, and hands the bug reports
+    that are new or whose content changed straight to the classifier and
+    vectorizer.
+
+    :return:
+        The number of bug reports handed over.
+    """
+    logger = get_logger()
+    bug_reports = [_to_bug_report(dbms_id, issue) for issue in issues]
+    with get_session() as session:
+        changed, failed = upsert_bug_reports(session, bug_reports)
+        save_github_sync_checkpoint(session, dbms_id, query, page)
+
+    for bug_report in failed:
+        logger.error(f"[DBMS {dbms_id}] Failed to save issue: {bug_report.title}")
+    changed_ids = [bug_report.id for bug_report in changed]
+    if changed_ids:
+        invalidate_responses(CacheNamespace.BugReports)
+        classify_bugs_task.delay(bug_ids=changed_ids)
+        vectorize_bugs_task.delay(bug_ids=changed_ids)
+    return len(changed_ids)
+
+
+def _save_validators(validators_key: str, validators: dict[str, str]):
+    with get_redis_client().pipeline() as pipe:
+        pipe.delete(validators_key)
+        if validators:
+            pipe.hset(validators_key, mapping=validators)
+        pipe.execute()
+
+
+async def fetch_repository_issues(
+    dbms: DBMSSystem,
+    limiter: TokenBucket,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> int:
+    """
+    Fetches and upserts the issues of a DBMS updated since the latest
+    update stored, which also covers new issues. Database writes run in a
+    thread, so that other repositories can be polled meanwhile.
+
+    Each stored page is checkpointed, so that a fetch that failed midway
+    resumes with the same query when retried. It restarts from the last
+    stored page rather than the one after, as issues updated meanwhile move
+    to the end of the results and shift later pages back. Upserting issues
+    that were already stored writes nothing.
+
+    GitHub serves at most 1000 results per search. A fetch that reaches
+    them stops there, and the next one continues from the latest update
+    stored by then.
+
+    The validators of the searches are only saved once all pages are
+    stored, so that a search whose issues failed to be stored is not
+    skipped as unchanged the next time.
+
+    :return:
+        The number of new or changed issues stored.
+    """
+    logger = get_logger()
+    redis = get_redis_client()
+    validators_key = _VALIDATORS_KEY.format(dbms_id=dbms.id)
+    # Redis calls block, so they run in a thread like the database calls
+    stored_validators = await asyncio.to_thread(redis.hgetall, validators_key)
+    validators = {
+        key.decode(): value.decode() for key, value in stored_validators.items()
+    }
+
+    checkpoint = await asyncio.to_thread(_get_checkpoint, dbms.id)
+    if checkpoint is not None:
+        query, page = checkpoint
+        logger.info(f"[DBMS {dbms.id}] Resuming from page {page} of query: {query}")
+    else:
+        updated_since = await asyncio.to_thread(_get_latest_issue_update_time, dbms.id)
+        query = build_github_query(dbms.repository, updated_since, dbms.label)
+        page = 1
+        logger.info(f"[DBMS {dbms.id}] Searching with query: {query}")
+
+    stored_count = 0
+    async with GitHubSearchClient(
+        constants.GITHUB_TOKEN, limiter, validators, transport
+    ) as client:
+        async for page, issues in client.iter_search_pages(query, page, sort="updated"):
+            if issues is None:
+                logger.info(f"[DBMS {dbms.id}] No changes since the last search.")
+            elif issues:
+                page_count = await asyncio.to_thread(
+                    _store_page, dbms.id, query, page, issues
+                )
+                stored_count += page_count
+                logger.info(
+                    f"[DBMS {dbms.id}] Stored {page_count} new or changed issues "
+                    f"from page {page}"
+                )
+        if issues is not None and len(issues) == client.per_page:
+            # Results are in ascending order of update, so searching again
+            # from the latest update stored picks up where this one stopped
+            logger.info(
+                f"[DBMS {dbms.id}] Reached the limit of {SEARCH_RESULT_LIMIT} "
+                "search results. The next fetch continues after them."
+            )
+        elif issues is not None:
+            logger.info(f"[DBMS {dbms.id}] No more updated issues.")
+        # Dropped even when stopped at the result limit, as resuming the same
+        # query would only ask for pages past it again
+        await asyncio.to_thread(_delete_checkpoint, dbms.id)
+
+        # Only keep the validators of this run's searches, as the query
+        # changes whenever updated issues are stored
+        requested = {key: validators[key] for key in client.requested_keys}
+        await asyncio.to_thread(_save_validators, validators_key, requested)
+    return stored_count
+
+
+async def fetch_all_issues(
+    dbms_systems: list[DBMSSystem],
+) -> list[int | BaseException]:
+    """
+    Fetches the issues of all DBMSes concurrently, sharing one rate limiter.
+
+    :return:
+        The number of new or changed issues stored per DBMS, or the error
+        that stopped its fetch.
+    """
+    rate = constants.GITHUB_SEARCH_REQUESTS_PER_MINUTE
+    limiter = TokenBucket(rate=rate / 60, capacity=rate)
+    transport = get_github_transport()
+    return await asyncio.gather(
+        *(fetch_repository_issues(dbms, limiter, transport) for dbms in dbms_systems),
+        return_exceptions=True,
+    )
+
+
 @celery_app.task(bind=True, max_retries=3)
 def fetch_github_issues_task(self):
     """Fetches new GitHub issues and stores them in the database."""
     logger = get_logger()
     coordinator = TaskCoordinator()
-    if coordinator.is_fetcher_running():
+    lease = coordinator.acquire_lease(TaskRole.Fetcher)
+    if lease is None:
         logger.info("Fetcher is already running. Exiting task.")
         return
-    coordinator.set_fetcher_running(True)
     logger.info("Starting fetch github issues task")
 
     try:
-        g = get_github_client()
+        return _fetch_github_issues(self)
+    finally:
+        lease.release()
+
+
+def _fetch_github_issues(task):
+    logger = get_logger()
+    if not constants.GITHUB_TOKEN:
+        logger.error("GitHub Token not found! Task will not retry.")
+        return
+    try:
         with get_session() as session:
             dbms_systems = get_dbms_systems(session)
-        if not dbms_systems:
-            logger.warning("No DBMS IDs found. Exiting task.")
-            coordinator.set_fetcher_running(False)
-            return
-    except BadCredentialsException:
-        logger.error("Invalid GitHub Token! Task will not retry.")
-        coordinator.set_fetcher_running(False)
-        return
     except Exception as e:
-        logger.exception(f"Failed to initialize GitHub client or load DBMS IDs: {e}")
-        coordinator.set_fetcher_running(False)
-        raise self.retry(exc=e, countdown=30)
-
-    total_issues_count = self.request.get("total_issues_count", 0)
-
-    for dbms in dbms_systems:
-        repo = dbms.repository
-        dbms_id = dbms.id
-        label = dbms.label
-
-        try:
-            with get_session() as session:
-                latest_issue_time = get_latest_bug_report_time(session, dbms_id)
-
-            query = build_github_query(repo, latest_issue_time, label)
-            logger.info(f"[DBMS {dbms_id}] Searching with query: {query}")
-            search_results = g.search_issues(query, sort="created", order="asc")
-
-            page = 0
-            while True:
-                with get_session() as session:
-                    page_issues = search_results.get_page(page)
-                    if not page_issues:
-                        logger.info(f"[DBMS {dbms_id}] No more new issues.")
-                        break
-
-                    for issue in page_issues:
-                        try:
-                            bug_report = BugReport(
-                                dbms_id=dbms_id,
-                                title=issue.title.strip(),
-                                description=issue.body.strip() if issue.body else "",
-                                url=issue.html_url,
-                                issue_created_at=issue.created_at.replace(
-                                    tzinfo=timezone.utc
-                                ),
-                                issue_updated_at=(
-                                    issue.updated_at.replace(tzinfo=timezone.utc)
-                                    if issue.updated_at
-                                    else None
-                                ),
-                                issue_closed_at=(
-                                    issue.closed_at.replace(tzinfo=timezone.utc)
-                                    if issue.closed_at
-                                    else None
-                                ),
-                                is_closed=issue.state == "closed",
-                                priority=PriorityLevel.Unassigned,
-                            )
-                            save_bug_report(session, bug_report)
-                            total_issues_count += 1
-                            self.update_state(
-                                state={"total_issues_count": total_issues_count}
-                            )
-                            logger.info(
-                                f"[DBMS {dbms_id}] Stored issue: {issue.title} (ID: {bug_report.id})"
-                            )
-                        except Exception as save_error:
-                            logger.exception(
-                                f"[DBMS {dbms_id}] Failed to save issue: {issue.title} - {save_error}. Retrying in 30s..."
-                            )
-                            raise self.retry(exc=save_error, countdown=30)
-
-                if not coordinator.is_classifier_running():
-                    classify_bugs_task.delay()
-                if not coordinator.is_vectorizer_running():
-                    vectorize_bugs_task.delay()
-                page += 1
-                time.sleep(2)
-
-        except RateLimitExceededException:
-            reset_time = g.get_rate_limit().search.reset
-            wait_time = max(
-                (reset_time - datetime.now(timezone.utc)).total_seconds(), 1
-            )
-            logger.warning(
-                f"[DBMS {dbms_id}] Rate limit exceeded. Will retry at {reset_time.strftime('%Y-%m-%d %H:%M:%S %Z')} "
-                f"(in {int(wait_time)} seconds)."
-            )
-            raise self.retry(countdown=wait_time)
-
-        except GithubException as e:
-            logger.error(f"[DBMS {dbms_id}] GitHub API error: {e}. Retrying in 60s...")
-            raise self.retry(exc=e, countdown=60)
+        logger.exception(f"Failed to load DBMS IDs: {e}")
+        raise task.retry(exc=e, countdown=30)
+    if not dbms_systems:
+        logger.warning("No DBMS IDs found. Exiting task.")
+        return
 
-        except Exception as e:
-            logger.exception(
-                f"[DBMS {dbms_id}] Unexpected error: {e}. Retrying in 30s..."
-            )
-            raise self.retry(exc=e, countdown=30)
+    results = asyncio.run(fetch_all_issues(dbms_systems))
 
-        finally:
-            coordinator.set_fetcher_running(False)
+    total_issues_count = 0
+    failed_count = 0
+    for dbms, result in zip(dbms_systems, results):
+        if isinstance(result, GitHubAuthError):
+            logger.error("Invalid GitHub Token! Task will not retry.")
+            return total_issues_count
+        if isinstance(result, BaseException):
+            logger.error(f"[DBMS {dbms.id}] Failed to fetch issues: {result}")
+            failed_count += 1
+        else:
+            total_issues_count += result
+            if result:
+                # Through the service, so that a generation already queued for
+                # the DBMS is not queued again
+                AiSummaryService.request_summary(AiSummaryEntity.Dbms, dbms.id)
 
     logger.info(
-        f"Finished fetching issues. Total new issues stored: {total_issues_count}."
+        f"Finished fetching issues. Total new or changed issues stored: "
+        f"{total_issues_count}."
     )
+    # Sweep up bugs whose own classify/vectorize task failed. The sweeps skip
+    # rows claimed by the per-page tasks that are still running
+    classify_bugs_task.delay()
+    vectorize_bugs_task.delay()
+
+    if failed_count:
+        # Repositories that were fetched in full answer 304 on the retry
+        raise task.retry(countdown=60)
     return total_issues_count
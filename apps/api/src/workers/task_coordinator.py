@@ -1,44 +1,156 @@
 import threading
+import uuid
+from enum import Enum
+
+from redis import Redis, WatchError
+from utilities.constants import constants
+from utilities.redis_client import get_redis_client
+
+_KEY_PREFIX = "bug-track:coordinator"
+
+
+class TaskRole(str, Enum):
+    Fetcher = "fetcher"
+    Classifier = "classifier"
+    Vectorizer = "vectorizer"
+
+
+class Lease:
+    """
+    Exclusive claim on a task role, held in Redis under a TTL so that it
+    expires on its own if the worker holding it dies.
+
+    A background thread renews the TTL every third of the lease period for
+    as long as the lease is held. The token identifies the holder, so that
+    the lease can also be renewed or released from another task, such as
+    the chunks of a parallel classification.
+    """
+
+    def __init__(self, coordinator: "TaskCoordinator", role: TaskRole, token: str):
+        self.coordinator = coordinator
+        self.role = role
+        self.token = token
+        self._stopped = threading.Event()
+        self._heartbeat: threading.Thread | None = None
+
+    def start_heartbeat(self):
+        self._heartbeat = threading.Thread(target=self._renew_until_stopped)
+        self._heartbeat.daemon = True
+        self._heartbeat.start()
+
+    def _renew_until_stopped(self):
+        interval = self.coordinator.lease_seconds / 3
+        while not self._stopped.wait(interval):
+            if not self.coordinator.renew_lease(self.role, self.token):
+                return
+
+    def stop_heartbeat(self):
+        """Stops renewing the lease, leaving it to expire or be released."""
+        self._stopped.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+
+    def release(self):
+        self.stop_heartbeat()
+        self.coordinator.release_lease(self.role, self.token)
 
 
 class TaskCoordinator:
     """
-    Simple coordinator class to manage shared state between Celery tasks.
-    Uses a singleton pattern to ensure consistent state across imports.
+    Coordinates the fetcher, classifier and vectorizer tasks across all
+    worker processes through Redis.
+
+    Each role can be held by one task at a time through a leased lock.
     """
 
-    _instance = None
-    _lock = threading.Lock()
-
-    def __new__(cls):
-        with cls._lock:
-            if cls._instance is None:
-                cls._instance = super(TaskCoordinator, cls).__new__(cls)
-                cls._instance._fetcher_running = False
-                cls._instance._classifier_running = False
-                cls._instance._vectorizer_running = False
-            return cls._instance
-
-    def set_fetcher_running(self, value):
-        """Set the fetcher running state."""
-        self._fetcher_running = value
-
-    def is_fetcher_running(self):
-        """Check if the fetcher is currently running."""
-        return self._fetcher_running
-
-    def set_classifier_running(self, value):
-        """Set the classifier running state."""
-        self._classifier_running = value
-
-    def is_classifier_running(self):
-        """Check if the classifier is already running."""
-        return self._classifier_running
-
-    def set_vectorizer_running(self, value):
-        """Set the vectorizer running state."""
-        self._vectorizer_running = value
-
-    def is_vectorizer_running(self):
-        """Check if the vectorizer is already running."""
-        return self._vectorizer_running
+    def __init__(self, client: Redis | None = None, lease_seconds: int | None = None):
+        self.client = client or get_redis_client()
+        self.lease_seconds = lease_seconds or constants.COORDINATOR_LEASE_SECONDS
+
+    def _get_key(self, role: TaskRole) -> str:
+        return f"{_KEY_PREFIX}:lease:{role.value}"
+
+    def acquire_lease(self, role: TaskRole, heartbeat: bool = True) -> Lease | None:
+        """
+        Claims a role for the calling task.
+
+        :param heartbeat:
+            Whether to keep renewing the lease from a background thread until
+            it is released.
+        :return:
+            The lease, or None if another task holds the role.
+        """
+        token = uuid.uuid4().hex
+        acquired = self.client.set(
+            self._get_key(role), token, nx=True, px=self.lease_seconds * 1000
+        )
+        if not acquired:
+            return None
+        lease = Lease(self, role, token)
+        if heartbeat:
+            lease.start_heartbeat()
+        return lease
+
+    def resume_lease(
+        self, role: TaskRole, token: str, heartbeat: bool = True
+    ) -> Lease | None:
+        """
+        Takes over a lease acquired by another task under `token`, such as
+        the lease of a parallel classification in one of its chunks. The
+        lease is taken again if it expired while nobody else claimed the
+        role. Releasing the returned lease is left to its original holder;
+        stop its heartbeat instead.
+
+        :return:
+            The lease, or None if another task holds the role.
+        """
+        if not self.renew_lease(role, token):
+            acquired = self.client.set(
+                self._get_key(role), token, nx=True, px=self.lease_seconds * 1000
+            )
+            if not acquired:
+                return None
+        lease = Lease(self, role, token)
+        if heartbeat:
+            lease.start_heartbeat()
+        return lease
+
+    def _update_if_held(self, role: TaskRole, token: str, update) -> bool:
+        key = self._get_key(role)
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                if pipe.get(key) != token.encode():
+                    return False
+                pipe.multi()
+                update(pipe, key)
+                pipe.execute()
+                return True
+            except WatchError:
+                # The lease changed hands or expired in the meantime
+                return False
+
+    def renew_lease(self, role: TaskRole, token: str) -> bool:
+        """
+        Resets the TTL of a lease.
+
+        :return:
+            Whether the lease was still held by `token`.
+        """
+        return self._update_if_held(
+            role, token, lambda pipe, key: pipe.pexpire(key, self.lease_seconds * 1000)
+        )
+
+    def release_lease(self, role: TaskRole, token: str) -> bool:
+        """
+        Releases a lease.
+
+        :return:
+            Whether the lease was still held by `token`.
+        """
+        return self._update_if_held(role, token, lambda pipe, key: pipe.delete(key))
+
+    def is_running(self, role: TaskRole) -> bool:
+        """Checks if any task currently holds the role."""
+        return self.client.exists(self._get_key(role)) > 0
@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from domain.helpers.cursor import SearchCursor, decode_cursor, encode_cursor
+
+
+def test_roundtrip():
+    created_at = datetime(2025, 3, 1, 12, 30, 5, 123456, tzinfo=timezone.utc)
+    for cursor in [
+        SearchCursor(created_at=created_at, id=42),
+        SearchCursor(created_at=created_at, id=42, rank=0.0607927),
+        SearchCursor(
+            created_at=created_at.astimezone(timezone(timedelta(hours=8))), id=1
+        ),
+    ]:
+        token = encode_cursor(cursor)
+        assert "=" not in token
+        assert decode_cursor(token) == cursor
+
+
+@pytest.mark.parametrize(
+    "token", ["", "not a cursor", "W10", "eyJjIjoiMjAyNSJ9", "e30"]
+)
+def test_decode_rejects_invalid_tokens(token: str):
+    with pytest.raises(ValueError):
+        decode_cursor(token)
@@ -0,0 +1,12 @@
+from domain.helpers.search import build_prefix_tsquery
+
+
+def test_build_prefix_tsquery():
+    assert build_prefix_tsquery("Segmentation fault") == "segmentation:* & fault:*"
+
+
+def test_build_prefix_tsquery_drops_operators():
+    assert build_prefix_tsquery("crash & (join | !view):*") == (
+        "crash:* & join:* & view:*"
+    )
+    assert build_prefix_tsquery("&|!") is None
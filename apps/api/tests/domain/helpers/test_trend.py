@@ -0,0 +1,30 @@
+from datetime import date
+
+from domain.enums import TrendGranularity
+from domain.helpers.trend import get_bucket_starts, truncate_to_bucket
+
+
+def test_truncate_to_bucket():
+    # 2025-03-13 is a Thursday
+    day = date(2025, 3, 13)
+    assert truncate_to_bucket(day, TrendGranularity.Day) == day
+    assert truncate_to_bucket(day, TrendGranularity.Week) == date(2025, 3, 10)
+    assert truncate_to_bucket(day, TrendGranularity.Month) == date(2025, 3, 1)
+
+
+def test_get_bucket_starts():
+    today = date(2025, 3, 1)
+    assert get_bucket_starts(today, 3, TrendGranularity.Day) == [
+        date(2025, 2, 27),
+        date(2025, 2, 28),
+        date(2025, 3, 1),
+    ]
+    assert get_bucket_starts(today, 2, TrendGranularity.Week) == [
+        date(2025, 2, 17),
+        date(2025, 2, 24),
+    ]
+    assert get_bucket_starts(today, 3, TrendGranularity.Month) == [
+        date(2025, 1, 1),
+        date(2025, 2, 1),
+        date(2025, 3, 1),
+    ]
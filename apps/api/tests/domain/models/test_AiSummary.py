@@ -0,0 +1,34 @@
+import pytest
+from domain.enums import AiSummaryEntity
+from domain.models.AiSummary import (
+    AiSummary,
+    get_ai_summary,
+    get_latest_ai_summary,
+    save_ai_summary,
+)
+from sqlmodel import select
+from utilities.testing import create_test_database
+
+
+@pytest.fixture(name="tx")
+def session():
+    generate_session = create_test_database()
+    return generate_session()
+
+
+def test_save_ai_summary_replaces_superseded_summaries(tx):
+    bug = AiSummaryEntity.BugReport
+    save_ai_summary(tx, bug, 1, 1, "a", "First")
+    save_ai_summary(tx, bug, 2, 1, "a", "Other bug")
+    assert get_ai_summary(tx, bug, 1, 1, "a").summary == "First"
+    assert get_ai_summary(tx, bug, 1, 1, "b") is None
+    assert get_ai_summary(tx, AiSummaryEntity.Dbms, 1, 1, "a") is None
+
+    save_ai_summary(tx, bug, 1, 1, "b", "Second")
+    assert get_ai_summary(tx, bug, 1, 1, "a") is None
+    assert get_latest_ai_summary(tx, bug, 1, 1).summary == "Second"
+    assert get_latest_ai_summary(tx, bug, 1, 2) is None
+
+    save_ai_summary(tx, bug, 1, 1, "b", "Second, again")
+    summaries = tx.exec(select(AiSummary).order_by(AiSummary.entity_id)).all()
+    assert [s.summary for s in summaries] == ["Second, again", "Other bug"]
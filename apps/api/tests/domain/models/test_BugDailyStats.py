@@ -0,0 +1,137 @@
+from collections import Counter
+from datetime import date, datetime, timezone
+from itertools import count
+
+import pytest
+from domain.enums import TrendGranularity
+from domain.helpers.trend import get_trend_day
+from domain.models.BugCategory import BugCategory
+from domain.models.BugDailyStats import (
+    BugDailyStats,
+    get_bug_category_counts_on_day,
+    get_bug_count_on_day,
+    get_bug_trend_by_category_from_daily_stats,
+    get_bug_trend_from_daily_stats,
+    increment_bug_daily_stats,
+)
+from domain.models.BugReport import (
+    BugReport,
+    classify_bug_reports,
+    delete_bug_report,
+    insert_bug_reports,
+    rebuild_bug_daily_stats,
+    update_bug_category,
+    upsert_bug_reports,
+)
+from domain.models.DBMSSystem import DBMSSystem
+from sqlmodel import Session, select
+from utilities.testing import create_test_database
+
+# Bug reports are unique per URL
+issue_numbers = count(1)
+
+
+@pytest.fixture(name="tx")
+def session():
+    generate_session = create_test_database()
+    tx = generate_session()
+    tx.add(DBMSSystem(id=1, name="MySQL", repository="mysql/mysql-server"))
+    tx.add(BugCategory(id=0, name="Crash / Segmentation Fault"))
+    tx.add(BugCategory(id=1, name="Assertion Failure"))
+    tx.commit()
+    return tx
+
+
+def make_bug_report(title: str) -> BugReport:
+    return BugReport(
+        dbms_id=1,
+        title=title,
+        url=f"https://github.com/mysql/mysql-server/issues/{next(issue_numbers)}",
+        issue_created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def get_stats(tx: Session) -> dict:
+    return {
+        (s.dbms_id, s.category_id, s.day): s.count
+        for s in tx.exec(select(BugDailyStats)).all()
+        if s.count != 0
+    }
+
+
+def test_insert_and_classify_update_daily_stats(tx: Session):
+    bug_reports = [make_bug_report(f"Bug {i}") for i in range(3)]
+    insert_bug_reports(tx, bug_reports, batch_size=2)
+    day = get_trend_day(bug_reports[0].created_at)
+    assert get_bug_count_on_day(tx, 1, day) == 3
+    assert get_bug_category_counts_on_day(tx, 1, day) == []
+
+    failed = classify_bug_reports(
+        tx, [(bug_reports[0], 0), (bug_reports[1], 1)], batch_size=10
+    )
+    assert failed == []
+    assert get_bug_count_on_day(tx, 1, day) == 3
+    assert [tuple(c) for c in get_bug_category_counts_on_day(tx, 1, day)] == [
+        (0, "Crash / Segmentation Fault", 1),
+        (1, "Assertion Failure", 1),
+    ]
+
+    update_bug_category(tx, bug_reports[1].id, 0)
+    delete_bug_report(tx, bug_reports[2].id)
+    assert get_stats(tx) == {(1, 0, day): 2}
+
+
+def test_rebuild_matches_incremental_stats(tx: Session):
+    bug_reports = [make_bug_report(f"Bug {i}") for i in range(4)]
+    insert_bug_reports(tx, bug_reports, batch_size=10)
+    classify_bug_reports(tx, [(bug_reports[0], 1)], batch_size=10)
+    incremental = get_stats(tx)
+
+    increment_bug_daily_stats(tx, Counter({(1, 0, date(2020, 1, 1)): 5}))
+    tx.commit()
+    assert rebuild_bug_daily_stats(tx, batch_size=2) == 4
+    assert get_stats(tx) == incremental
+
+
+def test_trend_from_daily_stats(tx: Session):
+    increment_bug_daily_stats(
+        tx,
+        Counter(
+            {
+                (1, 0, date(2025, 2, 20)): 4,
+                (1, 0, date(2025, 3, 2)): 1,
+                (1, 1, date(2025, 3, 3)): 2,
+                (1, -1, date(2025, 3, 3)): 1,
+            }
+        ),
+    )
+    tx.commit()
+
+    today = date(2025, 3, 4)
+    assert get_bug_trend_from_daily_stats(tx, 1, 4, today) == [4, 5, 8, 8]
+    assert get_bug_trend_by_category_from_daily_stats(tx, 1, 4, today) == {
+        0: [4, 5, 5, 5],
+        1: [0, 0, 2, 2],
+        None: [0, 0, 1, 1],
+    }
+    monthly = get_bug_trend_from_daily_stats(tx, 1, 2, today, TrendGranularity.Month)
+    assert monthly == [4, 8]
+    assert get_bug_trend_from_daily_stats(tx, 2, 3, today) == [0, 0, 0]
+
+
+def test_upsert_keeps_daily_stats_in_sync(tx: Session):
+    bug_reports = [make_bug_report(f"Bug {i}") for i in range(2)]
+    insert_bug_reports(tx, bug_reports, batch_size=10)
+    classify_bug_reports(tx, [(br, 0) for br in bug_reports], batch_size=10)
+
+    edited = BugReport(
+        **bug_reports[0].model_dump(exclude={"id", "created_at", "updated_at"}),
+    )
+    edited.title = "Bug 0 (edited)"
+    upsert_bug_reports(tx, [edited, make_bug_report("New bug")], batch_size=10)
+    day = get_trend_day(bug_reports[0].created_at)
+    assert get_stats(tx) == {(1, 0, day): 1, (1, -1, day): 2}
+
+    incremental = get_stats(tx)
+    rebuild_bug_daily_stats(tx, batch_size=10)
+    assert get_stats(tx) == incremental
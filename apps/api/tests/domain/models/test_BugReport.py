@@ -0,0 +1,316 @@
+from datetime import datetime, timezone
+from itertools import count
+
+import pytest
+from domain.enums import SearchMode
+from domain.helpers.cursor import SearchCursor
+from domain.models.BugCategory import BugCategory
+from domain.models.BugReport import (
+    BUG_REPORT_KEY_INDEX,
+    BugReport,
+    _build_update_by_id,
+    get_bug_category_counts_by_dbms_id,
+    get_bug_report_by_id,
+    get_bug_report_by_search_and_cat,
+    get_bug_reports,
+    get_unclassified_bug_ids,
+    get_unclassified_bugs_by_ids,
+    get_unvectorized_bugs_by_ids,
+    insert_bug_reports,
+    iter_unclassified_bug_batches,
+    iter_unvectorized_bug_batches,
+    merge_duplicate_bug_reports,
+    update_bug_reports,
+    upsert_bug_reports,
+)
+from domain.models.DBMSSystem import DBMSSystem
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session
+from utilities.testing import create_test_database
+
+# Bug reports are unique per URL
+issue_numbers = count(1)
+
+
+@pytest.fixture(name="tx")
+def session():
+    generate_session = create_test_database()
+    tx = generate_session()
+    tx.add(DBMSSystem(id=1, name="MySQL", repository="mysql/mysql-server"))
+    tx.add(BugCategory(id=0, name="Crash / Segmentation Fault"))
+    tx.add(BugCategory(id=1, name="Assertion Failure"))
+    tx.commit()
+    return tx
+
+
+def make_bug_report(title: str | None = "Test Bug Report") -> BugReport:
+    return BugReport(
+        dbms_id=1,
+        title=title,
+        description="This is a bug report",
+        url=f"https://github.com/mysql/mysql-server/issues/{next(issue_numbers)}",
+        issue_created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def fetch_again(bug_report: BugReport, **changes) -> BugReport:
+    """The same issue as `bug_report`, as fetched from GitHub again."""
+    values = bug_report.model_dump(
+        exclude={"id", "created_at", "updated_at", "category_id", "vector"}
+    )
+    return BugReport(**(values | changes))
+
+
+def test_insert_bug_reports(tx: Session):
+    bug_reports = [make_bug_report(f"Bug {i}") for i in range(5)]
+    failed = insert_bug_reports(tx, bug_reports, batch_size=2)
+    assert failed == []
+    assert all(br.id is not None for br in bug_reports)
+    assert len(get_bug_reports(tx)) == 5
+    for br in bug_reports:
+        saved = get_bug_report_by_id(tx, br.id)
+        assert saved.title == br.title
+        assert saved.created_at is not None
+
+
+def test_insert_bug_reports_retries_rows_of_failed_batch(tx: Session):
+    # A missing title violates the NOT NULL constraint
+    bad_report = make_bug_report(None)
+    bug_reports = [make_bug_report("Bug 1"), bad_report, make_bug_report("Bug 2")]
+    failed = insert_bug_reports(tx, bug_reports, batch_size=3)
+    assert failed == [bad_report]
+    titles = sorted(br.title for br in get_bug_reports(tx))
+    assert titles == ["Bug 1", "Bug 2"]
+
+
+def test_update_bug_reports(tx: Session):
+    bug_reports = [make_bug_report(f"Bug {i}") for i in range(3)]
+    insert_bug_reports(tx, bug_reports, batch_size=3)
+    failed = update_bug_reports(
+        tx,
+        [{"id": br.id, "category_id": 0, "vector": b"vector"} for br in bug_reports],
+        batch_size=2,
+    )
+    assert failed == []
+    for br in bug_reports:
+        saved = get_bug_report_by_id(tx, br.id)
+        tx.refresh(saved)
+        assert saved.category_id == 0
+        assert saved.vector == b"vector"
+
+
+def test_get_unclassified_bugs_by_ids(tx: Session):
+    bug_reports = [make_bug_report(f"Bug {i}") for i in range(4)]
+    bug_reports[1].category_id = 0
+    insert_bug_reports(tx, bug_reports, batch_size=10)
+    ids = [br.id for br in bug_reports]
+
+    assert get_unclassified_bug_ids(tx) == [ids[0], ids[2], ids[3]]
+    # Bugs classified after the ids were read are skipped
+    bugs = get_unclassified_bugs_by_ids(tx, ids[:3])
+    assert [br.id for br in bugs] == [ids[0], ids[2]]
+
+
+def test_get_unvectorized_bugs_by_ids(tx: Session):
+    bug_reports = [make_bug_report(f"Bug {i}") for i in range(3)]
+    bug_reports[0].vector = b"vector"
+    insert_bug_reports(tx, bug_reports, batch_size=10)
+    ids = [br.id for br in bug_reports]
+
+    bugs = get_unvectorized_bugs_by_ids(tx, ids)
+    assert [tuple(bug) for bug in bugs] == [
+        (br.id, 1, br.title, "This is a bug report") for br in bug_reports[1:]
+    ]
+
+
+def test_get_bug_category_counts_by_dbms_id(tx: Session):
+    tx.add(DBMSSystem(id=2, name="SQLite", repository="sqlite/sqlite"))
+    bug_reports = [make_bug_report(f"Bug {i}") for i in range(6)]
+    # Category 0 twice, category 1 three times, one unclassified
+    for br, category_id in zip(bug_reports, [0, 1, 0, 1, 1, None]):
+        br.category_id = category_id
+    other_dbms_report = make_bug_report("Other DBMS")
+    other_dbms_report.dbms_id = 2
+    other_dbms_report.category_id = 0
+    insert_bug_reports(tx, bug_reports + [other_dbms_report], batch_size=10)
+
+    counts = get_bug_category_counts_by_dbms_id(tx, 1)
+    assert [(c.id, c.name, c.count) for c in counts] == [
+        (0, "Crash / Segmentation Fault", 2),
+        (1, "Assertion Failure", 3),
+    ]
+    assert get_bug_category_counts_by_dbms_id(tx, 3) == []
+
+
+def test_get_bug_report_by_search_and_cat_substring(tx: Session):
+    bug_reports = [
+        make_bug_report(title)
+        for title in ["Crash in JOIN", "Wrong result", "join hangs", "Other join"]
+    ]
+    for br, category_id in zip(bug_reports, [0, 0, 1, None]):
+        br.category_id = category_id
+    insert_bug_reports(tx, bug_reports, batch_size=10)
+
+    rows = get_bug_report_by_search_and_cat(
+        tx, 1, "join", [0, 1], 10, mode=SearchMode.Substring
+    )
+    assert sorted(br.title for br, _ in rows) == ["Crash in JOIN", "join hangs"]
+    assert all(rank is None for _, rank in rows)
+    rows = get_bug_report_by_search_and_cat(tx, 1, "", [0], 10)
+    assert sorted(br.title for br, _ in rows) == ["Crash in JOIN", "Wrong result"]
+
+
+@pytest.fixture
+def timeline(tx: Session) -> list[BugReport]:
+    """Bug reports newest first, with two pairs created at the same time."""
+    created_ats = [
+        datetime(2025, 1, day, tzinfo=timezone.utc) for day in (5, 5, 4, 3, 3)
+    ]
+    bug_reports = []
+    for i, created_at in enumerate(created_ats):
+        br = make_bug_report(f"Bug {i}")
+        br.id = 10 - i
+        br.category_id = i % 2
+        br.created_at = created_at
+        tx.add(br)
+        bug_reports.append(br)
+    tx.commit()
+    return bug_reports
+
+
+def test_get_bug_report_by_search_and_cat_keyset(tx: Session, timeline):
+    pages = []
+    after = None
+    while True:
+        rows = get_bug_report_by_search_and_cat(tx, 1, None, [0, 1], 2, after)
+        if not rows:
+            break
+        pages.append([br.id for br, _ in rows])
+        last = rows[-1][0]
+        after = SearchCursor(created_at=last.created_at, id=last.id)
+    assert pages == [[10, 9], [8, 7], [6]]
+
+
+def test_get_bug_report_by_search_and_cat_per_category(tx: Session, timeline):
+    rows = get_bug_report_by_search_and_cat(tx, 1, None, [0, 1], 2, per_category=True)
+    assert [(br.category_id, br.id) for br, _ in rows] == [
+        (0, 10),
+        (0, 8),
+        (1, 9),
+        (1, 7),
+    ]
+
+
+def test_get_bug_report_by_search_and_cat_rejects_ranked_cursor(tx: Session):
+    after = SearchCursor(created_at=datetime.now(timezone.utc), id=1, rank=0.5)
+    with pytest.raises(ValueError):
+        get_bug_report_by_search_and_cat(tx, 1, None, [0], 2, after)
+
+
+def test_iter_unclassified_bug_batches(tx: Session):
+    bug_reports = [make_bug_report(f"Bug {i}") for i in range(5)]
+    insert_bug_reports(tx, bug_reports, batch_size=5)
+    ids = [br.id for br in bug_reports]
+    update_bug_reports(tx, [{"id": ids[1], "category_id": 0}], batch_size=1)
+
+    batches = []
+    for batch in iter_unclassified_bug_batches(tx, batch_size=2):
+        batches.append([(bug.id, bug.title) for bug in batch])
+        # Classifying a batch while iterating does not shift the next one
+        classified = [{"id": bug.id, "category_id": 1} for bug in batch]
+        update_bug_reports(tx, classified, batch_size=2)
+    assert batches == [
+        [(ids[0], "Bug 0"), (ids[2], "Bug 2")],
+        [(ids[3], "Bug 3"), (ids[4], "Bug 4")],
+    ]
+    assert list(iter_unclassified_bug_batches(tx, batch_size=2)) == []
+
+
+def test_iter_unvectorized_bug_batches(tx: Session):
+    bug_reports = [make_bug_report(f"Bug {i}") for i in range(3)]
+    insert_bug_reports(tx, bug_reports, batch_size=3)
+    vectorized = [{"id": bug_reports[0].id, "vector": b"vector"}]
+    update_bug_reports(tx, vectorized, batch_size=1)
+
+    batches = list(iter_unvectorized_bug_batches(tx, batch_size=5))
+    assert len(batches) == 1
+    assert [tuple(bug) for bug in batches[0]] == [
+        (br.id, 1, br.title, "This is a bug report") for br in bug_reports[1:]
+    ]
+
+
+def test_upsert_bug_reports(tx: Session):
+    bug_reports = [make_bug_report(f"Bug {i}") for i in range(3)]
+    insert_bug_reports(tx, bug_reports, batch_size=3)
+    ids = [br.id for br in bug_reports]
+    classified = [{"id": id, "category_id": 0, "vector": b"vector"} for id in ids]
+    update_bug_reports(tx, classified, batch_size=3)
+
+    closed_at = datetime(2025, 2, 1, tzinfo=timezone.utc)
+    fetched = [
+        fetch_again(bug_reports[0], is_closed=True, issue_closed_at=closed_at),
+        fetch_again(bug_reports[1], title="Bug 1 (edited)"),
+        fetch_again(bug_reports[2]),
+        make_bug_report("New bug"),
+    ]
+    changed, failed = upsert_bug_reports(tx, fetched, batch_size=10)
+    assert failed == []
+    assert [br.title for br in changed] == ["Bug 1 (edited)", "New bug"]
+    assert [br.id for br in fetched[:3]] == ids
+    assert len(get_bug_reports(tx)) == 4
+
+    saved = [get_bug_report_by_id(tx, id) for id in ids]
+    for br in saved:
+        tx.refresh(br)
+    # Closing an issue keeps its classification
+    assert saved[0].is_closed and saved[0].issue_closed_at is not None
+    assert (saved[0].category_id, saved[0].vector) == (0, b"vector")
+    # Editing it queues it to be classified and vectorized again
+    assert (saved[1].title, saved[1].category_id, saved[1].vector) == (
+        "Bug 1 (edited)",
+        None,
+        None,
+    )
+    assert (saved[2].category_id, saved[2].vector) == (0, b"vector")
+
+
+def test_upserting_unchanged_bug_reports_writes_nothing(tx: Session):
+    bug_reports = [make_bug_report(f"Bug {i}") for i in range(2)]
+    upsert_bug_reports(tx, bug_reports, batch_size=10)
+    last_written = datetime(2000, 1, 1, tzinfo=timezone.utc)
+    update_bug_reports(
+        tx, [{"id": br.id, "updated_at": last_written} for br in bug_reports], 10
+    )
+
+    # A retried fetch stores the same page again
+    fetched = [fetch_again(br) for br in bug_reports]
+    changed, failed = upsert_bug_reports(tx, fetched, batch_size=10)
+    assert (changed, failed) == ([], [])
+    assert [br.id for br in fetched] == [br.id for br in bug_reports]
+    for br in bug_reports:
+        saved = get_bug_report_by_id(tx, br.id)
+        tx.refresh(saved)
+        assert saved.updated_at.year == 2000
+
+
+def test_merge_duplicate_bug_reports(tx: Session):
+    # Duplicates stored before the unique index existed
+    BUG_REPORT_KEY_INDEX.drop(tx.get_bind())
+    bug_report = make_bug_report("Bug")
+    duplicates = [fetch_again(bug_report) for _ in range(2)]
+    insert_bug_reports(tx, [bug_report, *duplicates, make_bug_report()], 10)
+
+    assert merge_duplicate_bug_reports(tx, batch_size=10) == 2
+    assert merge_duplicate_bug_reports(tx, batch_size=10) == 0
+    remaining = sorted(br.id for br in get_bug_reports(tx))
+    assert len(remaining) == 2 and remaining[0] == bug_report.id
+
+
+def test_build_update_by_id_is_one_statement():
+    statement = _build_update_by_id(
+        [{"id": 1, "category_id": 0}, {"id": 2, "category_id": None}]
+    )
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert sql.count("UPDATE") == 1
+    assert "FROM (VALUES" in sql
+    assert "CAST(new_values.category_id AS INTEGER)" in sql
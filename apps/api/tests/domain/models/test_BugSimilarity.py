@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+import pytest
+from domain.models.BugCategory import BugCategory
+from domain.models.BugReport import (
+    BugReport,
+    delete_bug_report,
+    get_precomputed_similar_bug_reports,
+)
+from domain.models.BugSimilarity import (
+    delete_bug_similarities,
+    get_bug_ids_listing_neighbors,
+    get_bug_similarity_lists,
+    get_min_full_list_score,
+    replace_bug_similarity_lists,
+)
+from domain.models.DBMSSystem import DBMSSystem
+from sqlmodel import Session
+from utilities.testing import create_test_database
+
+
+@pytest.fixture(name="tx")
+def session():
+    generate_session = create_test_database()
+    tx = generate_session()
+    tx.add(DBMSSystem(id=1, name="MySQL", repository="mysql/mysql-server"))
+    tx.add(BugCategory(id=0, name="Crash / Segmentation Fault"))
+    for id in range(1, 5):
+        tx.add(
+            BugReport(
+                id=id,
+                dbms_id=1,
+                category_id=0,
+                title=f"Bug {id}",
+                url=f"https://github.com/mysql/mysql-server/issues/{id}",
+                issue_created_at=datetime(2025, 1, id, tzinfo=timezone.utc),
+            )
+        )
+    tx.commit()
+    return tx
+
+
+def test_replace_lists(tx: Session):
+    replace_bug_similarity_lists(tx, {1: [(2, 0.9), (3, 0.5)], 2: [(1, 0.9)]})
+    replace_bug_similarity_lists(tx, {1: [(3, 0.8), (4, 0.7)]})
+    tx.commit()
+
+    assert get_bug_similarity_lists(tx, [1, 2, 3]) == {
+        1: [(3, 0.8), (4, 0.7)],
+        2: [(1, 0.9)],
+    }
+    assert get_bug_ids_listing_neighbors(tx, [1, 4]) == {1, 2}
+    assert [br.id for br in get_precomputed_similar_bug_reports(tx, 1, 1)] == [3]
+
+
+def test_min_full_list_score(tx: Session):
+    assert get_min_full_list_score(tx, 2) is None
+
+    replace_bug_similarity_lists(tx, {1: [(2, 0.9), (3, 0.5)], 2: [(1, 0.9)]})
+    assert get_min_full_list_score(tx, 2) == float("-inf")
+
+    replace_bug_similarity_lists(tx, {2: [(1, 0.9), (4, 0.6)]})
+    assert get_min_full_list_score(tx, 2) == 0.5
+
+
+def test_deleted_bug_reports_are_removed_from_lists(tx: Session):
+    replace_bug_similarity_lists(
+        tx, {1: [(2, 0.9), (3, 0.5)], 2: [(1, 0.9)], 3: [(4, 0.2)]}
+    )
+    tx.commit()
+
+    delete_bug_similarities(tx, [4])
+    delete_bug_report(tx, 2)
+
+    assert get_bug_similarity_lists(tx, [1, 2, 3]) == {1: [(3, 0.5)]}
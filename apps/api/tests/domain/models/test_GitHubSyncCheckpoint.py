@@ -0,0 +1,31 @@
+import pytest
+from domain.models.DBMSSystem import DBMSSystem
+from domain.models.GitHubSyncCheckpoint import (
+    delete_github_sync_checkpoint,
+    get_github_sync_checkpoint,
+    save_github_sync_checkpoint,
+)
+from sqlmodel import Session
+from utilities.testing import create_test_database
+
+
+@pytest.fixture(name="tx")
+def session():
+    generate_session = create_test_database()
+    tx = generate_session()
+    tx.add(DBMSSystem(id=1, name="MySQL", repository="mysql/mysql-server"))
+    tx.commit()
+    return tx
+
+
+def test_checkpoint_tracks_last_stored_page(tx: Session):
+    assert get_github_sync_checkpoint(tx, 1) is None
+
+    save_github_sync_checkpoint(tx, 1, "repo:mysql/mysql-server", 1)
+    save_github_sync_checkpoint(tx, 1, "repo:mysql/mysql-server", 2)
+    checkpoint = get_github_sync_checkpoint(tx, 1)
+    tx.refresh(checkpoint)
+    assert (checkpoint.query, checkpoint.page) == ("repo:mysql/mysql-server", 2)
+
+    delete_github_sync_checkpoint(tx, 1)
+    assert get_github_sync_checkpoint(tx, 1) is None
@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+
+import pytest
+from domain.models.BugDailyStats import BugDailyStats, has_bug_daily_stats
+from domain.models.BugReport import (
+    BUG_REPORT_KEY_INDEX,
+    BugReport,
+    merge_duplicate_bug_reports,
+)
+from domain.schema import create_schema
+from sqlalchemy import inspect
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+
+def get_index_names(engine) -> set[str]:
+    return {index["name"] for index in inspect(engine).get_indexes("bug_reports")}
+
+
+def test_create_schema_adds_missing_indexes_idempotently():
+    engine = create_engine("sqlite://")
+    # A bug_reports table from before the indexes were declared
+    BugReport.__table__.create(engine)
+    for index in BugReport.__table__.indexes:
+        index.drop(engine)
+    assert get_index_names(engine) == set()
+
+    create_schema(engine, batch_size=10)
+    create_schema(engine, batch_size=10)
+    expected = {index.name for index in BugReport.__table__.indexes}
+    assert "ix_bug_reports_dbms_category_created" in expected
+    assert get_index_names(engine) == expected
+    assert set(SQLModel.metadata.tables) <= set(inspect(engine).get_table_names())
+
+
+def test_create_schema_refuses_to_merge_duplicates():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    BUG_REPORT_KEY_INDEX.drop(engine)
+    with Session(engine) as tx:
+        for _ in range(2):
+            tx.add(
+                BugReport(
+                    dbms_id=1,
+                    title="Bug",
+                    url="https://github.com/mysql/mysql-server/issues/1",
+                    issue_created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+                )
+            )
+        tx.commit()
+
+    with pytest.raises(RuntimeError, match="1 bug reports"):
+        create_schema(engine, batch_size=10)
+    with Session(engine) as tx:
+        assert tx.exec(select(func.count()).select_from(BugReport)).one() == 2
+        assert merge_duplicate_bug_reports(tx, batch_size=10) == 1
+
+    create_schema(engine, batch_size=10)
+    assert BUG_REPORT_KEY_INDEX.name in get_index_names(engine)
+
+
+def test_create_schema_backfills_empty_daily_stats():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as tx:
+        tx.add(
+            BugReport(
+                dbms_id=1,
+                title="Bug",
+                url="https://github.com/mysql/mysql-server/issues/1",
+                issue_created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            )
+        )
+        tx.commit()
+
+    create_schema(engine, batch_size=10)
+    with Session(engine) as tx:
+        assert has_bug_daily_stats(tx)
+        assert tx.exec(select(func.sum(BugDailyStats.count))).one() == 1
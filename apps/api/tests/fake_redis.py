@@ -0,0 +1,9 @@
+from fakeredis import FakeRedis, FakeServer
+
+
+def create_test_redis() -> FakeRedis:
+    """
+    Mock Redis for testing, using an in-process fake server that is not
+    shared with any other client.
+    """
+    return FakeRedis(server=FakeServer())
@@ -0,0 +1,111 @@
+import random
+from datetime import datetime, timezone
+
+import pytest
+from domain.enums import AiSummaryEntity
+from domain.models.BugCategory import BugCategory
+from domain.models.BugReport import BugReport
+from domain.models.DBMSSystem import DBMSSystem
+from services.ai_summary_service import AiSummaryService
+from services.dbms_service import DbmsService
+from utilities.llm import FakeLlmClient
+from utilities.testing import create_test_database
+
+
+@pytest.fixture(name="tx")
+def session():
+    generate_session = create_test_database()
+    tx = generate_session()
+    tx.add(DBMSSystem(id=1, name="MySQL", repository="mysql/mysql-server"))
+    tx.add(BugCategory(id=0, name="Crash / Segmentation Fault"))
+    tx.add(
+        BugReport(
+            id=1,
+            dbms_id=1,
+            category_id=0,
+            title="Crash on startup",
+            description="The server crashes on startup.",
+            url="https://github.com/mysql/mysql-server/issues/1",
+            issue_created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        )
+    )
+    tx.commit()
+    return tx
+
+
+@pytest.fixture(name="requested")
+def requested_summaries(monkeypatch):
+    requested = []
+    monkeypatch.setattr(
+        AiSummaryService,
+        "request_summary",
+        lambda entity_type, entity_id: requested.append((entity_type, entity_id)),
+    )
+    return requested
+
+
+def test_summary_is_regenerated_only_when_description_changes(tx, requested):
+    bug = AiSummaryEntity.BugReport
+    llm = FakeLlmClient()
+
+    def get_summary():
+        report = tx.get(BugReport, 1)
+        return AiSummaryService.get_bug_report_summary(
+            tx, 1, "MySQL", report.description
+        )
+
+    assert get_summary() is None
+    assert requested == [(bug, 1)]
+
+    assert AiSummaryService.generate_summary(tx, bug, 1, llm)
+    assert not AiSummaryService.generate_summary(tx, bug, 1, llm)
+    assert len(llm.prompts) == 1
+    summary = get_summary()
+    assert summary == llm.complete(llm.prompts[0])
+    assert len(requested) == 1
+
+    tx.get(BugReport, 1).description = "The server crashes on shutdown."
+    tx.commit()
+    # The previous summary is served until the new one is ready
+    assert get_summary() == summary
+    assert len(requested) == 2
+    assert AiSummaryService.generate_summary(tx, bug, 1, llm)
+    assert "shutdown" in llm.prompts[-1]
+    assert get_summary() != summary
+
+
+def test_dbms_summary_is_generated_in_the_background(tx, requested):
+    llm = FakeLlmClient()
+    assert AiSummaryService.get_dbms_summary(tx, 1) is None
+    assert requested == [(AiSummaryEntity.Dbms, 1)]
+
+    assert AiSummaryService.generate_summary(tx, AiSummaryEntity.Dbms, 1, llm)
+    assert AiSummaryService.get_dbms_summary(tx, 1).startswith("Fake summary")
+    assert not AiSummaryService.generate_summary(tx, AiSummaryEntity.Dbms, 1, llm)
+    assert not AiSummaryService.generate_summary(tx, AiSummaryEntity.Dbms, 2, llm)
+
+
+def test_dbms_sample_is_stable_and_leaves_global_random_alone(tx):
+    for id in range(2, 30):
+        tx.add(
+            BugReport(
+                id=id,
+                dbms_id=1,
+                category_id=0,
+                title=f"Bug {id}",
+                description=f"Description {id}",
+                url=f"https://github.com/mysql/mysql-server/issues/{id}",
+                issue_created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            )
+        )
+    tx.commit()
+
+    random.seed(0)
+    state = random.getstate()
+    samples = [
+        DbmsService.get_random_bug_descriptions_sample(tx, 1, 0.3, random_seed=1)
+        for _ in range(2)
+    ]
+    assert random.getstate() == state
+    assert samples[0] == samples[1]
+    assert len(samples[0]) == 8
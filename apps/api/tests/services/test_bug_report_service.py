@@ -0,0 +1,48 @@
+import logging
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from domain.models.BugCategory import BugCategory
+from domain.models.BugReport import BugReport
+from domain.models.BugSimilarity import replace_bug_similarity_lists
+from domain.models.DBMSSystem import DBMSSystem
+from services.bug_report_service import BugReportService
+from utilities.testing import create_test_database
+
+
+@pytest.fixture(name="tx")
+def session(monkeypatch):
+    monkeypatch.setattr(BugReportService, "_logger_initialized", True)
+    monkeypatch.setattr(BugReportService, "_logger", logging.getLogger(__name__))
+    generate_session = create_test_database()
+    tx = generate_session()
+    tx.add(DBMSSystem(id=1, name="MySQL", repository="mysql/mysql-server"))
+    tx.add(BugCategory(id=0, name="Crash / Segmentation Fault"))
+    for id, category_id in [(1, 0), (2, None), (3, 0)]:
+        tx.add(
+            BugReport(
+                id=id,
+                dbms_id=1,
+                category_id=category_id,
+                title=f"Bug {id}",
+                url=f"https://github.com/mysql/mysql-server/issues/{id}",
+                issue_created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            )
+        )
+    tx.commit()
+    return tx
+
+
+def test_similar_bugs_include_unclassified_bug_reports(tx, monkeypatch):
+    monkeypatch.setattr(
+        "services.bug_report_service.constants", SimpleNamespace(SIMILARITY_TOP_K=10)
+    )
+    replace_bug_similarity_lists(tx, {1: [(2, 0.9), (3, 0.5)]})
+    tx.commit()
+
+    similar = BugReportService.get_similar_bug_reports(tx, 1, top_n=2)
+    assert [(br.id, br.category) for br in similar] == [
+        (2, None),
+        (3, "Crash / Segmentation Fault"),
+    ]
@@ -0,0 +1,117 @@
+import logging
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from domain.models.BugCategory import BugCategory
+from domain.models.BugReport import BugReport
+from domain.models.BugSimilarity import get_bug_similarity_lists
+from domain.models.DBMSSystem import DBMSSystem
+from services.bug_similarity_service import _BugSimilarityService
+from sqlmodel import Session, update
+from utilities.ivf_index import IvfIndex
+from utilities.testing import create_test_database
+from utilities.vector_codec import encode_vector
+
+BUG_COUNT = 40
+K = 5
+
+
+@pytest.fixture(name="tx")
+def session():
+    generate_session = create_test_database()
+    tx = generate_session()
+    tx.add(DBMSSystem(id=1, name="MySQL", repository="mysql/mysql-server"))
+    tx.add(BugCategory(id=0, name="Crash / Segmentation Fault"))
+    for id in range(1, BUG_COUNT + 1):
+        tx.add(
+            BugReport(
+                id=id,
+                dbms_id=1,
+                category_id=0,
+                title=f"Bug {id}",
+                url=f"https://github.com/mysql/mysql-server/issues/{id}",
+                issue_created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            )
+        )
+    tx.commit()
+    return tx
+
+
+def create_service() -> _BugSimilarityService:
+    service = _BugSimilarityService()
+    # Vectors are added directly instead of being loaded from the database
+    service.refresh = lambda tx, force=False: None
+    return service
+
+
+def get_all_lists(tx: Session) -> dict[int, list[int]]:
+    lists = get_bug_similarity_lists(tx, range(1, BUG_COUNT + 1))
+    return {id: [neighbor for neighbor, _ in pairs] for id, pairs in lists.items()}
+
+
+def test_incremental_updates_match_rebuild(tx: Session):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(BUG_COUNT, 8))
+    service = create_service()
+
+    # Vectorize in batches, then re-vectorize some bug reports
+    for start in range(0, BUG_COUNT, 7):
+        ids = list(range(start + 1, min(start + 8, BUG_COUNT + 1)))
+        service._index.upsert(ids, [1] * len(ids), vectors[start : start + 7])
+        service.update_similarities(tx, ids, K, block_size=16)
+    changed = [3, 17, 30]
+    vectors[[id - 1 for id in changed]] = rng.normal(size=(len(changed), 8))
+    service._index.upsert(changed, [1] * len(changed), vectors[[2, 16, 29]])
+    service.update_similarities(tx, changed, K, block_size=16)
+    tx.commit()
+    incremental = get_all_lists(tx)
+
+    assert service.rebuild_similarities(tx, K, block_size=16) == BUG_COUNT
+    rebuilt = get_all_lists(tx)
+
+    assert incremental == rebuilt
+    assert all(len(neighbors) == K for neighbors in rebuilt.values())
+    assert rebuilt[1] == [id for id, _ in service._index.search(1, K)]
+
+
+def test_approximate_search_prefers_vectors_written_after_build():
+    service = create_service()
+    service._ann_index = IvfIndex.build(
+        [1, 2, 3], [1, 1, 1], np.array([[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]])
+    )
+    assert [id for id, _ in service._search_ann(1, 2, None, 3)] == [2, 3]
+
+    # Bug 2 is re-vectorized and bug 4 is new since the build
+    service.add_vectors([2, 4], [1, 1], np.array([[0.0, 1.0], [1.0, 0.1]]))
+    results = service._search_ann(1, 3, None, 3)
+    assert [id for id, _ in results] == [4, 3, 2]
+    assert service._search_ann(4, 1, None, 3)[0][0] == 1
+    assert service._search_ann(5, 1, None, 3) is None
+
+
+def test_refresh_picks_up_vectors_committed_after_the_watermark(tx, monkeypatch):
+    monkeypatch.setattr(
+        "services.bug_similarity_service.constants",
+        SimpleNamespace(SIMILARITY_INDEX_REFRESH_SECONDS=60),
+    )
+    monkeypatch.setattr(_BugSimilarityService, "_logger_initialized", True)
+    monkeypatch.setattr(_BugSimilarityService, "_logger", logging.getLogger(__name__))
+    service = _BugSimilarityService()
+
+    def write_vector(id: int, updated_at: datetime):
+        tx.exec(
+            update(BugReport)
+            .where(BugReport.id == id)
+            .values(vector=encode_vector(np.ones(2)), updated_at=updated_at)
+        )
+        tx.commit()
+
+    write_vector(1, datetime(2025, 1, 1, 12, 0, 0))
+    service.refresh(tx, force=True)
+    # Written by a transaction that started before the refresh, but
+    # committed after it
+    write_vector(2, datetime(2025, 1, 1, 11, 59, 30))
+    service.refresh(tx, force=True)
+    assert 1 in service._index and 2 in service._index
@@ -0,0 +1,70 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+# Seconds that importing the API may take. Loading a spaCy model alone
+# takes several times as long
+IMPORT_TIME_BUDGET_SECONDS = 5
+
+# Imported by the workers once they load their models, never by the API
+HEAVY_MODULES = ["spacy", "thinc", "sklearn"]
+
+_MEASURE_IMPORTS = """
+import json, sys, time
+started = time.perf_counter()
+for module in sys.argv[1:]:
+    __import__(module)
+print(json.dumps({
+    "seconds": time.perf_counter() - started,
+    "heavy": [m for m in %r if m in sys.modules],
+}))
+""" % (
+    HEAVY_MODULES,
+)
+
+
+def import_in_subprocess(*modules: str) -> dict:
+    env = {
+        **os.environ,
+        # Constants are only read outside of test mode
+        "MODE": "production",
+        "DATABASE_URL": "sqlite://",
+        "OPENAI_API_KEY": "test",
+        "JWT_SECRET_KEY": "test",
+        "GITHUB_TOKEN": "test",
+        "REDIS_BROKER_URL": "redis://localhost:6379/0",
+        "CELERY_BEAT_SCHEDULE": "0 0",
+    }
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", _MEASURE_IMPORTS, *modules],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "modules",
+    [
+        ["main"],
+        # Imported by the API in development, to schedule the fetcher
+        [
+            "workers.issues_fetcher_task",
+            "workers.ai_summary_task",
+            "workers.bug_similarity_task",
+        ],
+    ],
+)
+def test_import_does_not_load_nlp_models(modules: list[str]):
+    imported = import_in_subprocess(*modules)
+    assert imported["heavy"] == []
+    assert imported["seconds"] < IMPORT_TIME_BUDGET_SECONDS
@@ -0,0 +1,127 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from utilities.github_search import (
+    SEARCH_RESULT_LIMIT,
+    FixtureTransport,
+    GitHubSearchClient,
+    TokenBucket,
+)
+
+ISSUE = {"title": "Crash in optimizer", "html_url": "https://github.com/o/r/issues/1"}
+
+
+def make_client(transport: httpx.AsyncBaseTransport, validators: dict | None = None):
+    limiter = TokenBucket(rate=1000, capacity=10)
+    return GitHubSearchClient("token", limiter, validators, transport)
+
+
+def github_handler(requests: list[httpx.Request]):
+    """Serves one page of issues under a fixed ETag, like GitHub."""
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"ETag": '"v1"'}, json={"items": [ISSUE]})
+
+    return handle
+
+
+def test_repeated_search_is_conditional():
+    requests = []
+    validators = {}
+
+    async def search_twice():
+        transport = httpx.MockTransport(github_handler(requests))
+        async with make_client(transport, validators) as client:
+            return [await client.search_issues("repo:o/r", 1) for _ in range(2)]
+
+    assert asyncio.run(search_twice()) == [[ISSUE], None]
+    assert "if-none-match" not in requests[0].headers
+    assert requests[1].headers["if-none-match"] == '"v1"'
+    assert requests[1].url.params["q"] == "repo:o/r"
+    assert len(validators) == 1
+
+
+def test_rate_limited_search_waits_for_reset():
+    responses = [
+        httpx.Response(
+            403,
+            headers={
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(int(time.time()) - 1),
+            },
+        ),
+        httpx.Response(200, json={"items": [ISSUE]}),
+    ]
+    transport = httpx.MockTransport(lambda _: responses.pop(0))
+
+    async def search():
+        async with make_client(transport) as client:
+            return await client.search_issues("repo:o/r", 1)
+
+    assert asyncio.run(search()) == [ISSUE]
+    assert responses == []
+
+
+def test_fixture_transport_replays_recorded_responses(tmp_path):
+    requests = []
+    recorder = FixtureTransport(
+        tmp_path, record_with=httpx.MockTransport(github_handler(requests))
+    )
+    replayer = FixtureTransport(tmp_path)
+
+    async def search(transport, validators: dict, page: int = 1):
+        async with make_client(transport, validators) as client:
+            return await client.search_issues("repo:o/r", page)
+
+    assert asyncio.run(search(recorder, {})) == [ISSUE]
+    validators = {}
+    assert asyncio.run(search(replayer, validators)) == [ISSUE]
+    assert asyncio.run(search(replayer, validators)) is None
+    assert len(requests) == 1
+
+    # Requests that were never recorded fail instead of going to GitHub
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(search(replayer, {}, page=2))
+
+
+def test_search_pages_stop_at_result_limit():
+    pages = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        pages.append(page)
+        if page * 100 > SEARCH_RESULT_LIMIT:
+            return httpx.Response(422)
+        return httpx.Response(200, json={"items": [ISSUE] * 100})
+
+    async def search_all():
+        async with make_client(httpx.MockTransport(handle)) as client:
+            return [page async for page, _ in client.iter_search_pages("q", 8)]
+
+    assert asyncio.run(search_all()) == [8, 9, 10]
+    assert pages == [8, 9, 10]
+
+
+def test_search_pages_stop_at_short_or_unchanged_page():
+    responses = [
+        httpx.Response(200, headers={"ETag": '"v1"'}, json={"items": [ISSUE] * 100}),
+        httpx.Response(200, json={"items": [ISSUE]}),
+        httpx.Response(304),
+    ]
+    transport = httpx.MockTransport(lambda _: responses.pop(0))
+
+    async def search_all():
+        async with make_client(transport) as client:
+            first = [
+                (page, len(issues))
+                async for page, issues in client.iter_search_pages("q")
+            ]
+            second = [page async for page in client.iter_search_pages("q")]
+            return first, second
+
+    assert asyncio.run(search_all()) == ([(1, 100), (2, 1)], [(1, None)])
@@ -0,0 +1,88 @@
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from utilities.ivf_index import IvfIndex, get_current_version
+from utilities.vector_index import VectorIndex
+
+SIZE = 2000
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    topics = rng.normal(size=(20, 16))
+    vectors = topics[rng.integers(20, size=SIZE)] + rng.normal(size=(SIZE, 16))
+    ids = list(range(1, SIZE + 1))
+    dbms_ids = [id % 3 for id in ids]
+    return ids, dbms_ids, vectors
+
+
+@pytest.fixture
+def exact(data):
+    index = VectorIndex()
+    index.upsert(*data)
+    return index
+
+
+@pytest.fixture
+def ivf(data):
+    return IvfIndex.build(*data, n_lists=32)
+
+
+def search(ivf: IvfIndex, id: int, k: int, n_probe: int, dbms_id=None):
+    return ivf.search_vector(ivf.get_vector(id), k, n_probe, dbms_id, np.array([id]))
+
+
+def test_probing_all_clusters_is_exact(exact: VectorIndex, ivf: IvfIndex):
+    for id in [1, 500, 1999]:
+        expected = exact.search(id, 10, dbms_id=1)
+        results = search(ivf, id, 10, ivf.n_lists, dbms_id=1)
+        assert [id for id, _ in results] == [id for id, _ in expected]
+        assert [score for _, score in results] == pytest.approx(
+            [score for _, score in expected], rel=1e-5
+        )
+
+
+def test_recall_grows_with_n_probe(exact: VectorIndex, ivf: IvfIndex):
+    query_ids = range(1, SIZE + 1, 20)
+    expected = {id: {n for n, _ in exact.search(id, 10)} for id in query_ids}
+
+    def recall(n_probe: int) -> float:
+        found = sum(
+            len({n for n, _ in search(ivf, id, 10, n_probe)} & expected[id])
+            for id in query_ids
+        )
+        return found / (10 * len(query_ids))
+
+    assert recall(1) <= recall(4) <= recall(16)
+    assert recall(4) > 0.9
+
+
+def test_excludes_ids(ivf: IvfIndex):
+    first, second = (id for id, _ in search(ivf, 1, 2, ivf.n_lists))
+    results = ivf.search_vector(
+        ivf.get_vector(1), 1, ivf.n_lists, exclude_ids=np.array([1, first])
+    )
+    assert results[0][0] == second
+    assert ivf.get_vector(SIZE + 1) is None
+    assert 1 in ivf and SIZE + 1 not in ivf
+
+
+def test_save_and_load(tmp_path, data):
+    built_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    directory = str(tmp_path)
+    assert IvfIndex.load(directory) is None
+
+    first = IvfIndex.build(*data, n_lists=8, built_at=built_at).save(directory)
+    ivf = IvfIndex.build(*data, n_lists=16, built_at=built_at)
+    version = ivf.save(directory)
+    assert get_current_version(directory) == version
+    assert not os.path.exists(tmp_path / first)
+
+    loaded = IvfIndex.load(directory)
+    assert isinstance(loaded._vectors, np.memmap)
+    assert loaded.built_at == built_at
+    assert loaded.n_lists == 16
+    assert search(loaded, 7, 5, 4) == search(ivf, 7, 5, 4)
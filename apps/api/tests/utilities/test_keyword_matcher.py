@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+import spacy
+from fuzzywuzzy import fuzz
+from utilities.keyword_matcher import KeywordMatcher
+
+CATEGORY_KEYWORDS = {
+    "Crash": ["segmentation fault", "crash", "SIGSEGV", "server stopped"],
+    "Hang": ["infinite loop", "query hangs", "stuck"],
+    "Wrong Result": ["incorrect result", "wrong output", "mismatch"],
+}
+
+TITLES = [
+    "Server crashes on startup",
+    "Segmentation Fault in optimizer",
+    "Got SIGSEGV when joining",
+    "Query hangs forever on large table",
+    "Incorrect results with LEFT JOIN",
+    "infinit loop in planner",
+    "wrong outptu for aggregate",
+    "Optimizer returns a mismatched row count",
+    "Documentation typo",
+    "stopped server unexpectedly halted",
+    "",
+]
+
+
+@pytest.fixture
+def nlp():
+    nlp = spacy.blank("en")
+    rng = np.random.default_rng(0)
+    for word in ["crash", "server", "query", "hangs", "loop", "result", "wrong"]:
+        nlp.vocab.set_vector(word, rng.standard_normal(8).astype(np.float32))
+    return nlp
+
+
+def reference_match(nlp, issue_title: str) -> str | None:
+    """The original per-keyword implementation, kept as a reference."""
+    issue_title = issue_title.lower()
+    issue_doc = nlp(issue_title)
+    best_match = None
+    best_score = 0.0
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        for keyword in keywords:
+            keyword_lower = keyword.lower()
+            keyword_doc = nlp(keyword_lower)
+            if keyword_lower in issue_title:
+                return category
+            fuzzy_score = fuzz.partial_ratio(issue_title, keyword_lower) / 100
+            spacy_score = (
+                issue_doc.similarity(keyword_doc)
+                if issue_doc.has_vector and keyword_doc.has_vector
+                else 0.0
+            )
+            issue_tokens = set(token.text for token in issue_doc if not token.is_stop)
+            keyword_tokens = set(
+                token.text for token in keyword_doc if not token.is_stop
+            )
+            common_token_score = len(issue_tokens & keyword_tokens) / max(
+                len(keyword_tokens), 1
+            )
+            length_factor = min(len(issue_title) / 100, 1)
+            combined_score = (
+                (0.4 * fuzzy_score)
+                + (0.4 * spacy_score)
+                + (0.2 * common_token_score * length_factor)
+            )
+            if combined_score > best_score and combined_score > 0.7:
+                best_score = combined_score
+                best_match = category
+    return best_match
+
+
+@pytest.fixture
+def matcher(nlp):
+    return KeywordMatcher(
+        nlp,
+        CATEGORY_KEYWORDS,
+        fuzzy_weight=0.4,
+        spacy_weight=0.4,
+        token_overlap_weight=0.2,
+        threshold=0.7,
+    )
+
+
+@pytest.mark.parametrize("title", TITLES)
+def test_matches_reference_implementation(nlp, matcher: KeywordMatcher, title: str):
+    assert matcher.match(title) == reference_match(nlp, title)
+
+
+def test_exact_match_uses_declaration_order(matcher: KeywordMatcher):
+    # Both "crash" and "stuck" appear, but "Crash" keywords are declared first
+    assert matcher.match("Stuck after crash") == "Crash"
+
+
+def test_exact_match_is_case_insensitive(matcher: KeywordMatcher):
+    assert matcher.match("got sigsegv") == "Crash"
+
+
+def test_no_match(matcher: KeywordMatcher):
+    assert matcher.match("Documentation typo") is None
@@ -0,0 +1,34 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from utilities.nlp_models import NlpComponent, NlpModelRegistry
+
+
+def test_components_with_the_same_model_share_it():
+    loaded = []
+
+    def load_model(name: str):
+        loaded.append(name)
+        return object()
+
+    registry = NlpModelRegistry(lambda component: "en_core_web_lg", load_model)
+    assert not registry.is_loaded(NlpComponent.Classifier)
+    with ThreadPoolExecutor(4) as pool:
+        models = list(
+            pool.map(
+                registry.get, [NlpComponent.Classifier, NlpComponent.Vectorizer] * 4
+            )
+        )
+    assert loaded == ["en_core_web_lg"]
+    assert all(model is models[0] for model in models)
+    assert registry.is_loaded(NlpComponent.Vectorizer)
+
+
+def test_components_can_use_different_models():
+    names = {
+        NlpComponent.Classifier: "en_core_web_sm",
+        NlpComponent.Vectorizer: "en_core_web_lg",
+    }
+    registry = NlpModelRegistry(names.get, lambda name: name)
+    assert registry.get(NlpComponent.Classifier) == "en_core_web_sm"
+    assert not registry.is_loaded(NlpComponent.Vectorizer)
+    assert registry.get(NlpComponent.Vectorizer) == "en_core_web_lg"
@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from utilities.pool_metrics import TimedNullPool, TimedQueuePool, get_pool_stats
+
+
+def test_queue_pool_records_checkouts_and_timeouts():
+    engine = create_engine(
+        "sqlite://",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        assert get_pool_stats(engine.pool)["checked_out"] == 1
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    stats = get_pool_stats(engine.pool)
+    assert stats["size"] == 1
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 1
+    assert stats["timeouts"] == 1
+    assert 0 <= stats["wait_p50_ms"] <= stats["wait_max_ms"]
+
+    # Disposing the engine replaces the pool, but keeps its metrics
+    engine.dispose()
+    with engine.connect():
+        pass
+    assert get_pool_stats(engine.pool)["checkouts"] == 2
+
+
+def test_null_pool_records_connects():
+    engine = create_engine("sqlite://", poolclass=TimedNullPool)
+    for _ in range(3):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    stats = get_pool_stats(engine.pool)
+    assert "size" not in stats
+    assert stats["checkouts"] == 3
+    assert stats["timeouts"] == 0
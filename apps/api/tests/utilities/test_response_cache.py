@@ -0,0 +1,146 @@
+from datetime import datetime, timezone
+
+import pytest
+from domain.models.BugCategory import BugCategory
+from domain.models.BugReport import BugReport, insert_bug_reports
+from domain.models.DBMSSystem import DBMSSystem, save_dbms_system
+from domain.views.dbms import DbmsResponseDto
+from fake_redis import create_test_redis
+from pydantic import TypeAdapter
+from services.dbms_service import DbmsService
+from utilities.response_cache import (
+    CacheNamespace,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    ResponseCache,
+    invalidate_responses,
+    set_response_cache,
+)
+from utilities.testing import create_test_database
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set("a", b"1", 60)
+    backend.set("b", b"2", 60)
+    assert backend.get("a") == b"1"
+    backend.set("c", b"3", 60)
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1"
+    assert backend.get("c") == b"3"
+    assert len(backend) == 2
+
+
+def test_memory_backend_expires_entries():
+    clock = FakeClock()
+    backend = MemoryCacheBackend(clock=clock)
+    backend.set("a", b"1", 10)
+    clock.now = 9
+    assert backend.get("a") == b"1"
+    clock.now = 10
+    assert backend.get("a") is None
+    assert len(backend) == 0
+
+
+@pytest.mark.parametrize("backend_type", ["memory", "redis"])
+def test_bumping_a_version_invalidates_entries_read_from_it(backend_type: str):
+    client = create_test_redis()
+    backend = (
+        MemoryCacheBackend() if backend_type == "memory" else RedisCacheBackend(client)
+    )
+    cache = ResponseCache(backend, client)
+    computed = []
+
+    def get_count(namespaces: list[CacheNamespace]) -> int:
+        def compute():
+            computed.append(namespaces)
+            return len(computed)
+
+        return cache.get_or_compute(
+            "count", namespaces, repr(namespaces), compute, TypeAdapter(int)
+        )
+
+    reports = [CacheNamespace.BugReports]
+    categories = [CacheNamespace.BugCategories]
+    assert get_count(reports) == 1
+    assert get_count(categories) == 2
+    assert get_count(reports) == 1
+    cache.bump_versions(CacheNamespace.BugReports)
+    assert get_count(reports) == 3
+    assert get_count(categories) == 2
+    assert cache.get_stats() == {"count": {"hits": 2, "misses": 3, "errors": 0}}
+
+
+@pytest.fixture(name="tx")
+def session():
+    generate_session = create_test_database()
+    tx = generate_session()
+    tx.add(DBMSSystem(id=1, name="MySQL", repository="mysql/mysql-server"))
+    tx.add(BugCategory(id=0, name="Crash / Segmentation Fault"))
+    tx.commit()
+    return tx
+
+
+@pytest.fixture(name="cache")
+def response_cache():
+    client = create_test_redis()
+    cache = ResponseCache(MemoryCacheBackend(), client)
+    set_response_cache(cache)
+    yield cache
+    set_response_cache(None)
+
+
+def add_bug_report(tx, number: int):
+    insert_bug_reports(
+        tx,
+        [
+            BugReport(
+                dbms_id=1,
+                category_id=0,
+                title=f"Crash {number}",
+                url=f"https://github.com/mysql/mysql-server/issues/{number}",
+                issue_created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            )
+        ],
+        batch_size=100,
+    )
+
+
+def test_service_responses_are_cached_until_invalidated(tx, cache: ResponseCache):
+    add_bug_report(tx, 1)
+    overview = DbmsService.get_dbms_overview(tx, 1)
+    assert isinstance(overview, DbmsResponseDto)
+    assert overview.bug_count == 1
+
+    add_bug_report(tx, 2)
+    assert DbmsService.get_dbms_overview(tx, 1) == overview
+    invalidate_responses(CacheNamespace.BugReports)
+    assert DbmsService.get_dbms_overview(tx, 1).bug_count == 2
+    # Missing DBMSs are cached too
+    assert DbmsService.get_dbms_overview(tx, 2) is None
+    assert DbmsService.get_dbms_overview(tx, 2) is None
+
+    stats = cache.get_stats()[DbmsService.get_dbms_overview.__qualname__]
+    assert stats == {"hits": 2, "misses": 3, "errors": 0}
+
+
+def test_calls_share_entries_however_arguments_are_passed(tx, cache: ResponseCache):
+    add_bug_report(tx, 1)
+    DbmsService.get_dbms_overview(tx, 1)
+    DbmsService.get_dbms_overview(tx, dbms_id=1)
+    stats = cache.get_stats()[DbmsService.get_dbms_overview.__qualname__]
+    assert stats == {"hits": 1, "misses": 1, "errors": 0}
+
+
+def test_writing_dbms_systems_invalidates_their_responses(tx, cache: ResponseCache):
+    assert [dbms.name for dbms in DbmsService.get_dbms(tx)] == ["MySQL"]
+    save_dbms_system(tx, DBMSSystem(name="SQLite", repository="sqlite/sqlite"))
+    assert [dbms.name for dbms in DbmsService.get_dbms(tx)] == ["MySQL", "SQLite"]
@@ -0,0 +1,59 @@
+import pickle
+
+import numpy as np
+import pytest
+from utilities.vector_codec import decode_vector, encode_vector, is_legacy_vector
+
+
+@pytest.fixture
+def vector():
+    return np.random.default_rng(0).standard_normal(300).astype(np.float32)
+
+
+def test_roundtrip_float32(vector):
+    data = encode_vector(vector)
+    decoded = decode_vector(data)
+    assert decoded.dtype == np.float32
+    assert np.array_equal(decoded, vector)
+    # Header plus raw components, no pickle framing
+    assert len(data) == 4 + 300 * 4
+
+
+def test_roundtrip_float16(vector):
+    data = encode_vector(vector, "float16")
+    decoded = decode_vector(data)
+    assert decoded.dtype == np.float16
+    assert len(data) == 4 + 300 * 2
+    assert np.allclose(decoded, vector, atol=1e-2)
+
+
+def test_decode_is_zero_copy(vector):
+    decoded = decode_vector(encode_vector(vector))
+    assert not decoded.flags.owndata
+    assert not decoded.flags.writeable
+
+
+def test_decode_legacy_pickle(vector):
+    data = pickle.dumps(vector)
+    assert is_legacy_vector(data)
+    assert not is_legacy_vector(encode_vector(vector))
+    assert np.array_equal(decode_vector(data), vector)
+
+
+def test_decode_legacy_pickle_rejects_arbitrary_objects():
+    with pytest.raises(pickle.UnpicklingError):
+        decode_vector(pickle.dumps(print))
+    with pytest.raises(ValueError):
+        decode_vector(pickle.dumps({"not": "a vector"}))
+
+
+def test_encode_rejects_unknown_dtype(vector):
+    with pytest.raises(ValueError):
+        encode_vector(vector, "float64")
+
+
+def test_decode_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        decode_vector(b"XX\x01\x01\x00\x00\x80\x3f")
+    with pytest.raises(ValueError):
+        decode_vector(b"BV")
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+from utilities.vector_index import VectorIndex, top_k
+
+
+@pytest.fixture
+def index():
+    index = VectorIndex()
+    index.upsert(
+        [1, 2, 3, 4],
+        [0, 0, 1, 0],
+        np.array(
+            [
+                [1.0, 0.0, 0.0],
+                [2.0, 0.1, 0.0],
+                [0.9, 0.2, 0.0],
+                [0.0, 1.0, 0.0],
+            ]
+        ),
+    )
+    return index
+
+
+def test_search_excludes_query(index: VectorIndex):
+    results = index.search(1, 10)
+    assert [id for id, _ in results] == [2, 3, 4]
+    assert 1 not in [id for id, _ in results]
+
+
+def test_search_matches_cosine_similarity(index: VectorIndex):
+    (id, score), *_ = index.search(1, 1)
+    assert id == 2
+    assert score == pytest.approx(2.0 / np.linalg.norm([2.0, 0.1, 0.0]), rel=1e-6)
+
+
+def test_search_top_k(index: VectorIndex):
+    assert len(index.search(1, 2)) == 2
+    assert index.search(1, 0) == []
+
+
+def test_search_scoped_by_dbms(index: VectorIndex):
+    results = index.search(1, 10, dbms_id=0)
+    assert [id for id, _ in results] == [2, 4]
+    assert index.search(3, 10, dbms_id=1) == []
+
+
+def test_search_unknown_id(index: VectorIndex):
+    assert index.search(42, 3) == []
+
+
+def test_upsert_replaces_existing(index: VectorIndex):
+    index.upsert([4], [0], np.array([[1.0, 0.0, 0.0]]))
+    assert len(index) == 4
+    (id, score), *_ = index.search(1, 1)
+    assert id == 4
+    assert score == pytest.approx(1.0)
+
+
+def test_upsert_grows_beyond_capacity():
+    index = VectorIndex()
+    count = VectorIndex._INITIAL_CAPACITY + 10
+    vectors = np.random.default_rng(0).random((count, 4))
+    index.upsert(list(range(count)), [0] * count, vectors)
+    assert len(index) == count
+    assert count - 1 in index
+    assert len(index.search(count - 1, 5)) == 5
+
+
+def test_upsert_rejects_dimension_mismatch(index: VectorIndex):
+    with pytest.raises(ValueError):
+        index.upsert([5], [0], np.array([[1.0, 0.0]]))
+
+
+def test_iter_score_blocks_matches_search(index: VectorIndex):
+    blocks = list(index.iter_score_blocks([1, 4, 99], 3))
+    assert [len(row_ids) for row_ids, _, _ in blocks] == [3, 1]
+    row_ids = np.concatenate([row_ids for row_ids, _, _ in blocks])
+    scores = np.concatenate([scores for _, _, scores in blocks])
+    assert row_ids.tolist() == [1, 2, 3, 4]
+    assert blocks[0][1].tolist() == [1, 4]
+
+    # Column of bug 1 holds the similarity of every vector to it
+    assert scores[0, 0] == -np.inf
+    expected = dict(index.search(1, 10))
+    for row, id in enumerate(row_ids[1:], start=1):
+        assert scores[row, 0] == pytest.approx(expected[id], rel=1e-6)
+
+
+def test_top_k_sorts_and_pads():
+    scores = np.array([[0.1, 0.9, -np.inf, 0.5], [-np.inf, -np.inf, 0.3, -np.inf]])
+    columns, top_scores = top_k(scores, 2)
+    assert columns[0].tolist() == [1, 3]
+    assert top_scores[0].tolist() == [0.9, 0.5]
+    assert columns[1][0] == 2
+    assert top_scores[1].tolist() == [0.3, -np.inf]
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+from fake_redis import create_test_redis
+from workers.task_coordinator import TaskCoordinator, TaskRole
+
+
+@pytest.fixture(name="coordinator")
+def task_coordinator():
+    return TaskCoordinator(create_test_redis(), lease_seconds=1)
+
+
+def test_lease_is_exclusive_until_released(coordinator: TaskCoordinator):
+    lease = coordinator.acquire_lease(TaskRole.Classifier, heartbeat=False)
+    assert lease is not None
+    assert coordinator.is_running(TaskRole.Classifier)
+    assert not coordinator.is_running(TaskRole.Vectorizer)
+    assert coordinator.acquire_lease(TaskRole.Classifier, heartbeat=False) is None
+
+    assert not coordinator.release_lease(TaskRole.Classifier, "someone else")
+    lease.release()
+    assert not coordinator.is_running(TaskRole.Classifier)
+    other = coordinator.acquire_lease(TaskRole.Classifier, heartbeat=False)
+    assert other is not None
+    # A stale holder cannot release the lease of the new one
+    assert not coordinator.release_lease(TaskRole.Classifier, lease.token)
+    assert coordinator.is_running(TaskRole.Classifier)
+
+
+def test_lease_expires_without_heartbeat(coordinator: TaskCoordinator):
+    expiring = coordinator.acquire_lease(TaskRole.Fetcher, heartbeat=False)
+    renewed = coordinator.acquire_lease(TaskRole.Classifier)
+    time.sleep(1.5)
+    assert not coordinator.is_running(TaskRole.Fetcher)
+    assert not coordinator.renew_lease(TaskRole.Fetcher, expiring.token)
+    assert coordinator.is_running(TaskRole.Classifier)
+    renewed.release()
+    assert not coordinator.is_running(TaskRole.Classifier)
+
+
+def test_resumed_lease_is_kept_alive_and_taken_back(coordinator: TaskCoordinator):
+    lease = coordinator.acquire_lease(TaskRole.Classifier, heartbeat=False)
+    resumed = coordinator.resume_lease(TaskRole.Classifier, lease.token)
+    time.sleep(1.5)
+    assert coordinator.is_running(TaskRole.Classifier)
+    resumed.stop_heartbeat()
+
+    # Expired while queued, and nobody else claimed it
+    time.sleep(1.5)
+    assert not coordinator.is_running(TaskRole.Classifier)
+    resumed = coordinator.resume_lease(
+        TaskRole.Classifier, lease.token, heartbeat=False
+    )
+    assert resumed is not None
+    assert coordinator.release_lease(TaskRole.Classifier, lease.token)
+
+    other = coordinator.acquire_lease(TaskRole.Classifier, heartbeat=False)
+    assert coordinator.resume_lease(TaskRole.Classifier, lease.token) is None
+    other.release()
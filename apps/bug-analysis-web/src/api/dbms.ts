@@ -46,16 +46,16 @@ export async function fetchAiSummary(dbms_id: number): Promise<AiSummary> {
 export async function searchBugReports(
   dbms_id: number,
   search: string,
-  start: number = 0,
   limit: number = 10,
-  category_id?: number
+  category_id?: number,
+  cursor?: string
 ): Promise<BugReports> {
   const { data, response } = await api.GET(
     '/api/v1/dbms/{dbms_id}/bug_search',
     {
       params: {
         path: { dbms_id },
-        query: { search, start, limit, category_id },
+        query: { search, limit, category_id, cursor },
       },
     }
   );
@@ -69,7 +69,7 @@ export async function searchBugReports(
 export async function loadMoreBugsByCategory(
   dbms_id: number,
   category_id: number,
-  distribution: number[],
+  cursor?: string,
   amount: number = 5
 ): Promise<BugExploreReports> {
   const { data, response } = await api.GET(
@@ -77,7 +77,7 @@ export async function loadMoreBugsByCategory(
     {
       params: {
         path: { dbms_id },
-        query: { category_id, amount, distribution: distribution.join(',') },
+        query: { category_id, amount, cursor },
       },
     }
   );
@@ -89,12 +89,12 @@ export async function loadMoreBugsByCategory(
 }
 export async function fetchBugTrend(
   dbms_id: number,
-  days: number = 30
+  periods: number = 30
 ): Promise<number[]> {
   const { data, response } = await api.GET('/api/v1/dbms/{dbms_id}/bug_trend', {
     params: {
       path: { dbms_id },
-      query: { days },
+      query: { periods },
     },
   });
   if (!data) {
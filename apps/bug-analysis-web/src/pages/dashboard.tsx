@@ -48,6 +48,7 @@ import {
 import {
   AcBugSearchResultStruct,
   BUG_CATEGORIES,
+  BugExploreCursors,
   BugSearchResultStruct,
   categoriseBugs,
   setBugExplore,
@@ -125,7 +126,6 @@ const Dashboard: React.FC = (): ReactNode => {
       const bugReports: BugReports = await searchBugReports(
         currentTenant.id,
         searchStr,
-        0,
         100,
         category
       );
@@ -218,9 +218,8 @@ const Dashboard: React.FC = (): ReactNode => {
   //       is because these are 2 separate components, and their needs are different. While
   //       autocomplete (AC) results can be dumped as an array. We might prefer fast lookup
   //       when trying to load more of a specific category.
-  const [bugExploreDistribution, setBugExploreDistribution] = useState<
-    number[]
-  >(Object.values(FilterBugCategory).map((_) => 0));
+  const [bugExploreCursors, setBugExploreCursors] =
+    useState<BugExploreCursors>({});
   const [bugReports, setBugReports] = useState<BugSearchResultStruct>({});
 
   const fetchBugExplore = useCallback(async () => {
@@ -228,17 +227,11 @@ const Dashboard: React.FC = (): ReactNode => {
     const bugReports: BugReports = await searchBugReports(
       currentTenant.id,
       '',
-      0,
       10
     );
 
     if (bugReports !== undefined) {
-      setBugExplore(
-        bugExploreDistribution,
-        setBugExploreDistribution,
-        setBugReports,
-        bugReports
-      );
+      setBugExplore(setBugExploreCursors, setBugReports, bugReports);
     }
     // TODO: Investigate eslint warning
     // eslint-disable-next-line react-hooks/exhaustive-deps
@@ -250,21 +243,23 @@ const Dashboard: React.FC = (): ReactNode => {
   ): Promise<void> => {
     if (tenantId === undefined) return;
 
+    const cursor = bugExploreCursors[categoryId];
+    // All bugs of this category are already loaded
+    if (cursor === null) return;
+
     const bugExploreReports: BugExploreReports = await loadMoreBugsByCategory(
       tenantId,
       categoryId,
-      bugExploreDistribution,
+      cursor,
       5
     );
-    const { bug_reports_delta, new_bug_distr } = bugExploreReports;
-    setBugExploreDistribution(new_bug_distr);
+    const { bug_reports_delta, next_cursor } = bugExploreReports;
     // Utilise setBugExplore function again
 
     setBugExplore(
-      bugExploreDistribution,
-      setBugExploreDistribution,
+      setBugExploreCursors,
       setBugReports,
-      { bug_reports: bug_reports_delta },
+      { bug_reports: bug_reports_delta, next_cursor },
       BUG_CATEGORIES[categoryId],
       categoryId
     );
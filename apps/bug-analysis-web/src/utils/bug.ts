@@ -36,6 +36,12 @@ export type BugSearchResultStruct = {
   [cat in FilterBugCategory]?: BugSearchResultCategory;
 };
 
+// Cursor to load more bugs from, by category ID. A missing entry means the
+// category has not been loaded yet, and null means all of its bugs are loaded.
+export type BugExploreCursors = {
+  [categoryId: number]: string | null;
+};
+
 export const categoriseBugs = (
   reports: BugReport[]
 ): AcBugSearchResultStruct => {
@@ -99,8 +105,7 @@ export const bugReportToBugSearchResult = (
 // TODO: test for empty categories too
 // TODO: mock empty response for 1 category, then load more for that category
 export const setBugExplore = (
-  bugExploreDistribution: number[],
-  setBugExploreDistribution: Dispatch<SetStateAction<number[]>>,
+  setBugExploreCursors: Dispatch<SetStateAction<BugExploreCursors>>,
   setBugReports: Dispatch<SetStateAction<BugSearchResultStruct>>,
   bugReportsDelta: BugReports,
   category?: FilterBugCategory, // for single category update
@@ -108,7 +113,10 @@ export const setBugExplore = (
 ): void => {
   // Single category update
   if (category && categoryId !== undefined) {
-    // const deltaLength = bugReportsDelta.bug_reports.length;
+    setBugExploreCursors((cursors) => ({
+      ...cursors,
+      [categoryId]: bugReportsDelta.next_cursor ?? null,
+    }));
     setBugReports((reports: BugSearchResultStruct) => {
       const neww = {
         ...reports,
@@ -131,8 +139,8 @@ export const setBugExplore = (
   // Bulk update
   if (category || categoryId) return;
 
-  const { bug_reports: bugReports } = bugReportsDelta;
-  const newDistr = Array(bugExploreDistribution.length).fill(0);
+  const { bug_reports: bugReports, category_cursors: categoryCursors } =
+    bugReportsDelta;
   const bugSearchResult: BugSearchResultStruct = {};
 
   for (const {
@@ -148,10 +156,8 @@ export const setBugExplore = (
       continue;
     }
 
-    if (categoryId >= newDistr.length || categoryId >= BUG_CATEGORIES.length)
-      continue;
+    if (categoryId >= BUG_CATEGORIES.length) continue;
 
-    newDistr[categoryId]++;
     const category: FilterBugCategory = BUG_CATEGORIES[categoryId];
     if (!bugSearchResult[category]) {
       bugSearchResult[category] = { categoryId, title: category, bugs: [] };
@@ -164,7 +170,7 @@ export const setBugExplore = (
     });
   }
 
-  setBugExploreDistribution(newDistr);
+  setBugExploreCursors({ ...categoryCursors });
   setBugReports(bugSearchResult);
 };
 
@@ -118,8 +118,7 @@ describe('categoriseBugs', () => {
 
 describe('setBugExplore', () => {
   it('should update a single category', () => {
-    const mockBugExploreDistribution = [0, 0, 0];
-    const setBugExploreDistribution = vi.fn();
+    const setBugExploreCursors = vi.fn();
     const setBugReports = vi.fn();
 
     const mockBugReportsDelta: BugReports = {
@@ -155,14 +154,14 @@ describe('setBugExplore', () => {
           priority: 'Low',
         },
       ],
+      next_cursor: 'cursor-0',
     };
 
     const category = FilterBugCategory.CRASH;
     const categoryId = 0;
 
     setBugExplore(
-      mockBugExploreDistribution,
-      setBugExploreDistribution,
+      setBugExploreCursors,
       setBugReports,
       mockBugReportsDelta,
       category,
@@ -194,12 +193,15 @@ describe('setBugExplore', () => {
         ],
       },
     });
-    expect(setBugExploreDistribution).not.toHaveBeenCalled();
+    expect(setBugExploreCursors).toHaveBeenCalled();
+    // eslint-disable-next-line @typescript-eslint/no-unsafe-assignment
+    const cursorsCall = setBugExploreCursors.mock.calls[0][0];
+    // eslint-disable-next-line @typescript-eslint/no-unsafe-call
+    expect(cursorsCall({ 4: null })).toEqual({ 0: 'cursor-0', 4: null });
   });
 
   it('should update multiple categories', () => {
-    const mockBugExploreDistribution = [0, 0, 0, 0, 0, 0];
-    const setBugExploreDistribution = vi.fn();
+    const setBugExploreCursors = vi.fn();
     const setBugReports = vi.fn();
 
     const mockBugReportsDelta: BugReports = {
@@ -235,16 +237,15 @@ describe('setBugExplore', () => {
           priority: 'Low',
         },
       ],
+      category_cursors: { 0: 'cursor-0', 4: null },
     };
 
-    setBugExplore(
-      mockBugExploreDistribution,
-      setBugExploreDistribution,
-      setBugReports,
-      mockBugReportsDelta
-    );
+    setBugExplore(setBugExploreCursors, setBugReports, mockBugReportsDelta);
 
-    expect(setBugExploreDistribution).toHaveBeenCalledWith([1, 0, 0, 0, 1, 0]);
+    expect(setBugExploreCursors).toHaveBeenCalledWith({
+      0: 'cursor-0',
+      4: null,
+    });
     expect(setBugReports).toHaveBeenCalledWith({
       [FilterBugCategory.CRASH]: {
         categoryId: 0,